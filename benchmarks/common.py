@@ -10,23 +10,32 @@ from typing import TYPE_CHECKING
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-from cv2ext import enable_jit
+from cv2ext import disable_jit, enable_jit
 
 if TYPE_CHECKING:
     from functools import partial
 
 
 def run_func(func: partial, iterations: int = 1000, *, jit: bool = False) -> float:
+    # set the JIT state explicitly, so the no-JIT run never
+    # inherits kernels enabled by an earlier JIT run
     if jit:
         enable_jit()
-        func()
+    else:
+        disable_jit()
 
-    timing = []
-    for _ in range(iterations):
-        t0 = time.perf_counter()
+    try:
+        # warmup call, triggers any JIT compilation before timing
         func()
-        t1 = time.perf_counter()
-        timing.append(t1 - t0)
+
+        timing = []
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            func()
+            t1 = time.perf_counter()
+            timing.append(t1 - t0)
+    finally:
+        disable_jit()
 
     return (sum(timing) / len(timing)) * 1000.0
 
@@ -4,39 +4,270 @@
 from __future__ import annotations
 
 import argparse
-from functools import partial
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator
 
 import numpy as np
 
 import cv2ext
-from common import run_benchmark
+from cv2ext.bboxes import match
+from cv2ext.detection import (
+    AbstractGridFramePacker,
+    AnnealingFramePacker,
+    MotionFramePacker,
+    detect_blobs,
+)
 
+PACKERS: dict[str, Callable[..., AbstractGridFramePacker]] = {
+    "annealing": AnnealingFramePacker,
+    "motion": MotionFramePacker,
+}
+METHODS = ["simple", "shelf"]
+VIDEO_EXTS = [".mp4", ".avi", ".mkv", ".mov"]
 
-def main():
-    cv2ext.set_log_level("DEBUG")
+
+def synthetic_sequence(
+    width: int,
+    height: int,
+    num_frames: int,
+    num_boxes: int,
+    seed: int = 0,
+) -> Iterator[np.ndarray]:
+    """Yield frames of bright boxes moving over a static, noisy background."""
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 40, size=(height, width, 3), dtype=np.uint8)
+    sizes = rng.integers(24, 96, size=(num_boxes, 2))
+    positions = rng.uniform(0, 1, size=(num_boxes, 2)) * (
+        np.array([width, height]) - sizes
+    )
+    velocities = rng.uniform(-6, 6, size=(num_boxes, 2))
+    limits = np.array([width, height]) - sizes
+    for _ in range(num_frames):
+        frame = background.copy()
+        for (x, y), (w, h) in zip(positions.astype(int), sizes):
+            frame[y : y + h, x : x + w] = 220
+        yield frame
+
+        # constant velocity, bounce at the borders
+        positions += velocities
+        out = (positions < 0) | (positions > limits)
+        velocities[out] *= -1
+        positions = np.clip(positions, 0, limits)
+
+
+def video_sequence(path: Path, num_frames: int) -> Iterator[np.ndarray]:
+    """Yield up to num_frames frames from a video file."""
+    video = cv2ext.IterableVideo(path, use_thread=False)
+    for frame_id, frame in video:
+        if frame_id >= num_frames:
+            break
+        yield frame
+    video.stop()
+
+
+def _recall(
+    reference: list[tuple[int, int, int, int]],
+    found: list[tuple[int, int, int, int]],
+) -> float:
+    if len(reference) == 0:
+        return 1.0
+    if len(found) == 0:
+        return 0.0
+    return len(match(reference, found, iou_threshold=0.5)) / len(reference)
+
+
+def run_sequence(
+    frames: list[np.ndarray],
+    packer_name: str,
+    method: str,
+    alloc_frames: int,
+    canvas_size: tuple[int, int] | None,
+) -> dict[str, float | int | str]:
+    """Benchmark a single packer configuration on a sequence of frames."""
+    height, width = frames[0].shape[:2]
+    random.seed(0)
+
+    def _make() -> AbstractGridFramePacker:
+        return PACKERS[packer_name](
+            (width, height),
+            method=method,
+            canvas_size=canvas_size,
+        )
+
+    # warmup pass, triggers any JIT compilation before timing
+    packer = _make()
+    packed, transform = packer.pack(frames[0])
+    packer.unpack(detect_blobs(packed), transform)
+
+    packer = _make()
+    pack_times: list[float] = []
+    unpack_times: list[float] = []
+    area_ratios: list[float] = []
+    recalls: list[float] = []
+    for frame in frames:
+        t0 = time.perf_counter()
+        packed, transform = packer.pack(frame)
+        t1 = time.perf_counter()
+
+        # the packed detections are computed outside the timed region
+        packed_dets = detect_blobs(packed)
+
+        t2 = time.perf_counter()
+        unpacked = packer.unpack(packed_dets, transform)
+        t3 = time.perf_counter()
+
+        packer.update(unpacked)
+        pack_times.append((t1 - t0) * 1000.0)
+        unpack_times.append((t3 - t2) * 1000.0)
+        area_ratios.append(
+            (packed.shape[0] * packed.shape[1]) / (width * height),
+        )
+        recalls.append(_recall(detect_blobs(frame), unpacked))
+
+    # separate allocation pass, tracemalloc distorts timing
+    packer = _make()
+    peaks: list[int] = []
+    tracemalloc.start()
+    for frame in frames[:alloc_frames]:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        packer.pack(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - base)
+    tracemalloc.stop()
+
+    def _pct(values: list[float], q: float) -> float:
+        return float(np.percentile(values, q))
+
+    return {
+        "packer": packer_name,
+        "method": method,
+        "frames": len(frames),
+        "pack_ms_mean": statistics.fmean(pack_times),
+        "pack_ms_p50": _pct(pack_times, 50),
+        "pack_ms_p95": _pct(pack_times, 95),
+        "unpack_ms_mean": statistics.fmean(unpack_times),
+        "unpack_ms_p95": _pct(unpack_times, 95),
+        "area_ratio_mean": statistics.fmean(area_ratios),
+        "alloc_peak_bytes_mean": statistics.fmean(peaks) if peaks else 0.0,
+        "recall_mean": statistics.fmean(recalls),
+    }
+
+
+def main() -> None:
     parser = argparse.ArgumentParser(description="Process frame packing benchmarks.")
     parser.add_argument(
-        "--iterations", type=int, default=1000, help="The number of iterations to run.",
+        "--frames",
+        type=int,
+        default=200,
+        help="The number of frames to run per sequence.",
     )
-    args = parser.parse_args()
-
-    # simple method
-    packer = cv2ext.detection.AnnealingFramePacker((1920, 1080), method="simple")
-    frame = np.random.random_integers(0, 255, size=(1080, 1920, 3)).astype(np.uint8)
-    func = partial(
-        packer.pack,
-        frame,
+    parser.add_argument(
+        "--boxes",
+        type=int,
+        default=8,
+        help="The number of moving boxes in the synthetic sequence.",
+    )
+    parser.add_argument(
+        "--alloc-frames",
+        type=int,
+        default=20,
+        help="The number of frames to trace allocations on.",
     )
-    run_benchmark(func, "framepacking_simple", args.iterations)
-
-    # shelf method
-    packer = cv2ext.detection.AnnealingFramePacker((1920, 1080), method="shelf")
-    frame = np.random.random_integers(0, 255, size=(1080, 1920, 3)).astype(np.uint8)
-    func = partial(
-        packer.pack,
-        frame,
+    parser.add_argument(
+        "--canvas",
+        type=int,
+        nargs=2,
+        default=None,
+        metavar=("WIDTH", "HEIGHT"),
+        help="Pack into a fixed size canvas.",
     )
-    run_benchmark(func, "framepacking_shelf", args.iterations)
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=None,
+        help=(
+            "Directory of video clips (.mp4, .avi, .mkv, .mov) to run in "
+            "addition to the synthetic sequence, such as recordings from the "
+            "deployed camera. None are shipped with cv2ext, so by default "
+            "only the synthetic sequence is run."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks") / "results" / "framepack.json",
+        help="The path to write the JSON results to.",
+    )
+    args = parser.parse_args()
+    canvas_size = tuple(args.canvas) if args.canvas else None
+
+    sequences: dict[str, list[np.ndarray]] = {
+        "synthetic": list(
+            synthetic_sequence(1280, 720, args.frames, args.boxes),
+        ),
+    }
+    if args.data is not None:
+        for path in sorted(args.data.iterdir()):
+            if path.suffix.lower() in VIDEO_EXTS:
+                frames = list(video_sequence(path, args.frames))
+                if len(frames) > 0:
+                    sequences[path.name] = frames
+
+    results = []
+    for seq_name, frames in sequences.items():
+        for packer_name in PACKERS:
+            for method in METHODS:
+                for jit in (False, True):
+                    if jit:
+                        cv2ext.enable_jit()
+                    else:
+                        cv2ext.disable_jit()
+                    result = run_sequence(
+                        frames,
+                        packer_name,
+                        method,
+                        args.alloc_frames,
+                        canvas_size,
+                    )
+                    result["sequence"] = seq_name
+                    result["jit"] = jit
+                    # the kernels compiled so far, any which could not be
+                    # compiled ran in Python even with the JIT enabled
+                    kernels = (
+                        cv2ext.jit_status() if jit else {"compiled": [], "python": []}
+                    )
+                    result["compiled_kernels"] = kernels["compiled"]
+                    result["python_kernels"] = kernels["python"]
+                    if kernels["python"]:
+                        print(f"ran in Python with jit=True: {kernels['python']}")
+                    results.append(result)
+                    print(
+                        f"{seq_name:>12} {packer_name:>9} {method:>6} jit={jit!s:<5} "
+                        f"pack={result['pack_ms_mean']:.3f}ms "
+                        f"unpack={result['unpack_ms_mean']:.3f}ms "
+                        f"area={result['area_ratio_mean']:.3f} "
+                        f"recall={result['recall_mean']:.3f}",
+                    )
+    cv2ext.disable_jit()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w") as f:
+        json.dump(
+            {
+                "benchmark": "framepack",
+                "cv2ext": cv2ext.__version__,
+                "canvas_size": canvas_size,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
 
 
 if __name__ == "__main__":
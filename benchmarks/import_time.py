@@ -0,0 +1,142 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import cv2ext
+
+_SUBMODULES = [
+    "bboxes",
+    "cli",
+    "detection",
+    "image",
+    "io",
+    "metrics",
+    "pipeline",
+    "profiling",
+    "research",
+    "template",
+    "tracking",
+    "video",
+]
+
+
+def _importtime(statement: str) -> dict[str, tuple[float, float]]:
+    # self and cumulative import time in ms of every module imported by
+    # statement, in a fresh interpreter so nothing is already imported
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us) / 1000.0, int(cumulative_us) / 1000.0)
+    return times
+
+
+def _measure(statement: str, module: str, runs: int) -> dict[str, float]:
+    cumulative = []
+    for _ in range(runs):
+        times = _importtime(statement)
+        cumulative.append(times[module][1] if module in times else 0.0)
+    return {
+        "ms_median": statistics.median(cumulative),
+        "ms_min": min(cumulative),
+        "ms_max": max(cumulative),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process import time benchmarks.")
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=10,
+        help="The number of fresh interpreters to import in.",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=250.0,
+        help="The budget for the median time of import cv2ext, in ms.",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="The number of most expensive modules to report.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks") / "results" / "import_time.json",
+        help="The path to write the JSON results to.",
+    )
+    args = parser.parse_args()
+
+    # cv2 is imported by cv2ext itself, so it bounds the import time from below
+    baseline = _measure("import cv2", "cv2", args.runs)
+    package = _measure("import cv2ext", "cv2ext", args.runs)
+    print(f"{'cv2':>20} {baseline['ms_median']:.1f}ms")
+    print(f"{'cv2ext':>20} {package['ms_median']:.1f}ms")
+
+    # the full cost of importing each submodule, including cv2ext itself
+    submodules = {}
+    for name in _SUBMODULES:
+        submodules[name] = _measure(
+            f"import cv2ext.{name}",
+            f"cv2ext.{name}",
+            args.runs,
+        )
+        print(f"{'cv2ext.' + name:>20} {submodules[name]['ms_median']:.1f}ms")
+
+    # the heaviest modules of a single import of cv2ext, by their own time
+    times = _importtime("import cv2ext")
+    heaviest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)
+    top = [
+        {"module": name, "self_ms": self_ms, "cumulative_ms": cumulative_ms}
+        for name, (self_ms, cumulative_ms) in heaviest[: args.top]
+    ]
+
+    within_budget = package["ms_median"] <= args.budget
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w") as f:
+        json.dump(
+            {
+                "benchmark": "import_time",
+                "cv2ext": cv2ext.__version__,
+                "python": sys.version,
+                "runs": args.runs,
+                "budget_ms": args.budget,
+                "within_budget": within_budget,
+                "cv2": baseline,
+                "cv2ext_import": package,
+                "submodules": submodules,
+                "top": top,
+            },
+            f,
+            indent=2,
+        )
+
+    if not within_budget:
+        print(
+            f"import cv2ext took {package['ms_median']:.1f}ms, "
+            f"over the budget of {args.budget:.1f}ms",
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
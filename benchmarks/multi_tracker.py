@@ -0,0 +1,167 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Event, Thread
+
+import cv2
+import numpy as np
+
+import cv2ext
+from cv2ext.tracking import MultiTracker, TrackerType
+
+
+class _ThreadPerObject:
+    # the previous threaded MultiTracker, one thread and two queues per object
+    def __init__(self, tracker_type: TrackerType) -> None:
+        self._tracker_type = tracker_type.value
+        self._stop_event = Event()
+        self._threads: list[Thread] = []
+        self._in_queues: list[Queue] = []
+        self._out_queues: list[Queue] = []
+
+    def _target(self, image: np.ndarray, bbox: tuple, idx: int) -> None:
+        tracker = self._tracker_type()
+        tracker.init(image, bbox)
+        while not self._stop_event.is_set():
+            with contextlib.suppress(Empty):
+                frame = self._in_queues[idx].get(timeout=0.1)
+                self._out_queues[idx].put_nowait(tracker.update(frame))
+
+    def init(self, image: np.ndarray, bboxes: list[tuple]) -> None:
+        self.close()
+        self._stop_event.clear()
+        for idx, bbox in enumerate(bboxes):
+            self._in_queues.append(Queue())
+            self._out_queues.append(Queue())
+            thread = Thread(target=self._target, args=(image, bbox, idx), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def update(self, image: np.ndarray) -> list:
+        for in_queue in self._in_queues:
+            in_queue.put(image)
+        return [out_queue.get(timeout=10.0) for out_queue in self._out_queues]
+
+    def close(self) -> None:
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads, self._in_queues, self._out_queues = [], [], []
+
+
+def _frames(num_frames: int, width: int, height: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(
+        rng.integers(0, 255, (height, width, 3), dtype=np.uint8),
+        (7, 7),
+        0,
+    )
+    return [np.roll(base, (i, 2 * i), axis=(0, 1)) for i in range(num_frames)]
+
+
+def _bboxes(num_objects: int, width: int, height: int) -> list[tuple]:
+    rng = np.random.default_rng(1)
+    corners = rng.integers(0, [width - 64, height - 64], (num_objects, 2))
+    return [(int(x), int(y), int(x) + 48, int(y) + 48) for x, y in corners]
+
+
+def _run(tracker: object, frames: list[np.ndarray], bboxes: list[tuple]) -> dict:
+    t0 = time.perf_counter()
+    tracker.init(frames[0], bboxes)  # type: ignore[attr-defined]
+    init_ms = (time.perf_counter() - t0) * 1000.0
+    timing = []
+    for frame in frames[1:]:
+        t0 = time.perf_counter()
+        tracker.update(frame)  # type: ignore[attr-defined]
+        timing.append((time.perf_counter() - t0) * 1000.0)
+    tracker.close()  # type: ignore[attr-defined]
+    return {
+        "init_ms": init_ms,
+        "update_ms_mean": statistics.fmean(timing),
+        "update_ms_p95": float(np.percentile(timing, 95)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process MultiTracker benchmarks.")
+    parser.add_argument(
+        "--tracker",
+        type=str,
+        default="KCF",
+        help="The TrackerType to benchmark.",
+    )
+    parser.add_argument(
+        "--objects",
+        type=int,
+        nargs="+",
+        default=[10, 50, 200],
+        help="The numbers of tracked objects.",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=30,
+        help="The number of frames to track over.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks") / "results" / "multi_tracker.json",
+        help="The path to write the JSON results to.",
+    )
+    args = parser.parse_args()
+
+    tracker_type = TrackerType[args.tracker]
+    width, height = 1280, 720
+    frames = _frames(args.frames, width, height)
+
+    results = []
+    for num_objects in args.objects:
+        bboxes = _bboxes(num_objects, width, height)
+        modes = {
+            "serial": MultiTracker(tracker_type, use_threads=False),
+            "pool": MultiTracker(tracker_type, use_threads=True),
+            "thread_per_object": _ThreadPerObject(tracker_type),
+        }
+        for mode, tracker in modes.items():
+            result: dict[str, float | int | str] = {
+                "mode": mode,
+                "objects": num_objects,
+            }
+            result.update(_run(tracker, frames, bboxes))
+            results.append(result)
+            print(
+                f"{num_objects:>5} {mode:>18} "
+                f"init {result['init_ms']:.1f}ms "
+                f"update {result['update_ms_mean']:.2f}ms",
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w") as f:
+        json.dump(
+            {
+                "benchmark": "multi_tracker",
+                "cv2ext": cv2ext.__version__,
+                "tracker": args.tracker,
+                "cpu_count": os.cpu_count(),
+                "image_size": [width, height],
+                "frames": args.frames,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
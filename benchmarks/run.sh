@@ -3,3 +3,9 @@
 python3 benchmarks/iou.py
 python3 benchmarks/ncc.py
 python3 benchmarks/nms.py
+python3 benchmarks/framepack.py
+python3 benchmarks/similarity.py
+python3 benchmarks/multi_tracker.py
+python3 benchmarks/sort_tracker.py
+python3 benchmarks/tracking.py
+python3 benchmarks/import_time.py
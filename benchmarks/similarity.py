@@ -0,0 +1,156 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+import cv2ext
+from cv2ext.metrics import (
+    dhash,
+    dhash_many,
+    hamming,
+    histogram_distance,
+    histogram_distance_many,
+    ncc,
+    ncc_many,
+    phash,
+    phash_many,
+    ssim,
+    ssim_many,
+)
+
+
+def _time(func: Callable[[], object], iterations: int) -> dict[str, float]:
+    func()
+    timing = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        func()
+        timing.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "ms_mean": statistics.fmean(timing),
+        "ms_p50": float(np.percentile(timing, 50)),
+        "ms_p95": float(np.percentile(timing, 95)),
+    }
+
+
+def _per_roi(
+    func: Callable[[np.ndarray, np.ndarray], object],
+    image1: np.ndarray,
+    image2: np.ndarray,
+    bboxes: list[tuple[int, int, int, int]],
+) -> None:
+    for x1, y1, x2, y2 in bboxes:
+        func(image1[y1:y2, x1:x2], image2[y1:y2, x1:x2])
+
+
+def _hash_pair(
+    func: Callable[[np.ndarray], int],
+    image1: np.ndarray,
+    image2: np.ndarray,
+) -> int:
+    return hamming(func(image1), func(image2))
+
+
+def _hash_pair_many(
+    func: Callable[[np.ndarray, list[tuple[int, int, int, int]]], np.ndarray],
+    image1: np.ndarray,
+    image2: np.ndarray,
+    bboxes: list[tuple[int, int, int, int]],
+) -> np.ndarray:
+    return hamming(func(image1, bboxes), func(image2, bboxes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process similarity benchmarks.")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=100,
+        help="The number of iterations to run.",
+    )
+    parser.add_argument(
+        "--rois",
+        type=int,
+        default=32,
+        help="The number of regions for the batched metrics.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks") / "results" / "similarity.json",
+        help="The path to write the JSON results to.",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    width, height = 1280, 720
+    image1 = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    image2 = image1.copy()
+    image2[100:300, 200:500] = rng.integers(0, 255, (200, 300, 3), dtype=np.uint8)
+
+    sizes = rng.integers(32, 160, (args.rois, 2))
+    corners = rng.integers(0, [width - 160, height - 160], (args.rois, 2))
+    bboxes = [
+        (int(x), int(y), int(x + w), int(y + h))
+        for (x, y), (w, h) in zip(corners, sizes)
+    ]
+
+    frame_funcs: dict[str, Callable[[], object]] = {
+        "ncc_112": partial(ncc, image1, image2, (112, 112)),
+        "ncc_full": partial(ncc, image1, image2, None, resize=False),
+        "ssim_112": partial(ssim, image1, image2, (112, 112)),
+        "ssim_full": partial(ssim, image1, image2),
+        "histogram": partial(histogram_distance, image1, image2),
+        "dhash": partial(_hash_pair, dhash, image1, image2),
+        "phash": partial(_hash_pair, phash, image1, image2),
+    }
+    roi_funcs: dict[str, Callable[[], object]] = {
+        "ncc_loop": partial(
+            _per_roi,
+            partial(ncc, size=None, resize=False),
+            image1,
+            image2,
+            bboxes,
+        ),
+        "ncc_many": partial(ncc_many, image1, image2, bboxes),
+        "ssim_many": partial(ssim_many, image1, image2, bboxes),
+        "histogram_many": partial(histogram_distance_many, image1, image2, bboxes),
+        "dhash_many": partial(_hash_pair_many, dhash_many, image1, image2, bboxes),
+        "phash_many": partial(_hash_pair_many, phash_many, image1, image2, bboxes),
+    }
+
+    results = []
+    for group, funcs in (("frame", frame_funcs), ("rois", roi_funcs)):
+        for name, func in funcs.items():
+            result: dict[str, float | int | str] = {"group": group, "metric": name}
+            result.update(_time(func, args.iterations))
+            results.append(result)
+            print(f"{group:>6} {name:>15} {result['ms_mean']:.3f}ms")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w") as f:
+        json.dump(
+            {
+                "benchmark": "similarity",
+                "cv2ext": cv2ext.__version__,
+                "image_size": [width, height],
+                "rois": args.rois,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+import cv2ext
+from cv2ext.tracking import MultiTracker, TrackerType
+from cv2ext.tracking.trackers import SortTracker
+
+
+def _scene(
+    num_objects: int,
+    num_frames: int,
+    width: int,
+    height: int,
+) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    # textured frames with objects moving at constant velocity
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    corners = rng.uniform(0, [width - 40, height - 40], (num_objects, 2))
+    velocity = rng.uniform(-2, 2, (num_objects, 2))
+    frames = []
+    detections = []
+    for i in range(num_frames):
+        moved = np.clip(corners + velocity * i, 0, [width - 40, height - 40])
+        detections.append(np.concatenate([moved, moved + 32], axis=1))
+        frames.append(np.roll(base, i, axis=1))
+    return frames, detections
+
+
+def _time_sort(
+    tracker: SortTracker,
+    frames: list[np.ndarray],
+    detections: list[np.ndarray],
+    drop: float,
+) -> list[float]:
+    rng = np.random.default_rng(1)
+    timing = []
+    for frame, dets in zip(frames, detections):
+        kept = dets[rng.random(len(dets)) >= drop]
+        t0 = time.perf_counter()
+        tracker.update(kept, frame)
+        timing.append((time.perf_counter() - t0) * 1000.0)
+    return timing
+
+
+def _time_multi(
+    frames: list[np.ndarray],
+    detections: list[np.ndarray],
+) -> list[float]:
+    tracker = MultiTracker(TrackerType.KCF, use_threads=False)
+    tracker.init(frames[0], [tuple(int(v) for v in box) for box in detections[0]])
+    timing = []
+    for frame in frames[1:]:
+        t0 = time.perf_counter()
+        tracker.update(frame)
+        timing.append((time.perf_counter() - t0) * 1000.0)
+    tracker.close()
+    return timing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process SortTracker benchmarks.")
+    parser.add_argument(
+        "--objects",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="The numbers of tracked objects.",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=50,
+        help="The number of frames to track over.",
+    )
+    parser.add_argument(
+        "--drop",
+        type=float,
+        default=0.1,
+        help="The fraction of detections dropped for the fallback mode.",
+    )
+    parser.add_argument(
+        "--max-kcf",
+        type=int,
+        default=100,
+        help="The largest number of objects to run the per-object KCF baseline on.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks") / "results" / "sort_tracker.json",
+        help="The path to write the JSON results to.",
+    )
+    args = parser.parse_args()
+
+    width, height = 1280, 720
+    results = []
+    for num_objects in args.objects:
+        frames, detections = _scene(num_objects, args.frames, width, height)
+        modes = {
+            "sort": lambda f=frames, d=detections: _time_sort(
+                SortTracker(),
+                f,
+                d,
+                0.0,
+            ),
+            "sort_klt_fallback": lambda f=frames, d=detections: _time_sort(
+                SortTracker(fallback=TrackerType.KLT),
+                f,
+                d,
+                args.drop,
+            ),
+        }
+        if num_objects <= args.max_kcf:
+            modes["kcf_per_object"] = lambda f=frames, d=detections: _time_multi(f, d)
+
+        for mode, run in modes.items():
+            timing = run()
+            ms_mean = statistics.fmean(timing)
+            result: dict[str, float | int | str] = {
+                "mode": mode,
+                "objects": num_objects,
+                "ms_mean": ms_mean,
+                "ms_p95": float(np.percentile(timing, 95)),
+                "fps": 1000.0 / ms_mean if ms_mean > 0 else float("inf"),
+            }
+            results.append(result)
+            print(f"{num_objects:>5} {mode:>18} {ms_mean:.3f}ms")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w") as f:
+        json.dump(
+            {
+                "benchmark": "sort_tracker",
+                "cv2ext": cv2ext.__version__,
+                "image_size": [width, height],
+                "frames": args.frames,
+                "drop": args.drop,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+
+import cv2
+import matplotlib.pyplot as plt
+import numpy as np
+
+import cv2ext
+from cv2ext.bboxes import ious as pairwise_ious
+from cv2ext.tracking import MultiTracker, Tracker, TrackerType
+from cv2ext.tracking.trackers import KLTMultiTracker
+
+_BBOX = list[tuple[int, int, int, int]]
+_RESULTS = list[tuple[bool, tuple[int, int, int, int]]]
+
+
+def _scene(
+    num_objects: int,
+    num_frames: int,
+    width: int,
+    height: int,
+) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    # textured objects moving at constant velocity over a textured
+    # background, bouncing off the borders of the frame
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur(
+        rng.integers(0, 255, (height, width, 3), dtype=np.uint8),
+        (9, 9),
+        0,
+    )
+    side = max(16, min(width, height) // 8)
+    patches = [
+        cv2.GaussianBlur(
+            rng.integers(0, 255, (side, side, 3), dtype=np.uint8),
+            (5, 5),
+            0,
+        )
+        for _ in range(num_objects)
+    ]
+    limit = np.array([width - side, height - side], dtype=np.float64)
+    position = rng.uniform(0, limit, (num_objects, 2))
+    velocity = rng.uniform(-0.01, 0.01, (num_objects, 2)) * min(width, height)
+
+    frames = []
+    truth = []
+    for _ in range(num_frames):
+        frame = background.copy()
+        corners = position.astype(np.intp)
+        for patch, (x, y) in zip(patches, corners):
+            frame[y : y + side, x : x + side] = patch
+        frames.append(frame)
+        truth.append(np.concatenate([corners, corners + side], axis=1))
+
+        position += velocity
+        bounced = (position < 0) | (position > limit)
+        velocity[bounced] *= -1
+        np.clip(position, 0, limit, out=position)
+    return frames, truth
+
+
+def _single(tracker_type: TrackerType) -> tuple[Callable, Callable]:
+    # a single object tracker, driven through the same calls as the multi trackers
+    tracker = Tracker(tracker_type)
+
+    def _init(image: np.ndarray, bboxes: _BBOX) -> None:
+        tracker.init(image, bboxes[0])
+
+    def _update(image: np.ndarray) -> _RESULTS:
+        return [tracker.update(image)]
+
+    return _init, _update
+
+
+def _multi(tracker: MultiTracker | KLTMultiTracker) -> tuple[Callable, ...]:
+    close = tracker.close if isinstance(tracker, MultiTracker) else lambda: None
+    return tracker.init, tracker.update, close
+
+
+def _modes(
+    tracker_types: list[TrackerType],
+    num_objects: int,
+) -> dict[str, Callable[[], tuple[Callable, Callable, Callable]]]:
+    # each mode creates a fresh tracker, returning its init, update, and close
+    modes: dict[str, Callable[[], tuple[Callable, Callable, Callable]]] = {}
+    for tracker_type in tracker_types:
+        if num_objects == 1:
+            modes[f"{tracker_type.name}/tracker"] = lambda t=tracker_type: (
+                *_single(t),
+                lambda: None,
+            )
+        for use_threads, name in ((False, "serial"), (True, "pool")):
+            modes[f"{tracker_type.name}/{name}"] = (
+                lambda t=tracker_type, threads=use_threads: _multi(
+                    MultiTracker(t, use_threads=threads),
+                )
+            )
+    modes["KLT/multi"] = lambda: _multi(KLTMultiTracker())
+    return modes
+
+
+def _run(
+    create: Callable[[], tuple[Callable, Callable, Callable]],
+    frames: list[np.ndarray],
+    truth: list[np.ndarray],
+) -> dict[str, float]:
+    init, update, close = create()
+    bboxes = [tuple(int(v) for v in box) for box in truth[0]]
+    t0 = time.perf_counter()
+    init(frames[0], bboxes)
+    init_ms = (time.perf_counter() - t0) * 1000.0
+
+    timing = []
+    ious = []
+    successes = 0
+    total = 0
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    for frame, boxes in zip(frames[1:], truth[1:]):
+        t0 = time.perf_counter()
+        results = update(frame)
+        timing.append((time.perf_counter() - t0) * 1000.0)
+
+        ious.extend(
+            pairwise_ious(
+                [bbox for _, bbox in results],
+                [tuple(int(v) for v in box) for box in boxes[: len(results)]],
+            ),
+        )
+        successes += sum(success for success, _ in results)
+        total += len(results)
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    close()
+
+    ms_mean = statistics.fmean(timing)
+    return {
+        "init_ms": init_ms,
+        "ms_mean": ms_mean,
+        "ms_p50": float(np.percentile(timing, 50)),
+        "ms_p90": float(np.percentile(timing, 90)),
+        "ms_p99": float(np.percentile(timing, 99)),
+        "fps": 1000.0 / ms_mean if ms_mean > 0 else float("inf"),
+        # process CPU time per wall time, 1.0 is one fully busy core
+        "cpu_utilization": cpu / wall if wall > 0 else 0.0,
+        "iou_mean": statistics.fmean(ious),
+        "iou_50": float(np.mean(np.asarray(ious) >= 0.5)),
+        "reported_success": successes / total,
+    }
+
+
+def _plot(results: list[dict], output: Path) -> None:
+    # cost against accuracy, one figure per resolution and object count
+    output.mkdir(parents=True, exist_ok=True)
+    groups = sorted({(r["resolution"], r["objects"]) for r in results})
+    for resolution, objects in groups:
+        group = [
+            r
+            for r in results
+            if r["resolution"] == resolution and r["objects"] == objects
+        ]
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        names = [r["mode"] for r in group]
+        ax1.barh(names, [r["ms_p50"] for r in group], label="p50")
+        ax1.barh(
+            names,
+            [r["ms_p99"] - r["ms_p50"] for r in group],
+            left=[r["ms_p50"] for r in group],
+            alpha=0.4,
+            label="p99",
+        )
+        ax1.set_xlabel("Update latency (ms)")
+        ax1.set_xscale("log")
+        ax1.legend()
+        for r in group:
+            ax2.scatter(r["ms_mean"], r["iou_mean"])
+            ax2.annotate(r["mode"], (r["ms_mean"], r["iou_mean"]), fontsize=7)
+        ax2.set_xlabel("Mean update latency (ms)")
+        ax2.set_xscale("log")
+        ax2.set_ylabel("Mean IoU")
+        ax2.set_ylim(0.0, 1.0)
+        fig.suptitle(f"Tracking {resolution} with {objects} objects")
+        fig.tight_layout()
+        fig.savefig(str(output / f"tracking_{resolution}_{objects}.png"))
+        plt.close(fig)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process tracking benchmarks.")
+    parser.add_argument(
+        "--trackers",
+        type=str,
+        nargs="+",
+        default=[t.name for t in TrackerType],
+        help="The TrackerTypes to benchmark.",
+    )
+    parser.add_argument(
+        "--resolutions",
+        type=str,
+        nargs="+",
+        default=["640x360", "1280x720", "1920x1080"],
+        help="The frame sizes, as WIDTHxHEIGHT.",
+    )
+    parser.add_argument(
+        "--objects",
+        type=int,
+        nargs="+",
+        default=[1, 10],
+        help="The numbers of tracked objects.",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=30,
+        help="The number of frames to track over.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks") / "results" / "tracking.json",
+        help="The path to write the JSON results to.",
+    )
+    parser.add_argument(
+        "--plots",
+        type=Path,
+        default=Path("benchmarks") / "plots",
+        help="The directory to write the plots to.",
+    )
+    args = parser.parse_args()
+
+    tracker_types = [TrackerType[name] for name in args.trackers]
+
+    results = []
+    for resolution in args.resolutions:
+        width, height = (int(v) for v in resolution.split("x"))
+        for num_objects in args.objects:
+            frames, truth = _scene(num_objects, args.frames, width, height)
+            for mode, create in _modes(tracker_types, num_objects).items():
+                try:
+                    result: dict[str, float | int | str] = {
+                        "mode": mode,
+                        "resolution": resolution,
+                        "objects": num_objects,
+                    }
+                    result.update(_run(create, frames, truth))
+                except ImportError:
+                    print(f"{mode} is not available, skipping")
+                    continue
+                results.append(result)
+                print(
+                    f"{resolution:>10} {num_objects:>4} {mode:>18} "
+                    f"p50 {result['ms_p50']:.2f}ms "
+                    f"p99 {result['ms_p99']:.2f}ms "
+                    f"cpu {result['cpu_utilization']:.2f} "
+                    f"iou {result['iou_mean']:.3f}",
+                )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w") as f:
+        json.dump(
+            {
+                "benchmark": "tracking",
+                "cv2ext": cv2ext.__version__,
+                "cpu_count": os.cpu_count(),
+                "frames": args.frames,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    _plot(results, args.plots)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,10 @@ Submodules
     Submodule containing tools for working with video and image io.
 :mod:`metrics`
     Submodule containing tools for working with image metrics.
+:mod:`pipeline`
+    Submodule containing composable, threaded pipelines of stages.
+:mod:`profiling`
+    Submodule containing opt-in timing instrumentation for cv2ext.
 :mod:`research`
     Submodule containing implementations of research papers and methods.
 :mod:`template`
@@ -30,6 +34,10 @@ Submodules
 
 Classes
 -------
+:class:`AsyncIterableVideo`
+    A class for iterating over frames in a video from asyncio.
+:class:`AsyncVideoWriter`
+    A class for writing videos from asyncio.
 :class:`Display`
     A class for displaying images using a separate thread.
 :class:`Fourcc`
@@ -49,6 +57,10 @@ Functions
     Disable just-in-time compilation using Numba for some functions.
 :func:`register_jit`
     Register a function to be just-in-time compiled.
+:func:`warmup_jit`
+    Compile the registered functions for their common signatures.
+:func:`jit_status`
+    Get which registered functions have run compiled, and which fell back.
 
 """
 
@@ -132,6 +144,7 @@ if level is not None and level.upper() not in [
     _log.warning(f"Invalid log level: {level}. Using default log level: WARNING")
 
 import contextlib
+import importlib
 from typing import TYPE_CHECKING
 
 import cv2
@@ -183,14 +196,82 @@ class _DEL:
 _WINDOW_MANAGER = _DEL(_log)
 
 
-from . import bboxes, detection, image, io, metrics, research, template, tracking, video
-from .io import Display, Fourcc, IterableVideo, VideoWriter
-from ._jit import JIT, enable_jit, disable_jit, register_jit
+from ._jit import JIT, enable_jit, disable_jit, jit_status, register_jit, warmup_jit
+
+if TYPE_CHECKING:
+    from . import (
+        bboxes,
+        cli,
+        detection,
+        image,
+        io,
+        metrics,
+        pipeline,
+        profiling,
+        research,
+        template,
+        tracking,
+        video,
+    )
+    from .io import (
+        AsyncIterableVideo,
+        AsyncVideoWriter,
+        Display,
+        Fourcc,
+        IterableVideo,
+        VideoWriter,
+    )
+
+# submodules and re-exports are imported on first access (PEP 562),
+# so importing cv2ext only pays for the parts which are used
+_SUBMODULES = {
+    "bboxes",
+    "cli",
+    "detection",
+    "image",
+    "io",
+    "jit_status",
+    "metrics",
+    "pipeline",
+    "profiling",
+    "research",
+    "template",
+    "tracking",
+    "video",
+}
+_REEXPORTS = {
+    "AsyncIterableVideo": "io",
+    "AsyncVideoWriter": "io",
+    "Display": "io",
+    "Fourcc": "io",
+    "IterableVideo": "io",
+    "VideoWriter": "io",
+}
+
+
+def __getattr__(name: str) -> object:
+    if name in _SUBMODULES:
+        # importing a submodule also binds it as an attribute of cv2ext
+        return importlib.import_module(f".{name}", __name__)
+    if name in _REEXPORTS:
+        module = importlib.import_module(f".{_REEXPORTS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    err_msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(err_msg)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "FLAGS",
     "JIT",
     "_WINDOW_MANAGER",
+    "AsyncIterableVideo",
+    "AsyncVideoWriter",
     "Display",
     "Fourcc",
     "IterableVideo",
@@ -202,23 +283,25 @@ __all__ = [
     "enable_jit",
     "image",
     "io",
+    "jit_status",
     "metrics",
+    "pipeline",
+    "profiling",
     "register_jit",
     "research",
     "set_log_level",
     "template",
     "tracking",
     "video",
+    "warmup_jit",
 ]
 __version__ = "0.1.2"
 
 _log.info(f"Initialized cv2ext with version {__version__}")
 
-from . import cli
-
-_log.info("cv2ext.cli initialized.")
-
-__all__ += ["cli"]
+# optionally compile the JIT kernels in the background
+if os.getenv("CV2EXT_JIT_WARMUP", "0").lower() in ("1", "true"):
+    warmup_jit(background=True)
 
 # # automatically enable the JIT if numba is present
 # if FLAGS.FOUND_NUMBA:
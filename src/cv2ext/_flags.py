@@ -23,6 +23,9 @@ class _FLAGS:
     SETUP_LOG_HANDLER : bool
         Whether or not the handler has already been resolved
         on the module level logger.
+    PROFILE : bool
+        Whether or not instrumented functions record their timings,
+        see cv2ext.profiling.
 
     """
 
@@ -30,6 +33,7 @@ class _FLAGS:
     FOUND_NUMBA: bool = False
     WARNED_NUMBA_NOT_FOUND: bool = False
     SETUP_LOG_HANDLER: bool = False
+    PROFILE: bool = False
 
 
 FLAGS = _FLAGS()
@@ -3,8 +3,14 @@
 # MIT License
 from __future__ import annotations
 
+import functools
+import importlib
+import importlib.util
 import logging
-from typing import TYPE_CHECKING
+import os
+import threading
+import traceback
+from typing import TYPE_CHECKING, Generic, cast
 
 from typing_extensions import ParamSpec, TypeVar
 
@@ -14,34 +20,218 @@ _P = ParamSpec("_P")
 _R = TypeVar("_R")
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Sequence
     from types import TracebackType
 
     from typing_extensions import Self
 
 _log = logging.getLogger(__name__)
 
-try:
-    from numba import jit as _jit  # type: ignore[attr-defined, import-untyped]
+# when set, every kernel is cached to this directory across processes
+_CACHE_DIR = os.environ.get("CV2EXT_JIT_CACHE_DIR") or None
 
-    FLAGS.FOUND_NUMBA = True
-except ImportError:
+# importing Numba dominates the import time of cv2ext, so it is
+# only located here and imported once the first kernel is compiled
+FLAGS.FOUND_NUMBA = importlib.util.find_spec("numba") is not None
 
-    def _jit(  # type: ignore[misc]
-        func: Callable[_P, _R],
-        *,
-        nopython: bool,  # noqa: ARG001
-        fastmath: bool,  # noqa: ARG001
-        parallel: bool,  # noqa: ARG001
-        nogil: bool,  # noqa: ARG001
-        cache: bool,  # noqa: ARG001
-        inline: str = "never",  # noqa: ARG001
-    ) -> Callable[_P, _R]:
-        _log.debug(f"Using mock JIT on {func.__name__}")
-        return func
 
+def _mock_jit(
+    func: Callable[_P, _R],
+    *,
+    nopython: bool,  # noqa: ARG001
+    fastmath: bool,  # noqa: ARG001
+    parallel: bool,  # noqa: ARG001
+    nogil: bool,  # noqa: ARG001
+    cache: bool,  # noqa: ARG001
+    inline: str = "never",  # noqa: ARG001
+) -> Callable[_P, _R]:
+    _log.debug(f"Using mock JIT on {func.__name__}")
+    return func
+
+
+class _NotImportedError(Exception):
+    """Stands in for the errors of Numba until it is imported."""
+
+
+_NumbaError: type[Exception] = _NotImportedError
+_NUMBA_JIT: Callable | None = None
+_NUMBA_LOCK = threading.Lock()
+
+
+def _numba_jit() -> Callable:
+    # the numba.jit decorator, importing and configuring Numba on first use
+    global _NUMBA_JIT, _NumbaError  # noqa: PLW0603
+    with _NUMBA_LOCK:
+        if _NUMBA_JIT is not None:
+            return _NUMBA_JIT
+        try:
+            import numba  # type: ignore[import-untyped]  # noqa: PLC0415
+            from numba import core, extending  # noqa: PLC0415
+        except ImportError:
+            FLAGS.FOUND_NUMBA = False
+            _NUMBA_JIT = _mock_jit
+            return _NUMBA_JIT
+
+        _log.debug("Imported Numba")
+        if _CACHE_DIR is not None:
+            # numba reads the location each time a cache is created
+            core.config.CACHE_DIR = _CACHE_DIR  # type: ignore[attr-defined]
 
-_JIT_FUNCS: list[Callable] = []
+        @extending.typeof_impl.register(_JITDispatcher)
+        def _typeof_dispatcher(val: _JITDispatcher, c: object) -> object:  # noqa: ARG001
+            # kernels calling other kernels resolve them to their Numba dispatcher
+            return core.types.Dispatcher(val.compile())  # type: ignore[type-var]
+
+        _NumbaError = core.errors.NumbaError
+        _NUMBA_JIT = numba.jit
+        return _NUMBA_JIT
+
+
+_JIT_LOCK = threading.Lock()
+
+
+def _raised_by_kernel(err: BaseException, func: Callable) -> bool:
+    # errors of Numba converting the arguments only have frames of Numba
+    sources = {kernel.func.__code__.co_filename for kernel in _JIT_FUNCS}
+    sources.add(func.__code__.co_filename)
+    return any(
+        frame.filename in sources
+        for frame in traceback.extract_tb(err.__traceback__)[1:]
+    )
+
+
+class _JITDispatcher(Generic[_P, _R]):
+    """
+    A registered kernel, holding both its Python and compiled forms.
+
+    Each call checks FLAGS.JIT and runs either the original function
+    or the Numba dispatcher, so enable_jit and disable_jit apply at once
+    to every module which imported the kernel. The Numba dispatcher is
+    created on the first call with JIT enabled. If the kernel cannot be
+    compiled for the types of some arguments, a warning is logged and
+    the Python function is used for those types from then on, while
+    other types keep using their compiled versions.
+    """
+
+    def __init__(
+        self: Self,
+        func: Callable[_P, _R],
+        *,
+        fastmath: bool = False,
+        parallel: bool = False,
+        nogil: bool = False,
+        cache: bool = False,
+        inline: str = "never",
+        signatures: tuple[str, ...] = (),
+    ) -> None:
+        self.func = func
+        self.fastmath = fastmath
+        self.parallel = parallel
+        self.nogil = nogil
+        self.cache = cache
+        self.inline = inline
+        self.signatures = signatures
+        self.compiled: Callable[..., _R] | None = None
+        self._use_jit = FLAGS.FOUND_NUMBA
+        # the argument signatures Numba could not compile, run in Python
+        self._failed: set[tuple] = set()
+        functools.update_wrapper(self, func)
+
+    def __repr__(self: Self) -> str:
+        return f"_JITDispatcher({self.func.__qualname__}, compiled={self.compiled is not None})"
+
+    def __call__(self: Self, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        if FLAGS.JIT and self._use_jit:
+            return self._call_jit(*args, **kwargs)
+        return self.func(*args, **kwargs)
+
+    def _signature(
+        self: Self,
+        compiled: object,
+        args: tuple,
+        kwargs: dict,
+    ) -> tuple | None:
+        # the Numba types of the arguments, None if any cannot be typed
+        # and so would be rejected by the dispatcher before running
+        typeof = compiled.typeof_pyval  # type: ignore[attr-defined]
+        try:
+            types = [typeof(arg) for arg in args]
+            types.extend((name, typeof(arg)) for name, arg in sorted(kwargs.items()))
+        except Exception:  # noqa: BLE001
+            return None
+        if any(str(t).startswith("pyobject") for t in types):
+            return None
+        return tuple(types)
+
+    def _call_jit(self: Self, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        compiled = self.compiled
+        if compiled is None:
+            compiled = self.compile()
+            if not FLAGS.FOUND_NUMBA:
+                self._use_jit = False
+                return self.func(*args, **kwargs)
+        # only signatures which failed to compile pay for typing the arguments
+        if self._failed and self._signature(compiled, args, kwargs) in self._failed:
+            return self.func(*args, **kwargs)
+        try:
+            return compiled(*args, **kwargs)
+        except _NumbaError as e:
+            # raised while compiling, before the kernel ran
+            error = e
+        except Exception as err:
+            # an error raised by the kernel itself, or a kernel it calls,
+            # has a frame from their source and must not run the kernel twice
+            if _raised_by_kernel(err, self.func):
+                raise
+            # arguments Numba cannot convert, such as integers beyond uint64
+            # or empty lists, are rejected before running and run in Python
+            return self.func(*args, **kwargs)
+        signature = self._signature(compiled, args, kwargs)
+        if signature is not None:
+            self._failed.add(signature)
+        _log.warning(
+            f"Could not JIT compile {self.func.__name__} for {signature}, using Python",
+        )
+        _log.debug(f"Numba error compiling {self.func.__name__}: {error}")
+        return self.func(*args, **kwargs)
+
+    def compile(self: Self) -> Callable[..., _R]:
+        """
+        Get the Numba dispatcher of the kernel, creating it if needed.
+
+        Returns
+        -------
+        Callable[..., _R]
+            The Numba dispatcher, which compiles lazily per signature.
+
+        """
+        with _JIT_LOCK:
+            compiled = self.compiled
+            if compiled is None:
+                compiled = cast(
+                    "Callable[..., _R]",
+                    _numba_jit()(
+                        self.func,
+                        nopython=True,
+                        fastmath=self.fastmath,
+                        parallel=self.parallel,
+                        nogil=self.nogil,
+                        cache=self.cache or _CACHE_DIR is not None,
+                        inline=self.inline,
+                    ),
+                )
+                self.compiled = compiled
+            return compiled
+
+
+_JIT_FUNCS: list[_JITDispatcher] = []
+# the subpackages which register kernels
+_KERNEL_MODULES = (
+    "cv2ext.bboxes",
+    "cv2ext.detection",
+    "cv2ext.metrics",
+    "cv2ext.template",
+)
 
 
 def jit(
@@ -71,7 +261,8 @@ def jit(
         Default is False.
     cache : bool, optional
         If True, cache jit compiled functions to disk.
-        Default is False.
+        Default is False, unless the CV2EXT_JIT_CACHE_DIR
+        environment variable is set.
     inline : str, optional
         Whether or not to inline functions at the Numba IR level.
         Default is 'never'.
@@ -84,9 +275,10 @@ def jit(
 
     """
     funcname = func.__name__
+    cache = cache or _CACHE_DIR is not None
     if FLAGS.JIT:
         _log.debug(f"Marking: {funcname} for JIT compilation")
-        func = _jit(  # type: ignore[no-any-return]
+        func = _numba_jit()(
             func,
             nopython=True,
             fastmath=fastmath,
@@ -106,9 +298,10 @@ def register_jit(
     nogil: bool = False,
     cache: bool = False,
     inline: str = "never",
+    signatures: Sequence[str] | None = None,
 ) -> Callable[[Callable[_P, _R]], Callable[_P, _R]]:
     """
-    Register a function to be re-imported whenever JIT status changes.
+    Register a function to be JIT compiled whenever JIT is enabled.
 
     Parameters
     ----------
@@ -131,11 +324,19 @@ def register_jit(
         Whether or not to inline functions at the Numba IR level.
         Default is 'never'.
         Options are: ['never', 'always']
+    signatures : Sequence[str], optional
+        The Numba signatures the function is commonly called with,
+        such as "float64(uint8[:, ::1], uint8[:, ::1])".
+        These are compiled eagerly by warmup_jit, other signatures
+        are still compiled lazily when first called.
+        Default is None.
 
     Returns
     -------
     Callable[[Callable[_P, _R]], Callable[_P, _R]]
-        The registered and optionally JIT-compiled function.
+        A decorator wrapping the function in a dispatcher, which
+        calls the JIT compiled function while JIT is enabled and
+        the original function otherwise.
 
     Examples
     --------
@@ -150,23 +351,100 @@ def register_jit(
 
     def decorator(func: Callable[_P, _R]) -> Callable[_P, _R]:
         _log.debug(f"Registering func: {func.__name__} for potential JIT")
-        _JIT_FUNCS.append(func)
-        return jit(
+        kernel = _JITDispatcher(
             func,
             fastmath=fastmath,
             parallel=parallel,
             nogil=nogil,
             cache=cache,
             inline=inline,
+            signatures=tuple(signatures or ()),
         )
+        _JIT_FUNCS.append(kernel)
+        return kernel
 
     return decorator
 
 
-def _reset_funcs() -> None:
-    # re-compile if needed
-    for func in _JIT_FUNCS:
-        globals()[func.__name__] = jit(func)
+def jit_status() -> dict[str, list[str]]:
+    """
+    Get which registered functions have run compiled, and which fell back.
+
+    A function falls back to Python for the argument types Numba could
+    not compile, and may still run compiled for other types, so it can
+    be listed under both keys.
+
+    Returns
+    -------
+    dict[str, list[str]]
+        The names of the functions, in order of registration, under
+        "compiled" if compiled for any argument types, and under
+        "python" if any argument types could not be compiled.
+
+    """
+    status: dict[str, list[str]] = {"compiled": [], "python": []}
+    for kernel in _JIT_FUNCS:
+        name = kernel.func.__name__
+        compiled = kernel.compiled
+        if compiled is not None and getattr(compiled, "signatures", None):
+            status["compiled"].append(name)
+        if kernel._failed:  # noqa: SLF001
+            status["python"].append(name)
+    return status
+
+
+def _warmup() -> None:
+    # kernels register when their subpackage is imported, which cv2ext defers
+    for module in _KERNEL_MODULES:
+        importlib.import_module(module)
+    for kernel in _JIT_FUNCS:
+        if not kernel.signatures:
+            continue
+        dispatcher = kernel.compile()
+        for signature in kernel.signatures:
+            _log.debug(f"Compiling {kernel.func.__name__} for {signature}")
+            try:
+                dispatcher.compile(signature)  # type: ignore[attr-defined]
+            except Exception as e:  # noqa: BLE001
+                _log.warning(
+                    f"Could not compile {kernel.func.__name__} for {signature}",
+                )
+                _log.debug(f"Numba error compiling {kernel.func.__name__}: {e}")
+
+
+def warmup_jit(*, background: bool = False) -> threading.Thread | None:
+    """
+    Compile the registered functions for their common signatures.
+
+    Only functions registered with signatures are compiled, which
+    removes the compilation cost from their first calls. The cv2ext
+    subpackages defining such functions are imported first. Combined with
+    the CV2EXT_JIT_CACHE_DIR environment variable, compiled functions
+    are loaded from disk by later processes instead of compiled again.
+    Setting the CV2EXT_JIT_WARMUP environment variable to 1 runs
+    warmup_jit in the background when cv2ext is imported.
+
+    Parameters
+    ----------
+    background : bool, optional
+        If True, compile in a daemon thread and return immediately.
+        Default is False.
+
+    Returns
+    -------
+    threading.Thread | None
+        The thread compiling the functions, if background is True.
+
+    """
+    if not FLAGS.FOUND_NUMBA:
+        _log.warning("JIT warmup requested, but Numba could not be found.")
+        return None
+    if not background:
+        _warmup()
+        return None
+    thread = threading.Thread(target=_warmup, name="cv2ext-jit-warmup", daemon=True)
+    thread.start()
+    return thread
 
 
 def enable_jit() -> None:
@@ -178,22 +456,20 @@ def enable_jit() -> None:
         _log.warning("JIT has been enabled, but Numba could not be found.")
         FLAGS.WARNED_NUMBA_NOT_FOUND = True
 
-    _reset_funcs()
-
 
 def disable_jit() -> None:
     """Disable JIT compilation."""
     FLAGS.JIT = False
     _log.info("DISABLED JIT")
 
-    _reset_funcs()
-
 
 class _JIT:
     def __init__(self: Self) -> None:
-        pass
+        # the JIT state before each enclosing with block, restored on exit
+        self._previous: list[bool] = []
 
     def __enter__(self: Self) -> Self:
+        self._previous.append(FLAGS.JIT)
         enable_jit()
         return self
 
@@ -203,7 +479,8 @@ class _JIT:
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        disable_jit()
+        if not self._previous.pop():
+            disable_jit()
 
 
 JIT = _JIT()
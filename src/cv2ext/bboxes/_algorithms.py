@@ -63,44 +63,26 @@ def filter_bboxes_by_region(
 
 @register_jit()
 def _match_kernel(
-    bboxes1: Sequence[
-        tuple[int, int, int, int] | tuple[tuple[int, int, int, int], float, int]
-    ],
-    bboxes2: Sequence[
-        tuple[int, int, int, int] | tuple[tuple[int, int, int, int], float, int]
-    ],
+    bboxes1: list[tuple[int, int, int, int]],
+    classids1: list[int],
+    bboxes2: list[tuple[int, int, int, int]],
+    classids2: list[int],
     iou_threshold: float = 0.5,
     *,
     class_agnostic: bool = False,
 ) -> list[tuple[int, int]]:
-    # if len(bboxes1) == 0 or len(bboxes2) == 0:
-    #     err_msg = "Each list of bboxes must have at least length of 1."
-    #     raise ValueError(err_msg)
-
     matches: list[tuple[int, int]] = []
     used_idx: set[int] = set()
 
-    for idx1, entry1 in enumerate(bboxes1):
+    for idx1, bbox1 in enumerate(bboxes1):
         best_iou: float = 0.0
         best_idx: int = -1
 
-        if len(entry1) == 3:
-            bbox1, _, cid1 = entry1
-        else:
-            bbox1 = entry1
-            cid1 = -1
-
-        for idx2, entry2 in enumerate(bboxes2):
+        for idx2, bbox2 in enumerate(bboxes2):
             if idx2 in used_idx:
                 continue
 
-            if len(entry2) == 3:
-                bbox2, _, cid2 = entry2
-            else:
-                bbox2 = entry2
-                cid2 = -1
-
-            if not class_agnostic and cid1 != cid2:
+            if not class_agnostic and classids1[idx1] != classids2[idx2]:
                 continue
 
             iou = _iou_kernel(bbox1, bbox2)
@@ -115,6 +97,25 @@ def _match_kernel(
     return matches
 
 
+def _split_detections(
+    entries: Sequence[
+        tuple[int, int, int, int] | tuple[tuple[int, int, int, int], float, int]
+    ],
+) -> tuple[list[tuple[int, int, int, int]], list[int]]:
+    # bboxes without a class id use -1, so the kernel sees one type of entry
+    bboxes: list[tuple[int, int, int, int]] = []
+    classids: list[int] = []
+    for entry in entries:
+        if len(entry) == 3:
+            bbox, _, classid = entry
+            bboxes.append(bbox)
+            classids.append(classid)
+        else:
+            bboxes.append(entry)
+            classids.append(-1)
+    return bboxes, classids
+
+
 def match(
     bboxes1: Sequence[
         tuple[int, int, int, int] | tuple[tuple[int, int, int, int], float, int]
@@ -148,7 +149,16 @@ def match(
         A list of the matching indices
 
     """
-    return _match_kernel(bboxes1, bboxes2, iou_threshold, class_agnostic=class_agnostic)
+    boxes1, classids1 = _split_detections(bboxes1)
+    boxes2, classids2 = _split_detections(bboxes2)
+    return _match_kernel(
+        boxes1,
+        classids1,
+        boxes2,
+        classids2,
+        iou_threshold,
+        class_agnostic=class_agnostic,
+    )
 
 
 def calculate_metrics(
@@ -6,7 +6,9 @@ from __future__ import annotations
 from cv2ext._jit import register_jit
 
 
-@register_jit()
+@register_jit(
+    signatures=("UniTuple(int64, 4)(UniTuple(int64, 4), UniTuple(int64, 2))",),
+)
 def _constrain_kernel(
     bbox: tuple[int, int, int, int],
     image_size: tuple[int, int],
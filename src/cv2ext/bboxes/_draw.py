@@ -8,8 +8,10 @@ from typing import TYPE_CHECKING
 import cv2
 import numpy as np
 
+# the module rather than its functions, since cv2ext.image.draw imports
+# cv2ext.bboxes and either package may be imported first
+from cv2ext.image import draw
 from cv2ext.image.color import Color
-from cv2ext.image.draw import rectangle, text
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -93,9 +95,9 @@ def draw_bboxes(
     # only draw the boxes
     for bbox in bboxes:
         if opacity and shapes is not None:
-            rectangle(shapes, bbox, color=color, thickness=thickness)
+            draw.rectangle(shapes, bbox, color=color, thickness=thickness)
         else:
-            rectangle(drawing, bbox, color=color, thickness=thickness)
+            draw.rectangle(drawing, bbox, color=color, thickness=thickness)
 
     # blend if opacity and shapes
     if opacity and shapes is not None:
@@ -105,7 +107,7 @@ def draw_bboxes(
     # draw the tags
     for tag, bbox in zip(tags, bboxes):
         if tag:
-            text(
+            draw.text(
                 drawing,
                 tag,
                 bbox[:2],
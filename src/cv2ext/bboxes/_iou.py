@@ -3,23 +3,40 @@
 # MIT License
 from __future__ import annotations
 
+import numpy as np
+
 from cv2ext._jit import register_jit
 
 
-@register_jit(fastmath=True, inline="always")
+@register_jit(
+    fastmath=True,
+    inline="always",
+    signatures=("float64(UniTuple(int64, 4), UniTuple(int64, 4))",),
+)
 def _iou_kernel(
     bbox1: tuple[int, int, int, int],
     bbox2: tuple[int, int, int, int],
 ) -> float:
-    x1a, y1a, x2a, y2a = bbox1
-    x1b, y1b, x2b, y2b = bbox2
+    # float64, since int64 differences and areas overflow once compiled
+    x1a, y1a, x2a, y2a = (
+        float(bbox1[0]),
+        float(bbox1[1]),
+        float(bbox1[2]),
+        float(bbox1[3]),
+    )
+    x1b, y1b, x2b, y2b = (
+        float(bbox2[0]),
+        float(bbox2[1]),
+        float(bbox2[2]),
+        float(bbox2[3]),
+    )
 
     x1 = max(x1a, x1b)
     y1 = max(y1a, y1b)
     x2 = min(x2a, x2b)
     y2 = min(y2a, y2b)
 
-    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
 
     if inter == 0.0:
         return 0.0
@@ -40,6 +57,25 @@ def _iou_kernel_list(
     return list(map(_iou_kernel, bboxes1, bboxes2))
 
 
+def _iou_matrix(bboxes1: np.ndarray, bboxes2: np.ndarray) -> np.ndarray:
+    # pairwise iou of (N, 4) and (M, 4) arrays of xyxy boxes, as (N, M)
+    a = np.asarray(bboxes1, dtype=np.float64).reshape(-1, 1, 4)
+    b = np.asarray(bboxes2, dtype=np.float64).reshape(1, -1, 4)
+    inter_w = np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0])
+    inter_h = np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1])
+    inter = np.maximum(inter_w, 0.0) * np.maximum(inter_h, 0.0)
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    result: np.ndarray = np.divide(
+        inter,
+        union,
+        out=np.zeros_like(inter),
+        where=union > 0,
+    )
+    return result
+
+
 def iou(
     bbox1: tuple[int, int, int, int],
     bbox2: tuple[int, int, int, int],
@@ -5,7 +5,10 @@ from __future__ import annotations
 
 import operator
 
+import numpy as np
+
 from cv2ext._jit import register_jit
+from cv2ext.profiling._profiler import profiled
 
 from ._iou import _iou_kernel
 
@@ -39,6 +42,36 @@ def _nms_kernel(
     return [box for i, box in enumerate(bboxes) if keep[i]]
 
 
+def _nms_array(
+    bboxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float = 0.5,
+    top_k: int | None = None,
+) -> np.ndarray:
+    # greedy nms over an (N, 4) array of xyxy boxes, returns kept indices
+    # in descending score order, the inner iou step is vectorized
+    if len(bboxes) == 0:
+        return np.empty(0, dtype=np.intp)
+    x1, y1, x2, y2 = (bboxes[:, i].astype(np.float64) for i in range(4))
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores, kind="stable")
+    keep: list[int] = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(int(i))
+        if top_k is not None and len(keep) >= top_k:
+            break
+        rest = order[1:]
+        inter_w = np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])
+        inter_h = np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])
+        inter = np.maximum(inter_w, 0.0) * np.maximum(inter_h, 0.0)
+        union = areas[i] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.intp)
+
+
+@profiled("bboxes.nms")
 def nms(
     bboxes: list[tuple[tuple[int, int, int, int], float, int]],
     iou_threshold: float = 0.5,
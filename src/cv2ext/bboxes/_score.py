@@ -8,18 +8,31 @@ import math
 from cv2ext._jit import register_jit
 
 
-@register_jit()
+@register_jit(
+    signatures=("float64(UniTuple(int64, 4), UniTuple(int64, 4))",),
+)
 def _score_bbox_kernel(
     target_bbox: tuple[int, int, int, int],
     pred_bbox: tuple[int, int, int, int],
 ) -> float:
-    tx1, ty1, tx2, ty2 = target_bbox
+    # float64, since int64 sizes and areas overflow once compiled
+    tx1, ty1, tx2, ty2 = (
+        float(target_bbox[0]),
+        float(target_bbox[1]),
+        float(target_bbox[2]),
+        float(target_bbox[3]),
+    )
     th = ty2 - ty1
     tw = tx2 - tx1
     ts = th * tw
     tcx = tx1 + tw / 2
     tcy = ty1 + th / 2
-    nx1, ny1, nx2, ny2 = pred_bbox
+    nx1, ny1, nx2, ny2 = (
+        float(pred_bbox[0]),
+        float(pred_bbox[1]),
+        float(pred_bbox[2]),
+        float(pred_bbox[3]),
+    )
     nh = ny2 - ny1
     nw = nx2 - nx1
     ns = nh * nw
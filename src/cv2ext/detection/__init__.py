@@ -12,6 +12,8 @@ Classes
     A frame packer that uses simulated annealing.
 :class:`BlobDetector`
     A simple blob detector class.
+:class:`MotionFramePacker`
+    A frame packer that explores cells with motion.
 :class:`RandomFramePacker`
     A frame packer that randomly samples.
 
@@ -32,6 +34,7 @@ from ._packer import (
     AbstractFramePacker,
     AbstractGridFramePacker,
     AnnealingFramePacker,
+    MotionFramePacker,
     RandomFramePacker,
 )
 
@@ -40,6 +43,7 @@ __all__ = [
     "AbstractGridFramePacker",
     "AnnealingFramePacker",
     "BlobDetector",
+    "MotionFramePacker",
     "RandomFramePacker",
     "detect_blobs",
     "draw_detections",
@@ -5,14 +5,15 @@
 from __future__ import annotations
 
 import math
-import operator
 import random
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+import cv2
 import numpy as np
 
 from cv2ext._jit import register_jit
+from cv2ext.profiling._profiler import profiled
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -231,7 +232,7 @@ def _simple_grid_repack(
     # copy the old data into new packed image
     # generate the transforms
     # new_grids: np.ndarray = np.zeros((self._n_rows, self._n_cols, 2), dtype=int)
-    new_grids: np.ndarray = np.zeros((dim2, dim1, 2), dtype=int)
+    new_grids: np.ndarray = np.zeros((dim2, dim1, 2), dtype=np.int64)
     for i, (bbox, _) in enumerate(cells):
         x1, y1, x2, y2 = bbox
 
@@ -258,11 +259,12 @@ def _simple_grid_repack(
 
 
 @register_jit()
-def _shelf_grid_repack(
-    image: np.ndarray,
+def _shelf_grid_layout(
     cells: list[tuple[tuple[int, int, int, int], tuple[int, int]]],
+    image_shape: tuple[int, int],
     gridsize: int,
-) -> tuple[np.ndarray, np.ndarray]:
+    target_size: int,
+) -> list[tuple[tuple[int, int, int, int], tuple[int, int]]]:
     # two steps to the smart placement algorithm
     # STEP 1: identify dense groupings of cells
     # STEP 2: using shelf based 2d bin packing to repack
@@ -272,7 +274,10 @@ def _shelf_grid_repack(
     # ======================
     # for each cell, identify it it belongs to a 2x2 square
     # if 2x2 square all needs to be matched, keep it as a group
-    to_match: set[tuple[int, int]] = {loc for _, loc in cells}
+    # Numba cannot compile set comprehensions
+    to_match: set[tuple[int, int]] = set()
+    for _, loc in cells:  # noqa: FURB142
+        to_match.add(loc)
     matched: set[tuple[int, int]] = set()
     groups: list[list[tuple[int, int]]] = []
 
@@ -292,7 +297,7 @@ def _shelf_grid_repack(
     ]
 
     # construct lookup for bboxes from loc
-    height, width = image.shape[:2]
+    height, width = image_shape
     rows = math.ceil(height / gridsize)
     cols = math.ceil(width / gridsize)
     lookup: list[list[tuple[int, int, int, int]]] = [
@@ -328,7 +333,8 @@ def _shelf_grid_repack(
                 continue
 
             # make new group from 3 matches
-            new_group = [loc1, *new_locs]
+            new_group = [loc1]
+            new_group.extend(new_locs)
             groups.append(new_group)
             for new_loc in new_group:
                 matched.add(new_loc)
@@ -350,15 +356,13 @@ def _shelf_grid_repack(
     # sort each sub group to maintain right then down (in image coords)
     # ordering such that simple iteratation will place
     # cells in correct spots later
-    groups = [sorted(group, key=operator.itemgetter(0, 1)) for group in groups]
+    groups = [sorted(group) for group in groups]
 
     # post process the groups to sort by overall size
     # sort in descending order so we greedily allocate
-    # largest first
-    groups.sort(key=len, reverse=True)
-
-    # assign heuristic value to attempt to hold max dimensions to
-    target_size = math.ceil(math.sqrt(len(cells)))
+    # largest first, the index keeps groups of equal size in order
+    order = sorted([(-len(group), index) for index, group in enumerate(groups)])
+    groups = [groups[index] for _, index in order]
 
     # use shelf packing stragegies
     # should get fairly good fit
@@ -417,28 +421,13 @@ def _shelf_grid_repack(
             (group, g_height, g_width),
         )
 
-    # compute the overall dimensions of the new image and grid
-    new_height = 0  # maximum height of any shelf
-    new_width = 0  # sum of all shelf widths
-    for _, s_height, s_width in shelves:
-        new_height = max(new_height, s_height)
-        new_width += s_width
-
-    # create new image and new grid based on the new dimensions
-    dim1 = max(new_height, 1)
-    dim2 = max(new_width, 1)
-    new_image: np.ndarray = np.zeros(
-        (dim1 * gridsize, dim2 * gridsize, 3),
-        dtype=np.uint8,
-    )
-    new_grid: np.ndarray = np.zeros((dim1, dim2, 2), dtype=int)
-
-    # for each shelf, iterate over the cells and add them into grid and image
+    # for each shelf, iterate over the cells and assign them a packed location
     # need to keep a rolling start width, to denote the offset of each shelf
+    placements: list[tuple[tuple[int, int, int, int], tuple[int, int]]] = []
     frontier = 0
     for s_boxes, s_height, s_width in shelves:
         # iterate over each (height, width) block in
-        # the shelf. Place each cell in that spot and copy
+        # the shelf. Place each cell in that spot
         for i in range(s_height):
             for j in range(s_width):
                 # compute box id based on s_width
@@ -446,27 +435,83 @@ def _shelf_grid_repack(
 
                 # compute the original coords from loc
                 o_r, o_c = s_boxes[b_idx]
-                x1, y1, x2, y2 = lookup[o_r][o_c]
-
-                # based on the original image offset update new_Grid
-                n_c = j + frontier
-                new_grid[i][n_c] = (x1, y1)
-
-                # update the region of new_image with the region of the original image
-                n_y = i * gridsize
-                n_x = n_c * gridsize
-                new_image[n_y : n_y + gridsize, n_x : n_x + gridsize] = image[
-                    y1:y2,
-                    x1:x2,
-                ]
+                placements.append((lookup[o_r][o_c], (i, j + frontier)))
 
         # once shelf is added, update the frontier (x coord tracker)
         frontier += s_width
 
+    return placements
+
+
+@register_jit()
+def _shelf_grid_repack(
+    image: np.ndarray,
+    cells: list[tuple[tuple[int, int, int, int], tuple[int, int]]],
+    gridsize: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    # assign heuristic value to attempt to hold max dimensions to
+    target_size = math.ceil(math.sqrt(len(cells)))
+
+    placements = _shelf_grid_layout(
+        cells,
+        (int(image.shape[0]), int(image.shape[1])),
+        gridsize,
+        target_size,
+    )
+
+    # compute the overall dimensions of the new image and grid
+    new_height = 0  # maximum height of any shelf
+    new_width = 0  # sum of all shelf widths
+    for _, (n_r, n_c) in placements:
+        new_height = max(new_height, n_r + 1)
+        new_width = max(new_width, n_c + 1)
+
+    # create new image and new grid based on the new dimensions
+    dim1 = max(new_height, 1)
+    dim2 = max(new_width, 1)
+    new_image: np.ndarray = np.zeros(
+        (dim1 * gridsize, dim2 * gridsize, 3),
+        dtype=np.uint8,
+    )
+    new_grid: np.ndarray = np.zeros((dim1, dim2, 2), dtype=np.int64)
+
+    # place each cell in its spot and copy
+    for (x1, y1, x2, y2), (n_r, n_c) in placements:
+        # based on the original image offset update new_grid
+        new_grid[n_r][n_c] = (x1, y1)
+
+        # update the region of new_image with the region of the original image
+        n_y = n_r * gridsize
+        n_x = n_c * gridsize
+        new_image[n_y : n_y + gridsize, n_x : n_x + gridsize] = image[
+            y1:y2,
+            x1:x2,
+        ]
+
     # finally return the completed new_image and transform info
     return new_image, new_grid
 
 
+@register_jit()
+def _canvas_grid_repack(
+    image: np.ndarray,
+    placements: list[tuple[tuple[int, int, int, int], tuple[int, int, int]]],
+    gridsize: int,
+    canvas: np.ndarray,
+    canvas_grid: np.ndarray,
+) -> None:
+    # copy each cell into its (canvas, row, col) slot of the preallocated buffers
+    for (x1, y1, x2, y2), (n_i, n_r, n_c) in placements:
+        canvas_grid[n_i, n_r, n_c] = (x1, y1)
+
+        n_y = n_r * gridsize
+        n_x = n_c * gridsize
+        canvas[n_i, n_y : n_y + gridsize, n_x : n_x + gridsize] = image[
+            y1:y2,
+            x1:x2,
+        ]
+
+
 class AbstractGridFramePacker(AbstractFramePacker):
     """Pack regions of a frame together based on a grid."""
 
@@ -476,6 +521,8 @@ class AbstractGridFramePacker(AbstractFramePacker):
         gridsize: int = 128,
         detection_buffer: int = 30,
         method: str = "shelf",
+        canvas_size: tuple[int, int] | None = None,
+        overflow: str = "drop",
     ) -> None:
         """
         Create a new GridFramePacker.
@@ -498,6 +545,27 @@ class AbstractGridFramePacker(AbstractFramePacker):
             Options are: ['simple', 'shelf']
             Simple will place tiles of the grid FCFS basis in the new image,
             while shelf will attempt to place connected regions together.
+        canvas_size : tuple[int, int], optional
+            The size of a fixed output canvas in form (width, height).
+            When given, every call to pack writes into the same preallocated
+            canvas, so the packed image always has the same shape.
+            By default None, in which case the packed image is sized
+            to fit the selected cells.
+        overflow : str, optional
+            How to handle cells which do not fit into the fixed canvas.
+            Only used when canvas_size is given.
+            By default, 'drop'
+            Options are: ['drop', 'spill']
+            Drop will discard the cells with the least detection activity,
+            while spill will place the remaining cells on additional canvases
+            and return a batch of canvases with shape (n, height, width, 3).
+
+        Raises
+        ------
+        ValueError
+            If the canvas_size cannot fit a single grid cell.
+        ValueError
+            If the overflow option is not valid.
 
         """
         super().__init__()
@@ -505,6 +573,14 @@ class AbstractGridFramePacker(AbstractFramePacker):
         self._gridsize = gridsize
         self._detection_buffer = detection_buffer
         self._method = method
+        self._canvas_size = canvas_size
+        self._overflow = overflow
+
+        if overflow not in ("drop", "spill"):
+            err_msg = (
+                f"Invalid overflow option: {overflow}. Options are: ['drop', 'spill']"
+            )
+            raise ValueError(err_msg)
 
         # assign type hints to variables used in initialize_cells
         self._n_cols: int
@@ -514,7 +590,14 @@ class AbstractGridFramePacker(AbstractFramePacker):
         self._num_dets: np.ndarray
         self._cells: np.ndarray
 
+        # assign type hints to variables used in initialize_canvas
+        self._canvas_rows: int = 0
+        self._canvas_cols: int = 0
+        self._canvas: np.ndarray = np.zeros((0, 0, 0, 3), dtype=np.uint8)
+        self._canvas_grid: np.ndarray = np.zeros((0, 0, 0, 2), dtype=int)
+
         self._initialize_cells()
+        self._initialize_canvas()
 
         # tracking variables
         self._counter: int = 0
@@ -540,6 +623,7 @@ class AbstractGridFramePacker(AbstractFramePacker):
         if gridsize:
             self._gridsize = gridsize
         self._initialize_cells()
+        self._initialize_canvas()
         self._counter = 0
 
     def _initialize_cells(self: Self) -> None:
@@ -580,6 +664,170 @@ class AbstractGridFramePacker(AbstractFramePacker):
                 self._cells[index, 4:] = (i, j)
                 index += 1
 
+    def _initialize_canvas(self: Self) -> None:
+        """
+        Allocate the fixed canvas buffers if a canvas size is used.
+
+        Raises
+        ------
+        ValueError
+            If the canvas size cannot fit a single grid cell.
+
+        """
+        if self._canvas_size is None:
+            return
+
+        c_width, c_height = self._canvas_size
+        self._canvas_cols = c_width // self._gridsize
+        self._canvas_rows = c_height // self._gridsize
+        if self._canvas_cols < 1 or self._canvas_rows < 1:
+            err_msg = f"Canvas size {self._canvas_size} cannot fit a single grid cell of size {self._gridsize}."
+            raise ValueError(err_msg)
+
+        # when spilling, allocate enough canvases to hold every cell
+        num_canvases = 1
+        if self._overflow == "spill":
+            slots = self._canvas_rows * self._canvas_cols
+            num_canvases = math.ceil((self._n_rows * self._n_cols) / slots)
+
+        self._canvas = np.zeros(
+            (num_canvases, c_height, c_width, 3),
+            dtype=np.uint8,
+        )
+        self._canvas_grid = np.zeros(
+            (num_canvases, self._canvas_rows, self._canvas_cols, 2),
+            dtype=int,
+        )
+
+    def _canvas_placements(
+        self: Self,
+        image: np.ndarray,
+        cells: list[tuple[tuple[int, int, int, int], tuple[int, int]]],
+        method: str,
+    ) -> list[tuple[tuple[int, int, int, int], tuple[int, int, int]]]:
+        """
+        Assign each cell a (canvas, row, col) slot in the canvas buffers.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The image being packed.
+        cells : list[tuple[tuple[int, int, int, int], tuple[int, int]]]
+            The cells selected for packing.
+        method : str
+            The method to use for laying out the cells.
+
+        Returns
+        -------
+        list[tuple[tuple[int, int, int, int], tuple[int, int, int]]]
+            The bounding box of each placed cell and its (canvas, row, col) slot.
+
+        """
+        rows, cols = self._canvas_rows, self._canvas_cols
+        slots = rows * cols
+        num_canvases = self._canvas.shape[0]
+
+        # if there are more cells than slots, keep the most active cells
+        # while preserving their original ordering
+        capacity = slots * num_canvases
+        if len(cells) > capacity:
+            order = sorted(
+                range(len(cells)),
+                key=lambda k: self._num_dets[cells[k][1]],
+                reverse=True,
+            )
+            cells = [cells[k] for k in sorted(order[:capacity])]
+
+        # compute the initial positions for the cells
+        positions: list[tuple[tuple[int, int, int, int], tuple[int, int, int]]]
+        if method == "simple":
+            positions = [
+                (bbox, (k // slots, (k % slots) // cols, k % cols))
+                for k, (bbox, _) in enumerate(cells)
+            ]
+        else:
+            positions = [
+                (bbox, (n_c // cols, n_r, n_c % cols))
+                for bbox, (n_r, n_c) in _shelf_grid_layout(
+                    cells,
+                    (int(image.shape[0]), int(image.shape[1])),
+                    self._gridsize,
+                    rows,
+                )
+            ]
+
+        # any cell outside of the canvas buffers gets the next free slot
+        used = np.zeros((num_canvases, rows, cols), dtype=bool)
+        placements: list[tuple[tuple[int, int, int, int], tuple[int, int, int]]] = []
+        overflowed: list[tuple[int, int, int, int]] = []
+        for bbox, (n_i, n_r, n_c) in positions:
+            if n_i < num_canvases and n_r < rows and not used[n_i, n_r, n_c]:
+                used[n_i, n_r, n_c] = True
+                placements.append((bbox, (n_i, n_r, n_c)))
+            else:
+                overflowed.append(bbox)
+        for bbox, (n_i, n_r, n_c) in zip(overflowed, np.argwhere(~used)):
+            placements.append((bbox, (int(n_i), int(n_r), int(n_c))))
+
+        return placements
+
+    def _canvas_repack(
+        self: Self,
+        image: np.ndarray,
+        cells: list[tuple[tuple[int, int, int, int], tuple[int, int]]],
+        method: str,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Pack the cells into the preallocated canvas buffers.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The image being packed.
+        cells : list[tuple[tuple[int, int, int, int], tuple[int, int]]]
+            The cells selected for packing.
+        method : str
+            The method to use for laying out the cells.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The packed canvas and the transform information.
+
+        """
+        placements = self._canvas_placements(image, cells, method)
+        num_used = 1 + max((n_i for _, (n_i, _, _) in placements), default=0)
+
+        # clear any data left over from the previous frame
+        self._canvas[:num_used].fill(0)
+        self._canvas_grid[:num_used].fill(0)
+
+        _canvas_grid_repack(
+            image,
+            placements,
+            self._gridsize,
+            self._canvas,
+            self._canvas_grid,
+        )
+
+        if self._overflow == "spill":
+            return self._canvas[:num_used], self._canvas_grid[:num_used]
+        return self._canvas[0], self._canvas_grid[0]
+
+    def _prepare(self: Self, image: np.ndarray) -> None:
+        """
+        Compute per-frame information before cells are explored.
+
+        Called once per call to pack, before _should_explore is
+        evaluated for each cell. By default, does nothing.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The image to be packed.
+
+        """
+
     @abstractmethod
     def _should_explore(
         self: Self,
@@ -612,6 +860,7 @@ class AbstractGridFramePacker(AbstractFramePacker):
 
         """
 
+    @profiled()
     def pack(
         self,
         image: np.ndarray,
@@ -639,6 +888,10 @@ class AbstractGridFramePacker(AbstractFramePacker):
         -------
         tuple[np.ndarray, np.ndarray]
             The packed image and the transform information.
+            When a canvas_size is used, the packed image is a view into
+            a buffer which is reused by the next call to pack.
+            When overflow is 'spill', the packed image and transform
+            have a leading batch dimension, one entry per canvas.
 
         Raises
         ------
@@ -680,6 +933,9 @@ class AbstractGridFramePacker(AbstractFramePacker):
             if (r, c) not in excluded_cells
         ]
 
+        # compute any per-frame information used to decide exploration
+        self._prepare(image)
+
         # need to assess if the cells should be included based on detections and NCC
         filtered_cells: list[tuple[tuple[int, int, int, int], tuple[int, int]]] = []
         for x1, y1, x2, y2, row, col in included_cells:
@@ -695,7 +951,13 @@ class AbstractGridFramePacker(AbstractFramePacker):
 
         # use the simple grid repacking
         method = method or self._method
-        if method == "simple":
+        if self._canvas_size is not None:
+            new_image, new_grids = self._canvas_repack(
+                image,
+                filtered_cells,
+                method,
+            )
+        elif method == "simple":
             new_image, new_grids = _simple_grid_repack(
                 image,
                 filtered_cells,
@@ -714,6 +976,7 @@ class AbstractGridFramePacker(AbstractFramePacker):
 
         return new_image, new_grids
 
+    @profiled()
     def unpack(
         self: Self,
         detections: list[tuple[int, int, int, int]]
@@ -737,7 +1000,16 @@ class AbstractGridFramePacker(AbstractFramePacker):
         -------
         list[tuple[int, int, int, int]] | list[tuple[tuple[int, int, int, int], float, int]]
 
+        Raises
+        ------
+        ValueError
+            If the transform contains multiple canvases.
+
         """
+        if transform.ndim == 4:
+            err_msg = "Transform contains multiple canvases, use unpack_batch instead."
+            raise ValueError(err_msg)
+
         if len(detections) == 0:
             return []
 
@@ -751,6 +1023,48 @@ class AbstractGridFramePacker(AbstractFramePacker):
 
         return _unpack_grid_bboxes(detections, transform, self._gridsize)  # type: ignore[arg-type]
 
+    @profiled()
+    def unpack_batch(
+        self: Self,
+        detections: list[list[tuple[int, int, int, int]]]
+        | list[list[tuple[tuple[int, int, int, int], float, int]]],
+        transform: np.ndarray,
+    ) -> (
+        list[tuple[int, int, int, int]]
+        | list[tuple[tuple[int, int, int, int], float, int]]
+    ):
+        """
+        Unpack regions of a batch of canvases.
+
+        Used when the packer spills cells over multiple canvases.
+
+        Parameters
+        ----------
+        detections : list[list[tuple[int, int, int, int]]] | list[list[tuple[tuple[int, int, int, int], float, int]]]
+            The regions to unpack, one list of detections per canvas.
+        transform : np.ndarray
+            The batched transform information generated by the pack method.
+
+        Returns
+        -------
+        list[tuple[int, int, int, int]] | list[tuple[tuple[int, int, int, int], float, int]]
+
+        Raises
+        ------
+        ValueError
+            If the number of detection lists does not match the number of canvases.
+
+        """
+        if len(detections) != transform.shape[0]:
+            err_msg = f"Got {len(detections)} detection lists for {transform.shape[0]} canvases."
+            raise ValueError(err_msg)
+
+        unpacked: list = []
+        # indexed, so each canvas keeps the type of the detections
+        for index, canvas_transform in enumerate(transform):
+            unpacked.extend(self.unpack(detections[index], canvas_transform))
+        return unpacked
+
     def update(
         self: Self,
         detections: list[tuple[int, int, int, int]]
@@ -806,6 +1120,8 @@ class AnnealingFramePacker(AbstractGridFramePacker):
         min_prob: float = 0.1,
         detection_buffer: int = 30,
         method: str = "shelf",
+        canvas_size: tuple[int, int] | None = None,
+        overflow: str = "drop",
     ) -> None:
         """
         Create a new AnnealingFramePacker.
@@ -834,9 +1150,24 @@ class AnnealingFramePacker(AbstractGridFramePacker):
             Options are: ['simple', 'shelf']
             Simple will place tiles of the grid FCFS basis in the new image,
             while shelf will attempt to place connected regions together.
+        canvas_size : tuple[int, int], optional
+            The size of a fixed output canvas in form (width, height).
+            By default None, in which case the packed image is sized
+            to fit the selected cells.
+        overflow : str, optional
+            How to handle cells which do not fit into the fixed canvas.
+            By default, 'drop'
+            Options are: ['drop', 'spill']
 
         """
-        super().__init__(image_shape, gridsize, detection_buffer, method)
+        super().__init__(
+            image_shape,
+            gridsize,
+            detection_buffer,
+            method,
+            canvas_size,
+            overflow,
+        )
 
         # specific annealing parameters
         self._alpha = alpha
@@ -869,6 +1200,8 @@ class RandomFramePacker(AbstractGridFramePacker):
         threshold: float = 0.1,
         detection_buffer: int = 30,
         method: str = "shelf",
+        canvas_size: tuple[int, int] | None = None,
+        overflow: str = "drop",
     ) -> None:
         """
         Create a new RandomFramePacker.
@@ -896,9 +1229,24 @@ class RandomFramePacker(AbstractGridFramePacker):
             Options are: ['simple', 'shelf']
             Simple will place tiles of the grid FCFS basis in the new image,
             while shelf will attempt to place connected regions together.
+        canvas_size : tuple[int, int], optional
+            The size of a fixed output canvas in form (width, height).
+            By default None, in which case the packed image is sized
+            to fit the selected cells.
+        overflow : str, optional
+            How to handle cells which do not fit into the fixed canvas.
+            By default, 'drop'
+            Options are: ['drop', 'spill']
 
         """
-        super().__init__(image_shape, gridsize, detection_buffer, method)
+        super().__init__(
+            image_shape,
+            gridsize,
+            detection_buffer,
+            method,
+            canvas_size,
+            overflow,
+        )
 
         # specific parameters
         self._threshold = threshold
@@ -912,3 +1260,144 @@ class RandomFramePacker(AbstractGridFramePacker):
         detections: int,  # noqa: ARG002
     ) -> bool:
         return random.random() < self._threshold
+
+
+class MotionFramePacker(AbstractGridFramePacker):
+    """
+    Pack regions of a frame together based on motion and detection activity.
+
+    Motion is measured once per frame as the mean absolute difference
+    between downscaled grayscale copies of the current and previous frame
+    inside each grid cell. Cells without motion or recent detections
+    are skipped, which works well for fixed cameras.
+    """
+
+    def __init__(
+        self: Self,
+        image_shape: tuple[int, int],
+        gridsize: int = 128,
+        motion_threshold: float = 4.0,
+        downscale: int = 4,
+        min_prob: float = 0.05,
+        detection_buffer: int = 30,
+        method: str = "shelf",
+        canvas_size: tuple[int, int] | None = None,
+        overflow: str = "drop",
+    ) -> None:
+        """
+        Create a new MotionFramePacker.
+
+        Parameters
+        ----------
+        image_shape : tuple[int, int]
+            The shape of the image in form (width, height).
+        gridsize : int, optional
+            The size of each cell in the overlaid grid.
+            Default is 128.
+        motion_threshold : float, optional
+            The mean absolute pixel difference inside a cell, in the range [0, 255],
+            above which the cell is considered active.
+            Default is 4.0.
+        downscale : int, optional
+            The factor to downscale frames by before differencing.
+            Default is 4.
+        min_prob : float, optional
+            The probability to explore a cell with no motion or detections.
+            Allows static objects to still be discovered.
+            Default is 0.05.
+        detection_buffer : int, optional
+            The number of frames to consider for detection activity.
+            Used instead of current frame count once frame count exceeds buffer size.
+            Allows more recent detections to have more influence.
+            Default is 30.
+        method : str, optional
+            The method to use for repacking grid cells into new images.
+            By default, 'shelf'
+            Options are: ['simple', 'shelf']
+            Simple will place tiles of the grid FCFS basis in the new image,
+            while shelf will attempt to place connected regions together.
+        canvas_size : tuple[int, int], optional
+            The size of a fixed output canvas in form (width, height).
+            By default None, in which case the packed image is sized
+            to fit the selected cells.
+        overflow : str, optional
+            How to handle cells which do not fit into the fixed canvas.
+            By default, 'drop'
+            Options are: ['drop', 'spill']
+
+        Raises
+        ------
+        ValueError
+            If downscale is less than 1.
+
+        """
+        if downscale < 1:
+            err_msg = f"Downscale must be at least 1, got {downscale}."
+            raise ValueError(err_msg)
+
+        # specific parameters
+        self._motion_threshold = motion_threshold
+        self._downscale = downscale
+        self._min_prob = min_prob
+
+        # per-frame motion state
+        self._prev_small: np.ndarray | None = None
+        self._motion: np.ndarray = np.zeros((0, 0), dtype=np.float64)
+
+        super().__init__(
+            image_shape,
+            gridsize,
+            detection_buffer,
+            method,
+            canvas_size,
+            overflow,
+        )
+
+    def _initialize_cells(self: Self) -> None:
+        """Initialize the grid cells and the motion state."""
+        super()._initialize_cells()
+        self._prev_small = None
+        self._motion = np.zeros((self._n_rows, self._n_cols), dtype=np.float64)
+
+    def _prepare(self: Self, image: np.ndarray) -> None:
+        if image.ndim == 3 and image.shape[2] == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        small_width = max(1, self._width // self._downscale)
+        small_height = max(1, self._height // self._downscale)
+        small = cv2.resize(
+            image,
+            (small_width, small_height),
+            interpolation=cv2.INTER_AREA,
+        )
+        prev_small = self._prev_small
+        self._prev_small = small
+
+        # without a previous frame, every cell is treated as active
+        if prev_small is None:
+            self._motion.fill(np.inf)
+            return
+
+        # block-mean of the difference for every cell using an integral image
+        integral = cv2.integral(cv2.absdiff(small, prev_small))
+        x1 = np.minimum(self._cells[:, 0] // self._downscale, small_width - 1)
+        y1 = np.minimum(self._cells[:, 1] // self._downscale, small_height - 1)
+        x2 = np.clip(-(-self._cells[:, 2] // self._downscale), x1 + 1, small_width)
+        y2 = np.clip(-(-self._cells[:, 3] // self._downscale), y1 + 1, small_height)
+        sums = integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+        self._motion[self._cells[:, 4], self._cells[:, 5]] = sums / (
+            (x2 - x1) * (y2 - y1)
+        )
+
+    def _should_explore(
+        self: Self,
+        image: np.ndarray,  # noqa: ARG002
+        bbox: tuple[int, int, int, int],  # noqa: ARG002
+        row: int,
+        col: int,
+        detections: int,
+    ) -> bool:
+        if self._motion[row, col] >= self._motion_threshold:
+            return True
+        if detections > 0:
+            return True
+        return random.random() < self._min_prob
@@ -11,6 +11,11 @@ Submodules
 :mod:`draw`
     Drawing utilities for images.
 
+Classes
+-------
+:class:`FrameContext`
+    A frame along with lazily computed, memoized views of it.
+
 Functions
 ---------
 :func:`color_euclidean_dist`
@@ -41,11 +46,13 @@ from __future__ import annotations
 from . import color, draw
 from ._augment import letterbox, resize_linear
 from ._color import color_euclidean_dist, dominant_color, mean_color
+from ._context import FrameContext
 from ._divide import divide, patch
 from ._scale import rescale
 from ._tiling import create_tiled_image, image_tiler
 
 __all__ = [
+    "FrameContext",
     "color",
     "color_euclidean_dist",
     "create_tiled_image",
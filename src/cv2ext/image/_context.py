@@ -0,0 +1,262 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import cv2
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    import numpy as np
+    from typing_extensions import Self
+
+_T = TypeVar("_T")
+
+
+def _joint_histogram(image: np.ndarray, bins: int) -> np.ndarray:
+    # normalized joint histogram over all channels of the image
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    hist = cv2.calcHist(
+        [image],  # type: ignore[list-item]
+        list(range(channels)),
+        None,
+        [bins] * channels,
+        [0, 256] * channels,
+    )
+    cv2.normalize(hist, hist, alpha=1.0, norm_type=cv2.NORM_L1)
+    return hist
+
+
+class FrameContext:
+    """
+    A frame along with lazily computed, memoized views of it.
+
+    Each view (grayscale, resized, pyramid, HSV, histogram) is computed
+    the first time it is requested and reused afterwards, so trackers,
+    metrics, and schedulers sharing a FrameContext convert a frame at
+    most once. A FrameContext can be shared between threads, a thread
+    requesting a view being computed by another waits for it.
+    Views are shared, they should not be modified in place.
+    """
+
+    def __init__(self: Self, image: np.ndarray, frame_id: int | None = None) -> None:
+        """
+        Create a new FrameContext.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The frame, in BGR or grayscale.
+        frame_id : int, optional
+            The number of the frame, such as from an IterableVideo.
+            By default None.
+
+        """
+        self._image = image
+        self._frame_id = frame_id
+        self._cache: dict[Hashable, Any] = {}
+        # one lock per key, so different views are computed concurrently
+        self._locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self: Self) -> str:
+        return f"FrameContext(frame_id={self._frame_id}, shape={self._image.shape})"
+
+    @property
+    def image(self: Self) -> np.ndarray:
+        """
+        The original frame.
+
+        Returns
+        -------
+        np.ndarray
+            The frame as given.
+
+        """
+        return self._image
+
+    @property
+    def frame_id(self: Self) -> int | None:
+        """
+        The number of the frame.
+
+        Returns
+        -------
+        int | None
+            The frame number, or None if not given.
+
+        """
+        return self._frame_id
+
+    @property
+    def shape(self: Self) -> tuple[int, ...]:
+        """
+        The shape of the original frame.
+
+        Returns
+        -------
+        tuple[int, ...]
+            The shape of the frame.
+
+        """
+        return self._image.shape
+
+    def cached(self: Self, key: Hashable, func: Callable[[np.ndarray], _T]) -> _T:
+        """
+        Compute a derived value of the frame once.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying the value, including any parameters.
+        func : Callable[[np.ndarray], _T]
+            Computes the value from the original frame.
+            Only called if no value is stored under key, by one
+            thread at a time for each key.
+
+        Returns
+        -------
+        _T
+            The memoized value.
+
+        """
+        try:
+            value: _T = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            return value
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            # another thread may have computed it while waiting
+            try:
+                value = self._cache[key]
+            except KeyError:
+                value = func(self._image)
+                self._cache[key] = value
+        return value
+
+    @property
+    def gray(self: Self) -> np.ndarray:
+        """
+        The frame in grayscale.
+
+        Returns
+        -------
+        np.ndarray
+            The grayscale frame. The original frame if already grayscale.
+
+        """
+        return self.cached("gray", _gray)
+
+    @property
+    def hsv(self: Self) -> np.ndarray:
+        """
+        The frame in the HSV color space.
+
+        Returns
+        -------
+        np.ndarray
+            The HSV frame.
+
+        Raises
+        ------
+        ValueError
+            If the frame is not a 3-channel BGR image.
+
+        """
+        if self._image.ndim != 3 or self._image.shape[2] != 3:
+            err_msg = f"HSV requires a 3-channel BGR frame, got shape {self.shape}."
+            raise ValueError(err_msg)
+        return self.cached("hsv", lambda image: cv2.cvtColor(image, cv2.COLOR_BGR2HSV))
+
+    def resized(
+        self: Self,
+        size: tuple[int, int],
+        interpolation: int = cv2.INTER_LINEAR,
+        *,
+        gray: bool | None = None,
+    ) -> np.ndarray:
+        """
+        Get the frame resized to a given size.
+
+        Parameters
+        ----------
+        size : tuple[int, int]
+            The size (width, height) to resize to.
+        interpolation : int, optional
+            The interpolation method, one of cv2.INTER_*.
+            By default cv2.INTER_LINEAR.
+        gray : bool, optional
+            Whether to resize the grayscale view instead of the frame.
+            By default None, which resizes the original frame.
+
+        Returns
+        -------
+        np.ndarray
+            The resized frame.
+
+        """
+        if gray:
+            return self.cached(
+                ("resized", size, interpolation, True),
+                lambda _: cv2.resize(self.gray, size, interpolation=interpolation),
+            )
+        return self.cached(
+            ("resized", size, interpolation, False),
+            lambda image: cv2.resize(image, size, interpolation=interpolation),
+        )
+
+    def pyramid(self: Self, levels: int = 3) -> list[np.ndarray]:
+        """
+        Get the Gaussian pyramid of the grayscale frame.
+
+        Parameters
+        ----------
+        levels : int, optional
+            The number of levels, including the full resolution frame.
+            By default 3.
+
+        Returns
+        -------
+        list[np.ndarray]
+            The levels from full resolution down, each half the size
+            of the previous. Stops early if the frame becomes too small.
+
+        """
+
+        def _build(_: np.ndarray) -> list[np.ndarray]:
+            pyramid = [self.gray]
+            while len(pyramid) < levels and min(pyramid[-1].shape[:2]) >= 2:
+                pyramid.append(cv2.pyrDown(pyramid[-1]))
+            return pyramid
+
+        return self.cached(("pyramid", levels), _build)
+
+    def hist(self: Self, bins: int = 8) -> np.ndarray:
+        """
+        Get the normalized joint histogram over all channels of the frame.
+
+        Parameters
+        ----------
+        bins : int, optional
+            The number of bins per channel, by default 8.
+
+        Returns
+        -------
+        np.ndarray
+            The histogram, summing to one.
+
+        """
+        return self.cached(("hist", bins), lambda image: _joint_histogram(image, bins))
+
+
+def _gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 3 and image.shape[2] == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
@@ -6,6 +6,10 @@ Subpackage containing abstractions for making IO easier through cv2.
 
 Classes
 -------
+:class:`AsyncIterableVideo`
+    An iterable video object for asyncio, supporting async for.
+:class:`AsyncVideoWriter`
+    A video writer object for asyncio.
 :class:`Display`
     A display object for showing images.
 :class:`Fourcc`
@@ -24,10 +28,20 @@ Functions
 
 from __future__ import annotations
 
+from ._asynciterablevideo import AsyncIterableVideo
+from ._asyncwriter import AsyncVideoWriter
 from ._display import Display
 from ._fourcc import Fourcc
 from ._iterablevideo import IterableVideo
 from ._webcam import find_all_cameras
 from ._writer import VideoWriter
 
-__all__ = ["Display", "Fourcc", "IterableVideo", "VideoWriter", "find_all_cameras"]
+__all__ = [
+    "AsyncIterableVideo",
+    "AsyncVideoWriter",
+    "Display",
+    "Fourcc",
+    "IterableVideo",
+    "VideoWriter",
+    "find_all_cameras",
+]
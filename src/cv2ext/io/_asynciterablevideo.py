@@ -0,0 +1,265 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from cv2ext.profiling._queue import QueueStats, _QueueMonitor
+
+from ._iterablevideo import IterableVideo
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    import numpy as np
+    from typing_extensions import Self, TypeAlias
+
+    # the items of the buffer, a frame, an error from reading, or None at the end
+    _Item: TypeAlias = "tuple[int, np.ndarray] | BaseException | None"
+
+_log = logging.getLogger(__name__)
+
+
+class AsyncIterableVideo:
+    """Video whose frames are read without blocking the event loop."""
+
+    def __init__(
+        self: Self,
+        filename: Path | str | int,
+        channels: int = 3,
+        buffersize: int = 8,
+    ) -> None:
+        """
+        Create a new instance of the video.
+
+        The video is opened by start, or by the first iteration,
+        using a dedicated thread for every blocking cv2 call.
+
+        Parameters
+        ----------
+        filename : Path | str | int
+            Path to the video file or device number.
+        channels : int
+            The number of channels in the video.
+            Defaults to 3.
+        buffersize : int
+            The number of frames read ahead of the iterator.
+            Defaults to 8.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file does not exist.
+        ValueError
+            If buffersize is less than 1.
+
+        Examples
+        --------
+        >>> async with AsyncIterableVideo("video.mp4") as video:
+        ...     async for i, frame in video:
+        ...         print(f"Frame {i} has {frame.shape} shape")
+
+        """
+        if isinstance(filename, (Path, str)) and not Path(filename).exists():
+            err_msg = f"File {filename} does not exist."
+            raise FileNotFoundError(err_msg)
+        if buffersize < 1:
+            err_msg = f"buffersize must be at least 1, got {buffersize}."
+            raise ValueError(err_msg)
+        self._filename = filename
+        self._channels = channels
+        self._buffersize = buffersize
+
+        # cv2 captures are not thread-safe, so one thread makes every call
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="AsyncIterableVideo",
+        )
+        self._video: IterableVideo | None = None
+        self._queue: asyncio.Queue[_Item] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._monitor = _QueueMonitor(buffersize)
+        self._closed = False
+
+    @property
+    def video(self: Self) -> IterableVideo:
+        """
+        The underlying video, once started.
+
+        Its properties, such as length, fps, and size, do not block.
+
+        Returns
+        -------
+        IterableVideo
+            The video, read without a thread of its own.
+
+        Raises
+        ------
+        RuntimeError
+            If the video has not been started.
+
+        """
+        if self._video is None:
+            err_msg = "The video has not been started."
+            raise RuntimeError(err_msg)
+        return self._video
+
+    async def __aenter__(self: Self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.stop()
+
+    def __aiter__(self: Self) -> Self:
+        """
+        Get the asynchronous iterator.
+
+        Returns
+        -------
+        AsyncIterableVideo
+            The current instance.
+
+        """
+        return self
+
+    async def __anext__(self: Self) -> tuple[int, np.ndarray]:
+        """
+        Get the next frame from the video.
+
+        Returns
+        -------
+        int
+            The frame number.
+        numpy.ndarray
+            The frame.
+
+        Raises
+        ------
+        StopAsyncIteration
+            If the video has ended or has been stopped.
+
+        """
+        if self._queue is None and not self._closed:
+            await self.start()
+        if self._closed or self._queue is None:
+            raise StopAsyncIteration
+        depth = self._queue.qsize()
+        t0 = time.perf_counter_ns()
+        item = await self._queue.get()
+        if item is None:
+            await self.stop()
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            await self.stop()
+            raise item
+        self._monitor.consume(time.perf_counter_ns() - t0, depth)
+        return item
+
+    async def start(self: Self) -> None:
+        """
+        Open the video and start reading frames into the buffer.
+
+        If the video cannot be opened, it is stopped.
+
+        Raises
+        ------
+        RuntimeError
+            If the video has been stopped.
+        Exception
+            Any error from opening the video.
+
+        """
+        if self._closed:
+            err_msg = "Cannot start a video which has been stopped."
+            raise RuntimeError(err_msg)
+        if self._queue is not None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            self._video = await loop.run_in_executor(
+                self._executor,
+                lambda: IterableVideo(
+                    self._filename,
+                    channels=self._channels,
+                    use_thread=False,
+                ),
+            )
+        except BaseException:
+            # a video which could not be opened cannot be started again
+            self._closed = True
+            self._executor.shutdown(wait=False)
+            raise
+        self._queue = asyncio.Queue(maxsize=self._buffersize)
+        self._task = asyncio.create_task(self._read())
+
+    async def _read(self: Self) -> None:
+        queue, video = self._queue, self._video
+        if queue is None or video is None:
+            return
+        loop = asyncio.get_running_loop()
+        item: _Item = None
+        try:
+            while True:
+                num = video.frame_num
+                got, frame = await loop.run_in_executor(self._executor, video.read)
+                if not got:
+                    item = None
+                    break
+                t0 = time.perf_counter_ns()
+                await queue.put((num, frame))
+                self._monitor.producer_wait_ns += time.perf_counter_ns() - t0
+                self._monitor.produced += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # noqa: BLE001
+            # raised by the iterator, in place of the next frame
+            item = err
+        await queue.put(item)
+
+    async def stop(self: Self) -> None:
+        """
+        Stop reading and release the video.
+
+        Safe to call from a task being cancelled, and more than once.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self._video is not None:
+            # queued behind any read still running in the executor
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self._video.stop)
+        self._executor.shutdown(wait=False)
+        _log.debug(f"AsyncIterableVideo {self._filename} stopped")
+
+    def stats(self: Self) -> QueueStats:
+        """
+        Get the statistics of the frame buffer.
+
+        The reading task is the producer and the iterator is the consumer.
+
+        Returns
+        -------
+        QueueStats
+            The statistics of the frame buffer.
+
+        """
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return self._monitor.stats(depth)
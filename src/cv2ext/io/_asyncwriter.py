@@ -0,0 +1,198 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from cv2ext.profiling._queue import QueueStats, _QueueMonitor
+
+from ._fourcc import Fourcc
+from ._writer import VideoWriter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+    import numpy as np
+    from typing_extensions import Self
+
+_log = logging.getLogger(__name__)
+
+
+class AsyncVideoWriter:
+    """Video writer whose frames are written without blocking the event loop."""
+
+    def __init__(
+        self: Self,
+        filename: Path | str,
+        fourcc: Fourcc = Fourcc.mp4v,
+        fps: float = 30.0,
+        frame_size: tuple[int, int] | None = None,
+        buffersize: int = 8,
+    ) -> None:
+        """
+        Create a new video writer.
+
+        Frames are written in order by a dedicated thread, and write only
+        waits while buffersize frames are already waiting to be written.
+
+        Parameters
+        ----------
+        filename : Path | str
+            The name of the file to write to.
+        fourcc : Fourcc
+            The fourcc codec to use.
+            Defaults to MP4V.
+        fps : float
+            The frames per second of the video.
+            Defaults to 30.0.
+        frame_size : tuple[int, int] | None
+            The size of the frames.
+            If None, the first frame written will determine the size.
+            Defaults to None.
+        buffersize : int
+            The number of frames which can wait to be written.
+            Defaults to 8.
+
+        Raises
+        ------
+        ValueError
+            If buffersize is less than 1.
+
+        Examples
+        --------
+        >>> async with AsyncVideoWriter("output.mp4") as writer:
+        ...     async for _, frame in video:
+        ...         await writer.write(frame)
+
+        """
+        if buffersize < 1:
+            err_msg = f"buffersize must be at least 1, got {buffersize}."
+            raise ValueError(err_msg)
+        self._writer = VideoWriter(filename, fourcc, fps, frame_size)
+        self._buffersize = buffersize
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="AsyncVideoWriter",
+        )
+        self._queue: asyncio.Queue[np.ndarray | None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._error: Exception | None = None
+        self._monitor = _QueueMonitor(buffersize)
+        self._closed = False
+
+    async def __aenter__(self: Self) -> Self:
+        return self
+
+    async def __aexit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.release()
+
+    async def write(self: Self, frame: np.ndarray) -> None:
+        """
+        Queue a new frame to be written.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            The frame to write. It must not be modified until written.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer has been released.
+        Exception
+            Any error from writing an earlier frame.
+
+        """
+        if self._closed:
+            err_msg = "Cannot write to a writer which has been released."
+            raise RuntimeError(err_msg)
+        if self._error is not None:
+            raise self._error
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._buffersize)
+            self._task = asyncio.create_task(self._write())
+        t0 = time.perf_counter_ns()
+        await self._queue.put(frame)
+        self._monitor.producer_wait_ns += time.perf_counter_ns() - t0
+        self._monitor.produced += 1
+
+    async def _write(self: Self) -> None:
+        queue = self._queue
+        if queue is None:
+            return
+        loop = asyncio.get_running_loop()
+        while True:
+            depth = queue.qsize()
+            t0 = time.perf_counter_ns()
+            frame = await queue.get()
+            if frame is None:
+                return
+            self._monitor.consume(time.perf_counter_ns() - t0, depth)
+            if self._error is not None:
+                # keep taking frames, so write does not wait forever
+                continue
+            try:
+                await loop.run_in_executor(self._executor, self._writer.write, frame)
+            except Exception as err:  # noqa: BLE001
+                self._error = err
+
+    async def release(self: Self) -> None:
+        """
+        Write the remaining frames and release the video writer.
+
+        If cancelled while writing the remaining frames, they are
+        discarded and the video writer is still released.
+
+        Raises
+        ------
+        Exception
+            Any error from writing a frame.
+
+        """
+        if self._closed:
+            return
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        try:
+            if self._queue is not None and self._task is not None:
+                await self._queue.put(None)
+                await self._task
+        finally:
+            if self._task is not None and not self._task.done():
+                self._task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await self._task
+            # queued behind any write still running in the executor
+            await loop.run_in_executor(self._executor, self._writer.release)
+            self._executor.shutdown(wait=False)
+            _log.debug("AsyncVideoWriter released")
+        if self._error is not None:
+            raise self._error
+
+    def stats(self: Self) -> QueueStats:
+        """
+        Get the statistics of the frames waiting to be written.
+
+        write is the producer and the writing task is the consumer,
+        so a producer bound writer is waiting on its frames.
+
+        Returns
+        -------
+        QueueStats
+            The statistics of the frames waiting to be written.
+
+        """
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return self._monitor.stats(depth)
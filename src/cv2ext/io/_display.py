@@ -14,6 +14,7 @@ import cv2
 import numpy as np
 
 from cv2ext import _WINDOW_MANAGER
+from cv2ext.profiling._queue import QueueStats, _QueueMonitor
 
 if TYPE_CHECKING:
     from types import TracebackType
@@ -83,6 +84,7 @@ class Display:
         self._stopped = False
         self._running = True
         self._queue: Queue[np.ndarray] = Queue(maxsize=self._buffersize)
+        self._monitor = _QueueMonitor(self._buffersize)
 
         # thread allocation
         _WINDOW_MANAGER.logwindow(self._windowname)
@@ -184,12 +186,23 @@ class Display:
             # cv2.startWindowThread()
         while self._running:
             t0 = time.perf_counter()
-            _log.debug(f"Display {self._windowname} thread starting new loop @ {t0}")
+            # checked first, so the messages are not formatted on every frame
+            debug = _log.isEnabledFor(logging.DEBUG)
+            if debug:
+                _log.debug(
+                    f"Display {self._windowname} thread starting new loop @ {t0}",
+                )
 
             # get frame
             image: np.ndarray | None = None
-            with contextlib.suppress(Empty):
+            depth = self._queue.qsize()
+            t_get = time.perf_counter_ns()
+            try:
                 image = self._queue.get(timeout=0.1)
+            except Empty:
+                self._monitor.consumer_wait_ns += time.perf_counter_ns() - t_get
+            else:
+                self._monitor.consume(time.perf_counter_ns() - t_get, depth)
                 self._last_image = image.copy()
 
             # display image if show
@@ -197,7 +210,10 @@ class Display:
                 image = image if image is not None else self._last_image
                 cv2.imshow(self._windowname, image)
                 keypress = cv2.waitKey(1) & 0xFF
-                _log.debug(f"Display {self._windowname} received keypress: {keypress}")
+                if debug:
+                    _log.debug(
+                        f"Display {self._windowname} received keypress: {keypress}",
+                    )
                 if keypress == ord(self._stopkey):
                     self._stopped = True
                     continue
@@ -244,9 +260,30 @@ class Display:
         """
         self._image = frame
         self._frameid += 1
-        with contextlib.suppress(Full):
+        try:
             self._queue.put_nowait(frame)
-            _log.debug(f"Sent frame to dispaly: {self._windowname}")
+        except Full:
+            self._monitor.dropped += 1
+        else:
+            self._monitor.produced += 1
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug(f"Sent frame to dispaly: {self._windowname}")
+
+    def stats(self: Self) -> QueueStats:
+        """
+        Get the statistics of the display buffer.
+
+        Frames given to update while the buffer is full are not shown,
+        and are counted as dropped. update never blocks, so the
+        producer wait time is always 0.
+
+        Returns
+        -------
+        QueueStats
+            The statistics of the display buffer.
+
+        """
+        return self._monitor.stats(self._queue.qsize())
 
     def wait(self: Self, timeout: float | None = None) -> None:
         """
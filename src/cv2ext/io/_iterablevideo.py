@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import contextlib
 import logging
+import time
 from pathlib import Path
 from queue import Empty, Full, Queue
 from threading import Thread
@@ -13,6 +14,9 @@ import cv2
 import numpy as np
 from typing_extensions import Self
 
+from cv2ext.profiling._profiler import profiled
+from cv2ext.profiling._queue import QueueStats, _QueueMonitor
+
 _log = logging.getLogger(__name__)
 
 
@@ -91,6 +95,7 @@ class IterableVideo:
         if use_thread is None:
             use_thread = True
         self._thread_loads = use_thread
+        self._monitor = _QueueMonitor(self._buffersize if use_thread else 0)
         if self._thread_loads:
             self._thread = Thread(target=self._run, daemon=True)
             self._queue: Queue[tuple[int, bool, np.ndarray]] = Queue(
@@ -117,11 +122,14 @@ class IterableVideo:
                     ),
                 )
                 break
+            t0 = time.perf_counter_ns()
             while not self._closed:
                 with contextlib.suppress(Full):
                     self._queue.put((self._frame_num, got, frame), timeout=0.1)
                     self._frame_num += 1
+                    self._monitor.produced += 1
                     break
+            self._monitor.producer_wait_ns += time.perf_counter_ns() - t0
             if self._closed:
                 return
         self._closed = True
@@ -274,6 +282,7 @@ class IterableVideo:
         """
         return self
 
+    @profiled()
     def __next__(self: Self) -> tuple[int, np.ndarray]:
         """
         Read the next frame from the video.
@@ -298,16 +307,21 @@ class IterableVideo:
             if not self._got:
                 self._stop()
                 raise StopIteration
+            self._monitor.produced += 1
+            self._monitor.consume(0, 0)
             return num, self._frame
         # otherwise use threading
         if self._consumed == self._length:
             self._stop()
             raise StopIteration
+        depth = self._queue.qsize()
+        t0 = time.perf_counter_ns()
         num, got, frame = self._queue.get()
         self._consumed += 1
         if not got:
             self._stop()
             raise StopIteration
+        self._monitor.consume(time.perf_counter_ns() - t0, depth)
         return num, frame
 
     def _stop(self: Self) -> None:
@@ -326,6 +340,24 @@ class IterableVideo:
         """Stop the video."""
         self._stop()
 
+    def stats(self: Self) -> QueueStats:
+        """
+        Get the statistics of the frame buffer.
+
+        The reading thread is the producer and the iterator is the consumer,
+        so a consumer bound video can use a larger buffersize, while a
+        producer bound video is limited by decoding.
+        Without a thread, only the number of frames and fps are counted.
+
+        Returns
+        -------
+        QueueStats
+            The statistics of the frame buffer.
+
+        """
+        depth = self._queue.qsize() if self._thread_loads else 0
+        return self._monitor.stats(depth)
+
     def read(self: Self) -> tuple[bool, np.ndarray]:
         """
         Read the next frame from the video.
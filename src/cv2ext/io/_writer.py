@@ -3,10 +3,14 @@
 # MIT License
 from __future__ import annotations
 
+import dataclasses
 from typing import TYPE_CHECKING
 
 import cv2
 
+from cv2ext.profiling._profiler import profiled
+from cv2ext.profiling._queue import QueueStats, _QueueMonitor
+
 from ._display import Display
 from ._fourcc import Fourcc
 
@@ -60,6 +64,7 @@ class VideoWriter:
 
         # allocate writer once first frame is written
         self._writer: cv2.VideoWriter | None = None
+        self._monitor = _QueueMonitor()
 
         # handle display allocation
         self._display = None
@@ -77,6 +82,7 @@ class VideoWriter:
     ) -> None:
         self.release()
 
+    @profiled()
     def write(self: Self, frame: np.ndarray) -> None:
         """
         Write a new frame to the video.
@@ -98,10 +104,31 @@ class VideoWriter:
                 self._frame_size,
             )
         self._writer.write(frame)
+        self._monitor.produced += 1
+        self._monitor.consume(0, 0)
 
         if self._display:
             self._display(frame)
 
+    def stats(self: Self) -> QueueStats:
+        """
+        Get the statistics of the written frames.
+
+        Frames are written synchronously, so there is no queue and
+        no wait times, only the number of frames and the fps.
+        If the video is shown, frames the display dropped are counted.
+
+        Returns
+        -------
+        QueueStats
+            The statistics of the written frames.
+
+        """
+        stats = self._monitor.stats(0)
+        if self._display:
+            stats = dataclasses.replace(stats, dropped=self._display.stats().dropped)
+        return stats
+
     def release(self: Self) -> None:
         """Release the video writer."""
         if self._writer is None:
@@ -6,12 +6,47 @@ Submodule containing tools for working with image metrics.
 
 Functions
 ---------
+:func:`dhash`
+    Compute the 64-bit difference hash of an image.
+:func:`dhash_many`
+    Compute the difference hash of many regions of an image.
+:func:`hamming`
+    Compute the Hamming distance between 64-bit hashes.
+:func:`histogram_distance`
+    Compute the distance between the color histograms of two images.
+:func:`histogram_distance_many`
+    Compute the histogram distance of many regions between two images.
 :func:`ncc`
     Compute the normalized cross-correlation between two images.
+:func:`ncc_many`
+    Compute the normalized cross-correlation of many regions between two images.
+:func:`phash`
+    Compute the 64-bit perceptual hash of an image.
+:func:`phash_many`
+    Compute the perceptual hash of many regions of an image.
+:func:`ssim`
+    Compute the structural similarity index between two images.
+:func:`ssim_many`
+    Compute the structural similarity of many regions between two images.
 """
 
 from __future__ import annotations
 
-from ._ncc import ncc
+from ._hash import dhash, dhash_many, hamming, phash, phash_many
+from ._histogram import histogram_distance, histogram_distance_many
+from ._ncc import ncc, ncc_many
+from ._ssim import ssim, ssim_many
 
-__all__ = ["ncc"]
+__all__ = [
+    "dhash",
+    "dhash_many",
+    "hamming",
+    "histogram_distance",
+    "histogram_distance_many",
+    "ncc",
+    "ncc_many",
+    "phash",
+    "phash_many",
+    "ssim",
+    "ssim_many",
+]
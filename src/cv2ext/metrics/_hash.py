@@ -0,0 +1,193 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, overload
+
+import cv2
+import numpy as np
+
+from cv2ext.image._context import FrameContext
+
+from ._ncc import _to_gray
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+# weights of each bit in a 64-bit hash, most significant first
+_BIT_WEIGHTS = np.left_shift(np.uint64(1), np.arange(63, -1, -1, dtype=np.uint64))
+
+
+def _pack_bits(bits: np.ndarray) -> int:
+    return int(np.bitwise_or.reduce(_BIT_WEIGHTS[bits.ravel()]))
+
+
+def _thumbnail(image: np.ndarray | FrameContext, size: tuple[int, int]) -> np.ndarray:
+    if isinstance(image, FrameContext):
+        return image.cached(("thumbnail", size), lambda raw: _thumbnail(raw, size))
+    # INTER_AREA is much faster for integer factors, so first shrink by the
+    # largest integer factor which keeps 4x the target size, then convert
+    height, width = image.shape[:2]
+    factor = min(width // (size[0] * 4), height // (size[1] * 4))
+    if factor >= 2:
+        image = image[: height - height % factor, : width - width % factor]
+        image = cv2.resize(
+            image,
+            (image.shape[1] // factor, image.shape[0] // factor),
+            interpolation=cv2.INTER_AREA,
+        )
+    return cv2.resize(_to_gray(image), size, interpolation=cv2.INTER_AREA)
+
+
+def dhash(image: np.ndarray | FrameContext) -> int:
+    """
+    Compute the 64-bit difference hash of an image.
+
+    Each bit records whether a pixel is brighter than its right
+    neighbour in an 8x8 grayscale thumbnail of the image.
+
+    Parameters
+    ----------
+    image : np.ndarray | FrameContext
+        The image to hash. Can be color or grayscale.
+
+    Returns
+    -------
+    int
+        The hash as an unsigned 64-bit integer.
+
+    """
+    small = _thumbnail(image, (9, 8))
+    return _pack_bits(small[:, 1:] > small[:, :-1])
+
+
+def phash(image: np.ndarray | FrameContext) -> int:
+    """
+    Compute the 64-bit perceptual hash of an image.
+
+    Each bit records whether a low frequency DCT coefficient of
+    a 32x32 grayscale thumbnail is above the median coefficient.
+
+    Parameters
+    ----------
+    image : np.ndarray | FrameContext
+        The image to hash. Can be color or grayscale.
+
+    Returns
+    -------
+    int
+        The hash as an unsigned 64-bit integer.
+
+    """
+    small = _thumbnail(image, (32, 32))
+    low = cv2.dct(small.astype(np.float32))[:8, :8]
+    # the DC term dominates the median, exclude it
+    median = np.median(low.ravel()[1:])
+    return _pack_bits(low > median)
+
+
+def _hash_many(
+    func: Callable[[np.ndarray], int],
+    image: np.ndarray | FrameContext,
+    bboxes: Sequence[tuple[int, int, int, int]],
+) -> np.ndarray:
+    gray = _to_gray(image)
+    height, width = gray.shape[:2]
+    hashes = np.zeros(len(bboxes), dtype=np.uint64)
+    for i, (bx1, by1, bx2, by2) in enumerate(bboxes):
+        x1, y1 = max(0, bx1), max(0, by1)
+        x2, y2 = min(width, bx2), min(height, by2)
+        if x2 <= x1 or y2 <= y1:
+            continue
+        hashes[i] = func(gray[y1:y2, x1:x2])
+    return hashes
+
+
+def dhash_many(
+    image: np.ndarray | FrameContext,
+    bboxes: Sequence[tuple[int, int, int, int]],
+) -> np.ndarray:
+    """
+    Compute the difference hash of many regions of an image.
+
+    Parameters
+    ----------
+    image : np.ndarray | FrameContext
+        The image to hash. Can be color or grayscale.
+        Converted to grayscale once for all regions.
+    bboxes : Sequence[tuple[int, int, int, int]]
+        The regions to hash, in form (x1, y1, x2, y2).
+        Regions are constrained to the image.
+
+    Returns
+    -------
+    np.ndarray
+        The hash of each region as uint64. Empty regions hash to 0.
+
+    """
+    return _hash_many(dhash, image, bboxes)
+
+
+def phash_many(
+    image: np.ndarray | FrameContext,
+    bboxes: Sequence[tuple[int, int, int, int]],
+) -> np.ndarray:
+    """
+    Compute the perceptual hash of many regions of an image.
+
+    Parameters
+    ----------
+    image : np.ndarray | FrameContext
+        The image to hash. Can be color or grayscale.
+        Converted to grayscale once for all regions.
+    bboxes : Sequence[tuple[int, int, int, int]]
+        The regions to hash, in form (x1, y1, x2, y2).
+        Regions are constrained to the image.
+
+    Returns
+    -------
+    np.ndarray
+        The hash of each region as uint64. Empty regions hash to 0.
+
+    """
+    return _hash_many(phash, image, bboxes)
+
+
+@overload
+def hamming(hash1: int, hash2: int) -> int: ...
+
+
+@overload
+def hamming(hash1: np.ndarray, hash2: np.ndarray) -> np.ndarray: ...
+
+
+def hamming(
+    hash1: int | np.ndarray,
+    hash2: int | np.ndarray,
+) -> int | np.ndarray:
+    """
+    Compute the Hamming distance between 64-bit hashes.
+
+    Parameters
+    ----------
+    hash1 : int | np.ndarray
+        The first hash, or an array of uint64 hashes.
+    hash2 : int | np.ndarray
+        The second hash, or an array of uint64 hashes.
+
+    Returns
+    -------
+    int | np.ndarray
+        The number of differing bits, elementwise for arrays.
+
+    """
+    if isinstance(hash1, int) and isinstance(hash2, int):
+        return bin(hash1 ^ hash2).count("1")
+    xor = np.bitwise_xor(
+        np.asarray(hash1, dtype=np.uint64),
+        np.asarray(hash2, dtype=np.uint64),
+    )
+    bits = np.unpackbits(xor.reshape(-1, 1).view(np.uint8), axis=1)
+    distances: np.ndarray = bits.sum(axis=1).reshape(xor.shape)
+    return distances
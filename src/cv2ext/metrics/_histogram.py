@@ -0,0 +1,122 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+from cv2ext.image._context import FrameContext, _joint_histogram
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def _histogram(image: np.ndarray | FrameContext, bins: int) -> np.ndarray:
+    if isinstance(image, FrameContext):
+        return image.hist(bins)
+    return _joint_histogram(image, bins)
+
+
+def histogram_distance(
+    image1: np.ndarray | FrameContext,
+    image2: np.ndarray | FrameContext,
+    bins: int = 8,
+    method: int = cv2.HISTCMP_BHATTACHARYYA,
+) -> float:
+    """
+    Compute the distance between the color histograms of two images.
+
+    The images do not need to be the same size, since each
+    histogram is normalized to sum to one.
+
+    Parameters
+    ----------
+    image1 : np.ndarray | FrameContext
+        The first image. Can be color or grayscale.
+        The histogram of a FrameContext is computed once and reused.
+    image2 : np.ndarray | FrameContext
+        The second image, with the same number of channels as image1.
+    bins : int, optional
+        The number of bins per channel, by default 8.
+    method : int, optional
+        The comparison method. One of cv2.HISTCMP_*.
+        By default cv2.HISTCMP_BHATTACHARYYA, which is 0.0 for
+        identical histograms and 1.0 for disjoint histograms.
+
+    Returns
+    -------
+    float
+        The histogram comparison value.
+
+    """
+    return float(
+        cv2.compareHist(_histogram(image1, bins), _histogram(image2, bins), method),
+    )
+
+
+def histogram_distance_many(
+    image1: np.ndarray | FrameContext,
+    image2: np.ndarray | FrameContext,
+    bboxes: Sequence[tuple[int, int, int, int]],
+    bins: int = 8,
+    method: int = cv2.HISTCMP_BHATTACHARYYA,
+) -> np.ndarray:
+    """
+    Compute the histogram distance of many regions between two images.
+
+    Parameters
+    ----------
+    image1 : np.ndarray | FrameContext
+        The first image. Can be color or grayscale.
+    image2 : np.ndarray | FrameContext
+        The second image, with the same size as image1.
+    bboxes : Sequence[tuple[int, int, int, int]]
+        The regions to compare, in form (x1, y1, x2, y2).
+        Regions are constrained to the image.
+    bins : int, optional
+        The number of bins per channel, by default 8.
+    method : int, optional
+        The comparison method. One of cv2.HISTCMP_*.
+        By default cv2.HISTCMP_BHATTACHARYYA.
+
+    Returns
+    -------
+    np.ndarray
+        The histogram comparison value of each region.
+        Empty regions have a value of 0.0.
+
+    Raises
+    ------
+    ValueError
+        If the images are not the same size.
+
+    """
+    if image1.shape[:2] != image2.shape[:2]:
+        err_msg = (
+            f"Images must be the same size. Got {image1.shape} and {image2.shape}."
+        )
+        raise ValueError(err_msg)
+
+    if isinstance(image1, FrameContext):
+        image1 = image1.image
+    if isinstance(image2, FrameContext):
+        image2 = image2.image
+
+    height, width = image1.shape[:2]
+    result = np.zeros(len(bboxes), dtype=np.float64)
+    for i, (bx1, by1, bx2, by2) in enumerate(bboxes):
+        x1, y1 = max(0, bx1), max(0, by1)
+        x2, y2 = min(width, bx2), min(height, by2)
+        if x2 <= x1 or y2 <= y1:
+            continue
+        # slices are views, calcHist reads the regions without copying
+        result[i] = histogram_distance(
+            image1[y1:y2, x1:x2],
+            image2[y1:y2, x1:x2],
+            bins,
+            method,
+        )
+    return result
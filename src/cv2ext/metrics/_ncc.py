@@ -4,42 +4,109 @@
 from __future__ import annotations
 
 import contextlib
+import math
+from typing import TYPE_CHECKING
 
 import cv2
 import numpy as np
 
+from cv2ext._flags import FLAGS
 from cv2ext._jit import register_jit
+from cv2ext.image._context import FrameContext
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
-@register_jit()
+
+@register_jit(
+    signatures=(
+        "float64(uint8[:, ::1], uint8[:, ::1])",
+        "float64(uint8[:, :], uint8[:, :])",
+    ),
+)
 def _ncc_kernel(
     image1: np.ndarray,
     image2: np.ndarray,
 ) -> float:
-    image1 = image1.astype(np.float32)
-    image2 = image2.astype(np.float32)
+    # raw moments in float64 from one pass over both images, allocating
+    # nothing, for 8-bit images the sums are exact integers so the result
+    # does not depend on summation order
+    n = image1.size
+    sum_a = 0.0
+    sum_b = 0.0
+    sum_ab = 0.0
+    sum_aa = 0.0
+    sum_bb = 0.0
+    for pixel1, pixel2 in zip(image1.flat, image2.flat):
+        a = float(pixel1)
+        b = float(pixel2)
+        sum_a += a
+        sum_b += b
+        sum_ab += a * b
+        sum_aa += a * a
+        sum_bb += b * b
 
-    img1std = np.std(image1)
-    img2std = np.std(image2)
+    cov = n * sum_ab - sum_a * sum_b
+    var_a = n * sum_aa - sum_a * sum_a
+    var_b = n * sum_bb - sum_b * sum_b
 
-    if img1std == 0.0 or img2std == 0.0:
+    if var_a <= 0.0 or var_b <= 0.0:
         return 0.0
 
-    image1_numerator: np.ndarray = image1 - np.mean(image1) / img1std
-    image2_numerator: np.ndarray = image2 - np.mean(image2) / img2std
-
-    val = float(
-        np.sum(image1_numerator * image2_numerator)
-        / (np.sqrt(np.sum(image1_numerator**2)) * np.sqrt(np.sum(image2_numerator**2))),
-    )
+    val = cov / math.sqrt(var_a * var_b)
 
     # clamp to [-1, 1] incase of floating point errors
     return max(min(1.0, val), -1.0)
 
 
-def ncc(
+def _ncc_numpy(
     image1: np.ndarray,
     image2: np.ndarray,
+) -> float:
+    # the same moments as _ncc_kernel, vectorized for when it is not compiled
+    a = image1.astype(np.float64).ravel()
+    b = image2.astype(np.float64).ravel()
+    n = a.size
+
+    sum_a = np.sum(a)
+    sum_b = np.sum(b)
+    cov = n * np.sum(a * b) - sum_a * sum_b
+    var_a = n * np.sum(a * a) - sum_a * sum_a
+    var_b = n * np.sum(b * b) - sum_b * sum_b
+
+    if var_a <= 0.0 or var_b <= 0.0:
+        return 0.0
+
+    val = float(cov / np.sqrt(var_a * var_b))
+
+    # clamp to [-1, 1] incase of floating point errors
+    return max(min(1.0, val), -1.0)
+
+
+def _to_gray(image: np.ndarray | FrameContext) -> np.ndarray:
+    if isinstance(image, FrameContext):
+        return image.gray
+    colorchannels = 3
+    with contextlib.suppress(IndexError):
+        if image.shape[2] == colorchannels:  # type: ignore[misc]
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def _gray_resized(
+    image: np.ndarray | FrameContext,
+    size: tuple[int, int],
+    interpolation: int,
+) -> np.ndarray:
+    # a FrameContext keeps the resized view for other metrics on the frame
+    if isinstance(image, FrameContext):
+        return image.resized(size, interpolation, gray=True)
+    return cv2.resize(_to_gray(image), size, interpolation=interpolation)
+
+
+def ncc(
+    image1: np.ndarray | FrameContext,
+    image2: np.ndarray | FrameContext,
     size: tuple[int, int] | None = (112, 112),
     *,
     resize: bool | None = True,
@@ -49,10 +116,10 @@ def ncc(
 
     Parameters
     ----------
-    image1 : np.ndarray
+    image1 : np.ndarray | FrameContext
         The first image. Can be color or grayscale.
         Converted to grayscale if color.
-    image2 : np.ndarray
+    image2 : np.ndarray | FrameContext
         The second image. Can be color or grayscale.
         Converted to grayscale if color.
     size : tuple[int, int], optional
@@ -80,16 +147,121 @@ def ncc(
         err_msg = f"Images must be the same size if not resizing. Got {image1.shape} and {image2.shape}."
         raise ValueError(err_msg)
 
-    colorchannels = 3
-    with contextlib.suppress(IndexError):
-        if image1.shape[2] == colorchannels:  # type: ignore[misc]
-            image1 = cv2.cvtColor(image1, cv2.COLOR_BGR2GRAY)
-    with contextlib.suppress(IndexError):
-        if image2.shape[2] == colorchannels:  # type: ignore[misc]
-            image2 = cv2.cvtColor(image2, cv2.COLOR_BGR2GRAY)
-
+    # a loop over every pixel is only fast once compiled
+    kernel = _ncc_kernel if FLAGS.JIT else _ncc_numpy
     if size is not None and resize:
-        image1 = cv2.resize(image1, size, interpolation=cv2.INTER_LINEAR)
-        image2 = cv2.resize(image2, size, interpolation=cv2.INTER_LINEAR)
+        return kernel(
+            _gray_resized(image1, size, cv2.INTER_LINEAR),
+            _gray_resized(image2, size, cv2.INTER_LINEAR),
+        )
+    return kernel(_to_gray(image1), _to_gray(image2))
+
+
+def ncc_many(
+    image1: np.ndarray | FrameContext,
+    image2: np.ndarray | FrameContext,
+    bboxes: Sequence[tuple[int, int, int, int]],
+    size: tuple[int, int] | None = None,
+) -> np.ndarray:
+    """
+    Compute the normalized cross-correlation of many regions between two images.
+
+    The same region of both images is compared for each bounding box.
+    Integral images of the pixel sums, squared sums, and cross products
+    are computed once, after which each region costs O(1).
+
+    Parameters
+    ----------
+    image1 : np.ndarray | FrameContext
+        The first image. Can be color or grayscale.
+        Converted to grayscale if color.
+    image2 : np.ndarray | FrameContext
+        The second image, with the same size as image1.
+        Converted to grayscale if color.
+    bboxes : Sequence[tuple[int, int, int, int]]
+        The regions to compare, in form (x1, y1, x2, y2).
+        Regions are constrained to the image.
+    size : tuple[int, int], optional
+        The size (width, height) to resize both images to before computing,
+        with the bounding boxes scaled to match. Lower sizes are faster.
+        By default None, which uses the images at full resolution.
+
+    Returns
+    -------
+    np.ndarray
+        The normalized cross-correlation of each region, in [-1, 1].
+        Empty or constant regions have a value of 0.0.
+
+    Raises
+    ------
+    ValueError
+        If the images are not the same size.
+
+    """
+    if image1.shape[:2] != image2.shape[:2]:
+        err_msg = (
+            f"Images must be the same size. Got {image1.shape} and {image2.shape}."
+        )
+        raise ValueError(err_msg)
+
+    if len(bboxes) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+
+    if size is not None:
+        height, width = image1.shape[:2]
+        boxes *= np.array(
+            [size[0] / width, size[1] / height, size[0] / width, size[1] / height],
+        )
+        gray1 = _gray_resized(image1, size, cv2.INTER_AREA)
+        gray2 = _gray_resized(image2, size, cv2.INTER_AREA)
+    else:
+        gray1 = _to_gray(image1)
+        gray2 = _to_gray(image2)
+
+    height, width = gray1.shape[:2]
+    boxes = np.round(boxes).astype(np.intp)
+    np.clip(boxes[:, 0::2], 0, width, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, height, out=boxes[:, 1::2])
+
+    # only integrate over the region covering all boxes
+    ox1, oy1 = boxes[:, 0].min(), boxes[:, 1].min()
+    ox2, oy2 = boxes[:, 2].max(), boxes[:, 3].max()
+    if ox2 <= ox1 or oy2 <= oy1:
+        return np.zeros(len(boxes), dtype=np.float64)
+    gray1 = gray1[oy1:oy2, ox1:ox2]
+    gray2 = gray2[oy1:oy2, ox1:ox2]
+    boxes -= np.array([ox1, oy1, ox1, oy1])
+    x1, y1, x2, y2 = boxes.T
+
+    # 32-bit sums are exact and much faster while they cannot overflow
+    exact = (
+        gray1.dtype == np.uint8
+        and gray2.dtype == np.uint8
+        and gray1.size * 255 < np.iinfo(np.int32).max
+    )
+    sdepth = cv2.CV_32S if exact else cv2.CV_64F
+    pdepth = cv2.CV_32F if exact else cv2.CV_64F
+    sum_a, sqsum_a = cv2.integral2(gray1, sdepth=sdepth, sqdepth=cv2.CV_64F)
+    sum_b, sqsum_b = cv2.integral2(gray2, sdepth=sdepth, sqdepth=cv2.CV_64F)
+    product = cv2.multiply(gray1, gray2, dtype=pdepth)
+    sum_ab = cv2.integral(product, sdepth=cv2.CV_64F)
+
+    def _box_sum(integral: np.ndarray) -> np.ndarray:
+        integral = integral.reshape(integral.shape[0], integral.shape[1])
+        corners = integral[[y2, y1, y2, y1], [x2, x2, x1, x1]].astype(np.float64)
+        box_sum: np.ndarray = corners[0] - corners[1] - corners[2] + corners[3]
+        return box_sum
+
+    n = ((x2 - x1) * (y2 - y1)).astype(np.float64)
+    s_a = _box_sum(sum_a)
+    s_b = _box_sum(sum_b)
+    cov = n * _box_sum(sum_ab) - s_a * s_b
+    var_a = n * _box_sum(sqsum_a) - s_a * s_a
+    var_b = n * _box_sum(sqsum_b) - s_b * s_b
 
-    return _ncc_kernel(image1, image2)
+    valid = (n > 0) & (var_a > 0.0) & (var_b > 0.0)
+    denom = np.sqrt(np.where(valid, var_a * var_b, 1.0))
+    result = np.where(valid, cov / denom, 0.0)
+    return np.clip(result, -1.0, 1.0)
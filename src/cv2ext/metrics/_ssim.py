@@ -0,0 +1,178 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+from ._ncc import _gray_resized, _to_gray
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from cv2ext.image import FrameContext
+
+# constants from Wang et al. for 8-bit images
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+_WINDOW = (11, 11)
+_SIGMA = 1.5
+
+
+def _ssim_map(image1: np.ndarray, image2: np.ndarray) -> np.ndarray:
+    # gaussian weighted local statistics, computed in float32
+    a = image1.astype(np.float32)
+    b = image2.astype(np.float32)
+
+    mu_a = cv2.GaussianBlur(a, _WINDOW, _SIGMA)
+    mu_b = cv2.GaussianBlur(b, _WINDOW, _SIGMA)
+    mu_ab = mu_a * mu_b
+    mu_a2 = mu_a * mu_a
+    mu_b2 = mu_b * mu_b
+
+    # second moments, the last product reuses the buffer of a
+    sigma_a2 = cv2.GaussianBlur(cv2.multiply(a, a), _WINDOW, _SIGMA) - mu_a2
+    sigma_b2 = cv2.GaussianBlur(cv2.multiply(b, b), _WINDOW, _SIGMA) - mu_b2
+    sigma_ab = cv2.GaussianBlur(cv2.multiply(a, b, dst=a), _WINDOW, _SIGMA) - mu_ab
+
+    numerator = (2 * mu_ab + _C1) * (2 * sigma_ab + _C2)
+    denominator = (mu_a2 + mu_b2 + _C1) * (sigma_a2 + sigma_b2 + _C2)
+    ssim_map: np.ndarray = numerator / denominator
+    return ssim_map
+
+
+def _prepare(
+    image1: np.ndarray | FrameContext,
+    image2: np.ndarray | FrameContext,
+    size: tuple[int, int] | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    if size is not None:
+        return (
+            _gray_resized(image1, size, cv2.INTER_AREA),
+            _gray_resized(image2, size, cv2.INTER_AREA),
+        )
+    return _to_gray(image1), _to_gray(image2)
+
+
+def ssim(
+    image1: np.ndarray | FrameContext,
+    image2: np.ndarray | FrameContext,
+    size: tuple[int, int] | None = None,
+) -> float:
+    """
+    Compute the structural similarity index between two images.
+
+    Parameters
+    ----------
+    image1 : np.ndarray | FrameContext
+        The first image. Can be color or grayscale.
+        Converted to grayscale if color.
+    image2 : np.ndarray | FrameContext
+        The second image. Can be color or grayscale.
+        Converted to grayscale if color.
+    size : tuple[int, int], optional
+        The size to resize the images to before computing.
+        Downscaling gives a much cheaper, coarser estimate.
+        By default None, which requires the images to be the same size.
+
+    Returns
+    -------
+    float
+        The mean structural similarity, 1.0 for identical images.
+
+    Raises
+    ------
+    ValueError
+        If the images are not the same size and not resizing.
+
+    """
+    if size is None and image1.shape[:2] != image2.shape[:2]:
+        err_msg = f"Images must be the same size if not resizing. Got {image1.shape} and {image2.shape}."
+        raise ValueError(err_msg)
+
+    gray1, gray2 = _prepare(image1, image2, size)
+    return float(np.mean(_ssim_map(gray1, gray2)))
+
+
+def ssim_many(
+    image1: np.ndarray | FrameContext,
+    image2: np.ndarray | FrameContext,
+    bboxes: Sequence[tuple[int, int, int, int]],
+    size: tuple[int, int] | None = None,
+) -> np.ndarray:
+    """
+    Compute the structural similarity of many regions between two images.
+
+    The SSIM map is computed once over the region covering all boxes,
+    and the mean of each box is read from its integral image.
+    Since the local windows extend past the box borders, values can
+    differ slightly from calling :func:`ssim` on cropped regions.
+
+    Parameters
+    ----------
+    image1 : np.ndarray | FrameContext
+        The first image. Can be color or grayscale.
+        Converted to grayscale if color.
+    image2 : np.ndarray | FrameContext
+        The second image, with the same size as image1.
+        Converted to grayscale if color.
+    bboxes : Sequence[tuple[int, int, int, int]]
+        The regions to compare, in form (x1, y1, x2, y2).
+        Regions are constrained to the image.
+    size : tuple[int, int], optional
+        The size (width, height) to resize both images to before computing,
+        with the bounding boxes scaled to match.
+        By default None, which uses the images at full resolution.
+
+    Returns
+    -------
+    np.ndarray
+        The mean structural similarity of each region.
+        Empty regions have a value of 0.0.
+
+    Raises
+    ------
+    ValueError
+        If the images are not the same size.
+
+    """
+    if image1.shape[:2] != image2.shape[:2]:
+        err_msg = (
+            f"Images must be the same size. Got {image1.shape} and {image2.shape}."
+        )
+        raise ValueError(err_msg)
+
+    if len(bboxes) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    if size is not None:
+        height, width = image1.shape[:2]
+        boxes *= np.array(
+            [size[0] / width, size[1] / height, size[0] / width, size[1] / height],
+        )
+    gray1, gray2 = _prepare(image1, image2, size)
+
+    height, width = gray1.shape[:2]
+    boxes = np.round(boxes).astype(np.intp)
+    np.clip(boxes[:, 0::2], 0, width, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, height, out=boxes[:, 1::2])
+
+    # only compute the map over the region covering all boxes
+    ox1, oy1 = boxes[:, 0].min(), boxes[:, 1].min()
+    ox2, oy2 = boxes[:, 2].max(), boxes[:, 3].max()
+    if ox2 <= ox1 or oy2 <= oy1:
+        return np.zeros(len(boxes), dtype=np.float64)
+    ssim_map = _ssim_map(gray1[oy1:oy2, ox1:ox2], gray2[oy1:oy2, ox1:ox2])
+    boxes -= np.array([ox1, oy1, ox1, oy1])
+    x1, y1, x2, y2 = boxes.T
+
+    integral = cv2.integral(ssim_map, sdepth=cv2.CV_64F)
+    corners = integral[[y2, y1, y2, y1], [x2, x2, x1, x1]]
+    total = corners[0] - corners[1] - corners[2] + corners[3]
+    area = ((x2 - x1) * (y2 - y1)).astype(np.float64)
+    result: np.ndarray = np.where(area > 0, total / np.maximum(area, 1.0), 0.0)
+    return result
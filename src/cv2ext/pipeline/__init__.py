@@ -0,0 +1,28 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+"""
+Submodule containing composable, threaded pipelines of stages.
+
+Each Stage calls a function on the items from the source or from
+earlier stages, on its own threads, with bounded queues between the
+stages. The I/O classes of cv2ext fit in directly, an IterableVideo
+as the source, and VideoWriter.write or a Display as a final stage.
+
+Classes
+-------
+:class:`Pipeline`
+    Stages connected into a graph, each running on its own threads.
+:class:`Stage`
+    A function called on each item passing through a Pipeline.
+:class:`StageStats`
+    Statistics of one stage of a Pipeline.
+
+"""
+
+from __future__ import annotations
+
+from ._pipeline import Pipeline
+from ._stage import Stage, StageStats
+
+__all__ = ["Pipeline", "Stage", "StageStats"]
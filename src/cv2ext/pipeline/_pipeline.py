@@ -0,0 +1,247 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import logging
+import threading
+from queue import Queue
+from typing import TYPE_CHECKING, Any
+
+from ._stage import _END, Stage, StageStats, _get
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+_log = logging.getLogger(__name__)
+
+
+class Pipeline:
+    """
+    Stages connected into a graph, each running on its own threads.
+
+    Each item of the source passes through every stage, with bounded
+    queues between the stages, so all stages work on different items
+    at the same time while a slow stage blocks those before it.
+    Iterating the Pipeline gives the output of the last stage for
+    each item, in the order of the source.
+    """
+
+    def __init__(
+        self: Self,
+        source: Iterable[Any],
+        stages: Sequence[Stage] | None = None,
+        buffersize: int = 8,
+    ) -> None:
+        """
+        Create a new Pipeline.
+
+        Parameters
+        ----------
+        source : Iterable[Any]
+            The items to process, such as an IterableVideo.
+            Read by a separate thread, as the stage named "source".
+        stages : Sequence[Stage], optional
+            The stages to add, in order.
+            By default None, in which case stages are added with add.
+        buffersize : int
+            The number of outputs of the last stage which can be
+            waiting to be iterated.
+            By default 8.
+
+        Raises
+        ------
+        ValueError
+            If buffersize is less than 1.
+
+        Examples
+        --------
+        >>> video = IterableVideo("video.mp4")
+        >>> pipeline = Pipeline(
+        ...     video,
+        ...     [
+        ...         Stage(lambda item: letterbox(item[1])[0], "letterbox"),
+        ...         Stage(detector, "detect", workers=2),
+        ...         Stage(
+        ...             lambda frame, dets: draw_detections(frame, nms(dets)),
+        ...             "draw",
+        ...             inputs=["letterbox", "detect"],
+        ...         ),
+        ...         Stage(VideoWriter("output.mp4").write, "write"),
+        ...     ],
+        ... )
+        >>> with pipeline:
+        ...     pipeline.run()
+        >>> pipeline.stats()["detect"].timing.mean_ms
+
+        """
+        if buffersize < 1:
+            err_msg = f"buffersize must be at least 1, got {buffersize}."
+            raise ValueError(err_msg)
+        self._source = Stage(iter(source).__next__, "source")
+        self._stages: dict[str, Stage] = {"source": self._source}
+        self._last = self._source
+        self._buffersize = buffersize
+        self._stop = threading.Event()
+        self._results: list[Queue[Any]] = []
+        self._started = False
+        self._closed = False
+        for stage in stages or []:
+            self.add(stage)
+
+    def __enter__(self: Self) -> Self:
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __iter__(self: Self) -> Iterator[Any]:
+        """
+        Iterate the outputs of the last stage.
+
+        The Pipeline is started if needed, and closed once the source
+        has ended, or the iteration is stopped.
+
+        Yields
+        ------
+        Any
+            The output of the last stage for each item of the source.
+
+        Raises
+        ------
+        Exception
+            Any exception raised by a stage, in the order of the items.
+
+        """
+        self.start()
+        try:
+            while True:
+                items = [_get(q, self._stop) for q in self._results]
+                if any(item is _END for item in items):
+                    return
+                # the stages nothing depends on are resolved, so their
+                # errors are raised, but only the last stage is given
+                for item in items[1:]:
+                    item.result()
+                yield items[0].result()
+        finally:
+            self.close()
+
+    def add(self: Self, stage: Stage) -> None:
+        """
+        Add a stage after the existing stages.
+
+        Parameters
+        ----------
+        stage : Stage
+            The stage to add. Its inputs must already be in the Pipeline.
+
+        Raises
+        ------
+        RuntimeError
+            If the Pipeline has already been started.
+        ValueError
+            If the name of the stage is already used,
+            or one of its inputs is not in the Pipeline.
+
+        """
+        if self._started:
+            err_msg = "Cannot add a stage to a Pipeline which has been started."
+            raise RuntimeError(err_msg)
+        if stage.name in self._stages:
+            err_msg = f"A stage named {stage.name} is already in the Pipeline."
+            raise ValueError(err_msg)
+        inputs = stage.inputs if stage.inputs is not None else (self._last.name,)
+        for name in inputs:
+            if name not in self._stages:
+                err_msg = f"The input {name} of {stage.name} is not in the Pipeline."
+                raise ValueError(err_msg)
+        for name in inputs:
+            q: Queue[Any] = Queue(maxsize=stage._buffersize)  # noqa: SLF001
+            stage._queues.append(q)  # noqa: SLF001
+            self._stages[name]._outputs.append(q)  # noqa: SLF001
+        self._stages[stage.name] = stage
+        self._last = stage
+
+    def start(self: Self) -> None:
+        """
+        Start the threads of every stage.
+
+        Raises
+        ------
+        RuntimeError
+            If the Pipeline has been closed.
+
+        """
+        if self._closed:
+            err_msg = "Cannot start a Pipeline which has been closed."
+            raise RuntimeError(err_msg)
+        if self._started:
+            return
+        # the last stage first, then every other stage nothing depends on
+        leaves = [
+            stage
+            for stage in self._stages.values()
+            if not stage._outputs and stage is not self._last  # noqa: SLF001
+        ]
+        for stage in [self._last, *leaves]:
+            q: Queue[Any] = Queue(maxsize=self._buffersize)
+            stage._outputs.append(q)  # noqa: SLF001
+            self._results.append(q)
+        self._started = True
+        for stage in self._stages.values():
+            stage._start(self._stop)  # noqa: SLF001
+        _log.debug(f"Pipeline started with stages: {list(self._stages)}")
+
+    def run(self: Self) -> int:
+        """
+        Process every item of the source, discarding the outputs.
+
+        Returns
+        -------
+        int
+            The number of items processed.
+
+        """
+        count = 0
+        for _ in self:
+            count += 1
+        return count
+
+    def close(self: Self) -> None:
+        """
+        Stop and join the threads of every stage.
+
+        Items which have not reached the end of the Pipeline are discarded.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._started:
+            for stage in self._stages.values():
+                stage._join()  # noqa: SLF001
+        _log.debug("Pipeline closed")
+
+    def stats(self: Self) -> dict[str, StageStats]:
+        """
+        Get the statistics of every stage.
+
+        The stage spending the most time per item, and the least time
+        waiting for its inputs, limits the throughput of the Pipeline.
+
+        Returns
+        -------
+        dict[str, StageStats]
+            The statistics of each stage, by name, including the source.
+
+        """
+        return {name: stage.stats() for name, stage in self._stages.items()}
@@ -0,0 +1,282 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from typing import TYPE_CHECKING, Any, cast
+
+from cv2ext._flags import FLAGS
+from cv2ext.profiling._profiler import _RECORDER, TimingStats, _Histogram
+from cv2ext.profiling._queue import QueueStats, _QueueMonitor
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from typing_extensions import Self
+
+_log = logging.getLogger(__name__)
+
+# marks the end of the items, passed along after the last item
+_END = object()
+
+
+def _get(q: Queue[Any], stop: threading.Event) -> Any:  # noqa: ANN401
+    # blocks until an item is available, or _END once stopped
+    while not stop.is_set():
+        with contextlib.suppress(Empty):
+            return q.get(timeout=0.1)
+    return _END
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """
+    Statistics of one stage of a Pipeline.
+
+    Attributes
+    ----------
+    name : str
+        The name of the stage.
+    workers : int
+        The number of threads calling the function of the stage.
+    timing : TimingStats | None
+        The time of each call of the function of the stage.
+        None if the function has not been called.
+    queue : QueueStats
+        The input queue of the stage. The consumer wait is the time the
+        stage waited for its inputs, and the producer wait is the time
+        the stage was blocked by the full queue of a later stage.
+
+    """
+
+    name: str
+    workers: int
+    timing: TimingStats | None
+    queue: QueueStats
+
+
+class Stage:
+    """A function called on each item passing through a Pipeline."""
+
+    def __init__(
+        self: Self,
+        func: Callable[..., Any],
+        name: str | None = None,
+        *,
+        inputs: Sequence[str] | None = None,
+        workers: int = 1,
+        buffersize: int = 8,
+    ) -> None:
+        """
+        Create a new Stage.
+
+        Parameters
+        ----------
+        func : Callable[..., Any]
+            The function to call on each item, given the output of
+            each input stage as a positional argument, in order.
+            Every call must return exactly one output, which may be None.
+        name : str, optional
+            The name of the stage, used by the inputs of later stages.
+            By default None, which uses the qualified name of func.
+        inputs : Sequence[str], optional
+            The names of the stages whose outputs are given to func.
+            "source" is the iterable the Pipeline was created with.
+            By default None, which uses the previously added stage.
+        workers : int
+            The number of threads calling func, each on a different item.
+            Outputs are always delivered in the order of the items.
+            By default 1.
+        buffersize : int
+            The number of items each input queue can hold before
+            the input stages are blocked.
+            By default 8.
+
+        Raises
+        ------
+        ValueError
+            If workers or buffersize is less than 1.
+
+        """
+        if workers < 1:
+            err_msg = f"workers must be at least 1, got {workers}."
+            raise ValueError(err_msg)
+        if buffersize < 1:
+            err_msg = f"buffersize must be at least 1, got {buffersize}."
+            raise ValueError(err_msg)
+        if name is None:
+            name = str(getattr(func, "__qualname__", type(func).__name__))
+        self._func = func
+        self._name = name
+        self._inputs = tuple(inputs) if inputs is not None else None
+        self._workers = workers
+        self._buffersize = buffersize
+
+        # runtime state, wired by the Pipeline
+        self._queues: list[Queue[Any]] = []
+        self._outputs: list[Queue[Any]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._histogram = _Histogram()
+        self._monitor = _QueueMonitor(buffersize)
+
+    @property
+    def name(self: Self) -> str:
+        """
+        The name of the stage.
+
+        Returns
+        -------
+        str
+            The name of the stage.
+
+        """
+        return self._name
+
+    @property
+    def inputs(self: Self) -> tuple[str, ...] | None:
+        """
+        The names of the input stages.
+
+        Returns
+        -------
+        tuple[str, ...] | None
+            The names of the input stages, None if using the previous stage.
+
+        """
+        return self._inputs
+
+    @property
+    def workers(self: Self) -> int:
+        """
+        The number of threads calling the function of the stage.
+
+        Returns
+        -------
+        int
+            The number of worker threads.
+
+        """
+        return self._workers
+
+    def stats(self: Self) -> StageStats:
+        """
+        Get the statistics of the stage.
+
+        Returns
+        -------
+        StageStats
+            The statistics of the stage.
+
+        """
+        with self._lock:
+            timing = (
+                self._histogram.stats(self._name) if self._histogram.count else None
+            )
+        depth = max((q.qsize() for q in self._queues), default=0)
+        return StageStats(
+            name=self._name,
+            workers=self._workers,
+            timing=timing,
+            queue=self._monitor.stats(depth),
+        )
+
+    def _start(self: Self, stop: threading.Event) -> None:
+        self._stop = stop
+        if self._workers > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers,
+                thread_name_prefix=f"Stage-{self._name}",
+            )
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"Stage-{self._name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _join(self: Self) -> None:
+        # calls already submitted are finished, so later stages waiting
+        # on them are not blocked, there are at most buffersize of them
+        if self._thread is not None:
+            self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _call(self: Self, *args: Any) -> Any:  # noqa: ANN401
+        start = time.perf_counter_ns()
+        try:
+            return self._func(*args)
+        finally:
+            end = time.perf_counter_ns()
+            with self._lock:
+                self._histogram.add(end - start)
+            if FLAGS.PROFILE:
+                _RECORDER.record(f"Pipeline.{self._name}", start, end)
+
+    def _put(self: Self, item: object) -> None:
+        for q in self._outputs:
+            while not self._stop.is_set():
+                with contextlib.suppress(Full):
+                    q.put(item, timeout=0.1)
+                    break
+
+    def _next(self: Self) -> Future[Any] | object:
+        # the future of the next output, or _END once the inputs have ended
+        future: Future[Any] = Future()
+        if not self._queues:
+            # a source, its func is the __next__ of an iterator
+            try:
+                future.set_result(self._call())
+            except StopIteration:
+                return _END
+            except Exception as err:  # noqa: BLE001
+                future.set_exception(err)
+            return future
+
+        depth = max(q.qsize() for q in self._queues)
+        t0 = time.perf_counter_ns()
+        items = [_get(q, self._stop) for q in self._queues]
+        if any(item is _END for item in items):
+            return _END
+        try:
+            args = [item.result() for item in items]
+        except Exception as err:  # noqa: BLE001
+            # forwarded in order, so the error is raised by the Pipeline
+            self._monitor.consume(time.perf_counter_ns() - t0, depth)
+            future.set_exception(err)
+            return future
+        self._monitor.consume(time.perf_counter_ns() - t0, depth)
+
+        if self._executor is not None:
+            return self._executor.submit(self._call, *args)
+        try:
+            future.set_result(self._call(*args))
+        except Exception as err:  # noqa: BLE001
+            future.set_exception(err)
+        return future
+
+    def _run(self: Self) -> None:
+        _log.debug(f"Stage {self._name} started")
+        while not self._stop.is_set():
+            future = self._next()
+            if future is _END:
+                break
+            t0 = time.perf_counter_ns()
+            self._put(future)
+            self._monitor.producer_wait_ns += time.perf_counter_ns() - t0
+            self._monitor.produced += 1
+            # a source which raised cannot be continued, its futures are done
+            if not self._queues and cast("Future[Any]", future).exception():
+                break
+        self._put(_END)
+        _log.debug(f"Stage {self._name} stopped")
@@ -0,0 +1,70 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+"""
+Submodule containing opt-in timing instrumentation for cv2ext.
+
+Key entry points, such as IterableVideo.__next__, VideoWriter.write,
+nms, frame packing, tracker updates, and ShiftScheduler.run, record
+the duration of each call while profiling is enabled. When disabled,
+instrumentation only checks a flag.
+
+The threaded components, IterableVideo, Display, MultiTracker, and
+VideoWriter, always count their queue traffic, reported as QueueStats
+by their stats methods.
+
+Classes
+-------
+:class:`Profiler`
+    Context manager which profiles the code run inside of it.
+:class:`QueueStats`
+    Statistics of the queue between a producer and a consumer.
+:class:`TimingStats`
+    Timing statistics of one instrumented function or region.
+
+Functions
+---------
+:func:`disable`
+    Disable recording timings, keeping those already recorded.
+:func:`enable`
+    Enable recording the timings of instrumented functions.
+:func:`export_chrome_trace`
+    Write the recorded calls as a Chrome trace.
+:func:`profiled`
+    Record the timing of each call of a function while profiling is enabled.
+:func:`region`
+    Record the timing of a block of code while profiling is enabled.
+:func:`reset`
+    Clear all recorded timings and trace events.
+:func:`snapshot`
+    Get the timing statistics recorded so far.
+
+"""
+
+from __future__ import annotations
+
+from ._profiler import (
+    Profiler,
+    TimingStats,
+    disable,
+    enable,
+    export_chrome_trace,
+    profiled,
+    region,
+    reset,
+    snapshot,
+)
+from ._queue import QueueStats
+
+__all__ = [
+    "Profiler",
+    "QueueStats",
+    "TimingStats",
+    "disable",
+    "enable",
+    "export_chrome_trace",
+    "profiled",
+    "region",
+    "reset",
+    "snapshot",
+]
@@ -0,0 +1,416 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import bisect
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from typing_extensions import ParamSpec, TypeVar
+
+from cv2ext._flags import FLAGS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+_log = logging.getLogger(__name__)
+
+# upper bounds of the histogram buckets in ns, doubling from 1us to ~16.8s,
+# with a final bucket for anything longer
+_BUCKETS_NS = tuple(1000 * 2**i for i in range(25))
+
+
+@dataclass(frozen=True)
+class TimingStats:
+    """
+    Timing statistics of one instrumented function or region.
+
+    Percentiles are estimated from the histogram, as the upper bound
+    of the bucket containing them, clamped to the observed range.
+
+    Attributes
+    ----------
+    name : str
+        The name the timings were recorded under.
+    count : int
+        The number of recorded calls.
+    total_ms : float
+        The total time of all calls, in milliseconds.
+    mean_ms : float
+        The mean time of a call, in milliseconds.
+    min_ms : float
+        The shortest call, in milliseconds.
+    max_ms : float
+        The longest call, in milliseconds.
+    p50_ms : float
+        The estimated median call, in milliseconds.
+    p90_ms : float
+        The estimated 90th percentile call, in milliseconds.
+    p99_ms : float
+        The estimated 99th percentile call, in milliseconds.
+    buckets : tuple[tuple[float, int], ...]
+        The non-empty histogram buckets, as (upper bound in milliseconds,
+        count). The last bucket is unbounded, with an upper bound of inf.
+
+    """
+
+    name: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    min_ms: float
+    max_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    buckets: tuple[tuple[float, int], ...]
+
+
+class _Histogram:
+    __slots__ = ("count", "counts", "max_ns", "min_ns", "total_ns")
+
+    def __init__(self: Self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.counts = [0] * (len(_BUCKETS_NS) + 1)
+
+    def add(self: Self, duration_ns: int) -> None:
+        if self.count == 0 or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.count += 1
+        self.total_ns += duration_ns
+        self.counts[bisect.bisect_left(_BUCKETS_NS, duration_ns)] += 1
+
+    def _percentile(self: Self, q: float) -> float:
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count > 0:
+                bound = _BUCKETS_NS[index] if index < len(_BUCKETS_NS) else self.max_ns
+                return min(max(bound, self.min_ns), self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+    def stats(self: Self, name: str) -> TimingStats:
+        return TimingStats(
+            name=name,
+            count=self.count,
+            total_ms=self.total_ns / 1e6,
+            mean_ms=self.total_ns / self.count / 1e6,
+            min_ms=self.min_ns / 1e6,
+            max_ms=self.max_ns / 1e6,
+            p50_ms=self._percentile(0.5),
+            p90_ms=self._percentile(0.9),
+            p99_ms=self._percentile(0.99),
+            buckets=tuple(
+                (
+                    _BUCKETS_NS[index] / 1e6
+                    if index < len(_BUCKETS_NS)
+                    else float("inf"),
+                    count,
+                )
+                for index, count in enumerate(self.counts)
+                if count > 0
+            ),
+        )
+
+
+class _Recorder:
+    def __init__(self: Self, max_events: int = 100_000) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[str, _Histogram] = {}
+        # (name, start, duration, thread id) in ns, the most recent are kept
+        self._events: deque[tuple[str, int, int, int]] = deque(maxlen=max_events)
+        self._threads: dict[int, str] = {}
+        self._origin_ns = time.perf_counter_ns()
+
+    def record(self: Self, name: str, start_ns: int, end_ns: int) -> None:
+        tid = threading.get_ident()
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram()
+            histogram.add(end_ns - start_ns)
+            self._events.append((name, start_ns, end_ns - start_ns, tid))
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+
+    def reset(self: Self, max_events: int | None = None) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._threads.clear()
+            if max_events is not None:
+                self._events = deque(maxlen=max_events)
+            else:
+                self._events.clear()
+            self._origin_ns = time.perf_counter_ns()
+
+    def snapshot(self: Self) -> dict[str, TimingStats]:
+        with self._lock:
+            return {
+                name: histogram.stats(name)
+                for name, histogram in sorted(self._histograms.items())
+            }
+
+    def trace(self: Self) -> dict[str, object]:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            origin_ns = self._origin_ns
+        pid = os.getpid()
+        trace_events: list[dict[str, object]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        ]
+        trace_events.extend(
+            {
+                "name": name,
+                "cat": "cv2ext",
+                "ph": "X",
+                "ts": (start_ns - origin_ns) / 1e3,
+                "dur": duration_ns / 1e3,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start_ns, duration_ns, tid in events
+        )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+_RECORDER = _Recorder()
+
+
+def enable(max_events: int | None = None) -> None:
+    """
+    Enable recording the timings of instrumented functions.
+
+    Parameters
+    ----------
+    max_events : int, optional
+        The number of most recent calls to keep for the Chrome trace,
+        which also clears all recorded timings.
+        By default None, which keeps the current limit of 100000.
+
+    """
+    if max_events is not None:
+        _RECORDER.reset(max_events)
+    FLAGS.PROFILE = True
+    _log.info("ENABLED PROFILING")
+
+
+def disable() -> None:
+    """Disable recording timings, keeping those already recorded."""
+    FLAGS.PROFILE = False
+    _log.info("DISABLED PROFILING")
+
+
+def reset() -> None:
+    """Clear all recorded timings and trace events."""
+    _RECORDER.reset()
+
+
+def snapshot() -> dict[str, TimingStats]:
+    """
+    Get the timing statistics recorded so far.
+
+    Returns
+    -------
+    dict[str, TimingStats]
+        The statistics of each instrumented function or region
+        called while profiling was enabled, by name.
+
+    """
+    return _RECORDER.snapshot()
+
+
+def export_chrome_trace(path: Path | str) -> None:
+    """
+    Write the recorded calls as a Chrome trace.
+
+    The file can be opened in chrome://tracing or https://ui.perfetto.dev
+    to view the calls of each thread on a timeline.
+
+    Parameters
+    ----------
+    path : Path | str
+        The path of the JSON file to write.
+
+    """
+    path = Path(path)
+    with path.open("w") as f:
+        json.dump(_RECORDER.trace(), f)
+
+
+def profiled(
+    name: str | None = None,
+) -> Callable[[Callable[_P, _R]], Callable[_P, _R]]:
+    """
+    Record the timing of each call of a function while profiling is enabled.
+
+    While profiling is disabled, the only cost is checking a flag.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name to record the timings under.
+        By default None, which uses the qualified name of the function.
+
+    Returns
+    -------
+    Callable[[Callable[_P, _R]], Callable[_P, _R]]
+        The decorator instrumenting the function.
+
+    Examples
+    --------
+    >>> @profiled("detect")
+    ... def detect(image):
+    ...     return model(image)
+
+    """
+
+    def decorator(func: Callable[_P, _R]) -> Callable[_P, _R]:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            if not FLAGS.PROFILE:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _RECORDER.record(label, start, time.perf_counter_ns())
+
+        return wrapper
+
+    return decorator
+
+
+@contextlib.contextmanager
+def _region(name: str) -> Iterator[None]:
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _RECORDER.record(name, start, time.perf_counter_ns())
+
+
+_NULL_REGION = contextlib.nullcontext()
+
+
+def region(name: str) -> contextlib.AbstractContextManager[None]:
+    """
+    Record the timing of a block of code while profiling is enabled.
+
+    Parameters
+    ----------
+    name : str
+        The name to record the timings under.
+
+    Returns
+    -------
+    contextlib.AbstractContextManager[None]
+        The context manager timing the block.
+
+    Examples
+    --------
+    >>> with region("postprocess"):
+    ...     bboxes = nms(bboxes)
+
+    """
+    if not FLAGS.PROFILE:
+        return _NULL_REGION
+    return _region(name)
+
+
+class Profiler:
+    """
+    Context manager which profiles the code run inside of it.
+
+    Entering clears any recorded timings and enables profiling,
+    exiting restores the previous profiling state. The timings
+    remain available from the Profiler afterwards.
+
+    Examples
+    --------
+    >>> with Profiler() as profiler:
+    ...     for _, frame in IterableVideo("video.mp4"):
+    ...         tracker.update(frame)
+    >>> profiler.snapshot()["IterableVideo.__next__"].p99_ms
+    >>> profiler.export_chrome_trace("trace.json")
+
+    """
+
+    def __init__(self: Self) -> None:
+        """Create a new Profiler."""
+        self._previous = False
+        self._stats: dict[str, TimingStats] = {}
+        self._trace: dict[str, object] = {"traceEvents": []}
+
+    def __enter__(self: Self) -> Self:
+        self._previous = FLAGS.PROFILE
+        reset()
+        enable()
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        FLAGS.PROFILE = self._previous
+        self._stats = _RECORDER.snapshot()
+        self._trace = _RECORDER.trace()
+
+    def snapshot(self: Self) -> dict[str, TimingStats]:
+        """
+        Get the timing statistics recorded inside the context.
+
+        Returns
+        -------
+        dict[str, TimingStats]
+            The statistics of each instrumented function or region, by name.
+            Empty until the context has exited.
+
+        """
+        return dict(self._stats)
+
+    def export_chrome_trace(self: Self, path: Path | str) -> None:
+        """
+        Write the calls recorded inside the context as a Chrome trace.
+
+        Parameters
+        ----------
+        path : Path | str
+            The path of the JSON file to write.
+
+        """
+        path = Path(path)
+        with path.open("w") as f:
+            json.dump(self._trace, f)
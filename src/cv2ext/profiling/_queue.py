@@ -0,0 +1,152 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    """
+    Statistics of the queue between a producer and a consumer.
+
+    When the consumer spends more time waiting than the producer, the
+    producer is the bottleneck, and a larger queue will not help.
+    When the producer spends more time waiting, the consumer is the
+    bottleneck, and the queue is usually full.
+
+    Attributes
+    ----------
+    capacity : int
+        The maximum number of items in the queue, 0 if unbounded.
+    depth : int
+        The number of items in the queue when the stats were taken.
+    mean_depth : float
+        The mean number of items in the queue, sampled each time
+        the consumer takes an item.
+    max_depth : int
+        The largest sampled number of items in the queue.
+    occupancy : tuple[int, ...]
+        The number of samples with each number of items in the queue,
+        indexed by the number of items.
+    produced : int
+        The number of items put in the queue.
+    consumed : int
+        The number of items taken from the queue.
+    dropped : int
+        The number of items discarded because the queue was full.
+    producer_wait_s : float
+        The time the producer spent blocked on a full queue, in seconds.
+    consumer_wait_s : float
+        The time the consumer spent blocked on an empty queue, in seconds.
+    elapsed_s : float
+        The time from creating the queue to the last consumed item, in seconds.
+    fps : float
+        The number of items consumed per second over elapsed_s.
+
+    """
+
+    capacity: int
+    depth: int
+    mean_depth: float
+    max_depth: int
+    occupancy: tuple[int, ...]
+    produced: int
+    consumed: int
+    dropped: int
+    producer_wait_s: float
+    consumer_wait_s: float
+    elapsed_s: float
+    fps: float
+
+    @property
+    def producer_bound(self: Self) -> bool:
+        """
+        Whether the producer is the bottleneck.
+
+        Returns
+        -------
+        bool
+            True if the consumer waited longer than the producer.
+
+        """
+        return self.consumer_wait_s > self.producer_wait_s
+
+
+class _QueueMonitor:
+    """
+    Counters of a queue, without any locking.
+
+    Each counter is only written by one side of the queue, the producer
+    counters by the producer thread and the consumer counters by the
+    consumer thread, so reads from other threads may be slightly stale
+    but the counters are never lost.
+    """
+
+    __slots__ = (
+        "_capacity",
+        "_occupancy",
+        "_start_ns",
+        "consumed",
+        "consumer_wait_ns",
+        "dropped",
+        "last_ns",
+        "produced",
+        "producer_wait_ns",
+    )
+
+    def __init__(self: Self, capacity: int = 0) -> None:
+        self._capacity = capacity
+        self._start_ns = time.perf_counter_ns()
+        self._occupancy = [0] * (capacity + 1)
+        # producer side
+        self.produced = 0
+        self.dropped = 0
+        self.producer_wait_ns = 0
+        # consumer side
+        self.consumed = 0
+        self.consumer_wait_ns = 0
+        self.last_ns = self._start_ns
+
+    def sample(self: Self, depth: int) -> None:
+        """Record the depth of the queue, called by the consumer."""
+        if depth >= len(self._occupancy):
+            self._occupancy.extend([0] * (depth + 1 - len(self._occupancy)))
+        self._occupancy[depth] += 1
+
+    def consume(self: Self, wait_ns: int, depth: int) -> None:
+        """Record an item taken from the queue, called by the consumer."""
+        self.sample(depth)
+        self.consumer_wait_ns += wait_ns
+        self.consumed += 1
+        self.last_ns = time.perf_counter_ns()
+
+    def stats(self: Self, depth: int) -> QueueStats:
+        occupancy = tuple(self._occupancy)
+        samples = sum(occupancy)
+        elapsed_s = (self.last_ns - self._start_ns) / 1e9
+        consumed = self.consumed
+        return QueueStats(
+            capacity=self._capacity,
+            depth=depth,
+            mean_depth=(
+                sum(d * count for d, count in enumerate(occupancy)) / samples
+                if samples
+                else 0.0
+            ),
+            max_depth=max((d for d, count in enumerate(occupancy) if count), default=0),
+            occupancy=occupancy,
+            produced=self.produced,
+            consumed=consumed,
+            dropped=self.dropped,
+            producer_wait_s=self.producer_wait_ns / 1e9,
+            consumer_wait_s=self.consumer_wait_ns / 1e9,
+            elapsed_s=elapsed_s,
+            fps=consumed / elapsed_s if elapsed_s > 0 else 0.0,
+        )
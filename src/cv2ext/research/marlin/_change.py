@@ -14,10 +14,14 @@ from sklearn.ensemble import (  # type: ignore[import-untyped, import-not-found]
 )
 
 from cv2ext.bboxes._convert import yolo_to_xyxy
+from cv2ext.image import FrameContext
 
 if TYPE_CHECKING:
     from typing_extensions import Self
 
+# the size (width, height) the frame is reduced to for the features
+_SIZE = (128, 128)
+
 
 class ChangeDetector:
     """ChangeDetector for Marlin methodology."""
@@ -44,35 +48,50 @@ class ChangeDetector:
 
     @staticmethod
     def preprocess(
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         detections: list[tuple[tuple[int, int, int, int], float, int]]
         | list[tuple[int, int, int, int]],
     ) -> np.ndarray:
-        frame = image.copy()
+        # the detections are masked on the 128x128 frame, so a FrameContext
+        # shares its resized view and only that small frame is copied
+        height, width = image.shape[:2]
+        if isinstance(image, FrameContext):
+            resized = image.resized(_SIZE)
+        else:
+            resized = cv2.resize(image, _SIZE)
+        scale_x = _SIZE[0] / width
+        scale_y = _SIZE[1] / height
+
+        resized_colored_image = resized.copy()
         for data in detections:
             if len(data) == 3:
                 (x1, y1, x2, y2), _, _ = data
             else:
                 x1, y1, x2, y2 = data
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 255, 255), -1)
+            cv2.rectangle(
+                resized_colored_image,
+                (round(x1 * scale_x), round(y1 * scale_y)),
+                (round(x2 * scale_x), round(y2 * scale_y)),
+                (255, 255, 255),
+                -1,
+            )
 
-        resized_colored_image = cv2.resize(frame, (128, 128))
         hist_red: np.ndarray = cv2.calcHist(
-            [resized_colored_image],
+            [resized_colored_image],  # type: ignore[list-item]
             [0],
             None,
             [256],
             [0, 256],
         )
         hist_green: np.ndarray = cv2.calcHist(
-            [resized_colored_image],
+            [resized_colored_image],  # type: ignore[list-item]
             [1],
             None,
             [256],
             [0, 256],
         )
         hist_blue: np.ndarray = cv2.calcHist(
-            [resized_colored_image],
+            [resized_colored_image],  # type: ignore[list-item]
             [2],
             None,
             [256],
@@ -164,6 +183,8 @@ class ChangeDetector:
                     return None
 
                 image = cv2.imread(str(image_path))
+                if image is None:
+                    return None
                 height, width = image.shape[:2]
                 with label_path.open("r") as f:
                     labels = f.readlines()
@@ -171,12 +192,8 @@ class ChangeDetector:
                 yolo_labels = [(x, y, w, h) for _, x, y, w, h in raw_labels]
                 bboxes = [yolo_to_xyxy(bbox, width, height) for bbox in yolo_labels]
 
-                resized_img = cv2.resize(
-                    image,
-                    (128, 128),
-                    interpolation=cv2.INTER_LINEAR,
-                )
-                vectors = ChangeDetector.preprocess(resized_img, bboxes)
+                # resized by preprocess, with the bboxes scaled to match
+                vectors = ChangeDetector.preprocess(image, bboxes)
                 # unpack vectors for training
                 return [
                     (vectors[0], False),
@@ -205,7 +222,7 @@ class ChangeDetector:
 
     def __call__(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         detections: list[tuple[tuple[int, int, int, int], float, int]]
         | list[tuple[int, int, int, int]],
     ) -> bool:
@@ -213,7 +230,7 @@ class ChangeDetector:
 
     def run(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         detections: list[tuple[tuple[int, int, int, int], float, int]]
         | list[tuple[int, int, int, int]],
     ) -> bool:
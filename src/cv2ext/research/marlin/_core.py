@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 
 import cv2
 
+from cv2ext.image import FrameContext
 from cv2ext.metrics._ncc import ncc
 from cv2ext.tracking.trackers._klt import KLTMultiTracker
 
@@ -55,7 +56,7 @@ class Marlin:
             The threshold for which the frame is determined to be changed.
             By default, 0.3
         num_features : int, optional
-            The number of features to track.
+            The maximum number of features to track per box.
             By default, this is set to 750.
         window_size : tuple[int, int], optional
             The size of the window used for tracking.
@@ -92,15 +93,17 @@ class Marlin:
 
     def run(
         self,
-        frame: np.ndarray,
+        frame: np.ndarray | FrameContext,
     ) -> list[tuple[tuple[int, int, int, int], float, int]]:
         """
         Run Marlin on the next frame in a sequence.
 
         Parameters
         ----------
-        frame : np.ndarray
+        frame : np.ndarray | FrameContext
             The next frame in a sequence.
+            The tracker and similarity checks share the grayscale
+            view of a FrameContext, so it is converted only once.
 
         Returns
         -------
@@ -108,14 +111,15 @@ class Marlin:
             The detections
 
         """
+        context = frame if isinstance(frame, FrameContext) else FrameContext(frame)
 
         def _run_det() -> list[tuple[tuple[int, int, int, int], float, int]]:
-            bboxes = self._detector(frame)
+            bboxes = self._detector(context.image)
             raw_bboxes = [det[0] for det in bboxes]
 
             # when we run the detector, setup the tracker
             if len(bboxes) != 0:
-                self._tracker.init(frame, raw_bboxes)
+                self._tracker.init(context, raw_bboxes)
 
             # set use_detector to False since we just used it
             self._use_detector = False
@@ -126,7 +130,7 @@ class Marlin:
             return bboxes
 
         def _run_tracker() -> list[tuple[tuple[int, int, int, int], float, int]]:
-            new_tracks = self._tracker.update(frame)
+            new_tracks = self._tracker.update(context)
             new_raw_bboxes = [track[1] for track in new_tracks]
             # form the bboxes
             new_bboxes = [
@@ -137,12 +141,13 @@ class Marlin:
             # compare the NCC of bboxes
             # do not care about tracker returned success values
             successes = 0
+            gray = context.gray
             for i in range(len(new_bboxes)):
                 x11, y11, x21, y21 = self._bboxes[i][0]
                 x12, y12, x22, y22 = new_bboxes[i][0]
 
-                roi1 = frame[y11:y21, x11:x21]
-                roi2 = frame[y12:y22, x12:x22]
+                roi1 = gray[y11:y21, x11:x21]
+                roi2 = gray[y12:y22, x12:x22]
 
                 sim = ncc(roi1, roi2, size=(x21 - x11, y21 - y11), resize=True)
 
@@ -168,7 +173,8 @@ class Marlin:
         bboxes = _run_det() if self._use_detector else _run_tracker()
 
         # run the change detector
-        result = self._change(frame, bboxes)
+        # shares the resized view of the frame with other consumers
+        result = self._change(context, bboxes)
         if result:
             self._use_detector = True
 
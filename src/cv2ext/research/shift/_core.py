@@ -8,6 +8,8 @@ import os
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 
+from cv2ext.image import FrameContext
+
 from ._scheduler import ShiftScheduler
 
 if TYPE_CHECKING:
@@ -38,6 +40,7 @@ class Shift:
         accuracy_threshold: float = 0.5,
         momentum: int = 10,
         knobs: dict[str, float] | None = None,
+        similarity: str = "ncc",
     ) -> None:
         """
         Initialize the SHIFT methodology.
@@ -72,6 +75,10 @@ class Shift:
             The default is None.
             The knobs dict (if provided) should contain, accuracy, latency,
             and energy as keys. All values should be floats.
+        similarity : str, optional
+            The frame similarity metric used by the scheduler.
+            One of "ncc", "ssim", "dhash", or "histogram".
+            The default is "ncc".
 
         Raises
         ------
@@ -86,6 +93,7 @@ class Shift:
             accuracy_threshold=accuracy_threshold,
             momentum=momentum,
             knobs=knobs,
+            similarity=similarity,
         )
 
         # store models as a dict[str, Callable[[np.ndarray], list[tuple[tuple[int, int, int, int], float, int]]]]
@@ -141,14 +149,14 @@ class Shift:
 
     def run(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
     ) -> list[tuple[tuple[int, int, int, int], float, int]]:
         """
         Call the SHIFT methodology and perform the actual scheduling.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The most recent image.
 
         Returns
@@ -157,14 +165,15 @@ class Shift:
             The detections returned by the detector.
 
         """
-        dets = self._models[self._last_model](image)
+        context = image if isinstance(image, FrameContext) else FrameContext(image)
+        dets = self._models[self._last_model](context.image)
         bboxes = []
         scores = []
         for bbox, score, _ in dets:
             bboxes.append(bbox)
             scores.append(score)
 
-        new_model = self._scheduler.run(self._last_model, image, bboxes, scores)
+        new_model = self._scheduler.run(self._last_model, context, bboxes, scores)
 
         if new_model in self._models:
             self._last_model = new_model
@@ -173,14 +182,14 @@ class Shift:
 
     def __call__(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
     ) -> list[tuple[tuple[int, int, int, int], float, int]]:
         """
         Call the SHIFT methodology and perform the actual scheduling.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The most recent image.
 
         Returns
@@ -17,7 +17,14 @@ import numpy as np
 from typing_extensions import Self
 
 from cv2ext.bboxes._constrain import constrain
+from cv2ext.image import FrameContext
+from cv2ext.metrics._hash import dhash, hamming
+from cv2ext.metrics._histogram import histogram_distance
 from cv2ext.metrics._ncc import ncc
+from cv2ext.metrics._ssim import ssim
+from cv2ext.profiling._profiler import profiled
+
+_SIMILARITIES = ("ncc", "ssim", "dhash", "histogram")
 
 
 class ShiftScheduler:
@@ -36,6 +43,7 @@ class ShiftScheduler:
         accuracy_threshold: float = 0.5,
         momentum: int = 10,
         knobs: dict[str, float] | None = None,
+        similarity: str = "ncc",
     ) -> None:
         """
         Use to intialize the shift algorithm.
@@ -68,13 +76,23 @@ class ShiftScheduler:
             The default is None.
             The knobs dict (if provided) should contain, accuracy, latency,
             and energy as keys. All values should be floats.
+        similarity : str, optional
+            The frame similarity metric used to gate re-scheduling.
+            One of "ncc", "ssim", "dhash", or "histogram".
+            The default is "ncc". "dhash" and "histogram" are cheaper,
+            see benchmarks/similarity.py.
 
         Raises
         ------
         ValueError
             If the knob keys provided are not valid
+            If the similarity metric is not valid
 
         """
+        if similarity not in _SIMILARITIES:
+            err_msg = f"Invalid similarity {similarity}, options are {_SIMILARITIES}"
+            raise ValueError(err_msg)
+        self._similarity = similarity
         self._stats_dir = str(data_dir)
         self._cost_threshold: float = cost_threshold
         self._accuracy_threshold: float = accuracy_threshold
@@ -182,7 +200,7 @@ class ShiftScheduler:
         # self._latency = self._transform(self._latency)
 
         # assign attributes for image similarity
-        self._last_image: np.ndarray | None = None
+        self._last_image: FrameContext | None = None
         self._last_bboxes: list[tuple[int, int, int, int]] | None = None
 
         # state tracking for last returned model
@@ -315,28 +333,49 @@ class ShiftScheduler:
         """
         self._knobs["accuracy"], self._knobs["latency"], self._knobs["energy"] = values
 
+    def _similarity_score(
+        self: Self,
+        image1: np.ndarray | FrameContext,
+        image2: np.ndarray | FrameContext,
+        size: tuple[int, int],
+    ) -> float:
+        if self._similarity == "ssim":
+            return ssim(image1, image2, size)
+        if self._similarity == "dhash":
+            return 1.0 - hamming(dhash(image1), dhash(image2)) / 64.0
+        if self._similarity == "histogram":
+            return 1.0 - histogram_distance(image1, image2)
+        return ncc(image1, image2, size)
+
     def _ncc(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         bboxes: list[tuple[int, int, int, int]],
     ) -> float:
+        # keep the last frame as a context, so its views are computed once
+        # and reused when comparing against the next frame
+        context = image if isinstance(image, FrameContext) else FrameContext(image)
+        height, width = context.shape[:2]
         if self._last_image is None or self._last_bboxes is None:
-            self._last_image = image
-            img_size = (image.shape[1], image.shape[0])
-            self._last_bboxes = [constrain(bbox, img_size) for bbox in bboxes]
+            self._last_image = context
+            self._last_bboxes = [constrain(bbox, (width, height)) for bbox in bboxes]
             return 0.0
+        # the region metrics convert to grayscale, so crop the shared gray view
+        gray = self._similarity not in ("dhash", "histogram")
+        current = context.gray if gray else context.image
+        last = self._last_image.gray if gray else self._last_image.image
         ncc_vals = []
         for bbox in bboxes:
-            bbox_roi = constrain(bbox, (image.shape[1], image.shape[0]))
-            bbox_ncc = ncc(
-                image[bbox_roi[1] : bbox_roi[3], bbox_roi[0] : bbox_roi[2]],
-                self._last_image[bbox_roi[1] : bbox_roi[3], bbox_roi[0] : bbox_roi[2]],
+            bbox_roi = constrain(bbox, (width, height))
+            bbox_ncc = self._similarity_score(
+                current[bbox_roi[1] : bbox_roi[3], bbox_roi[0] : bbox_roi[2]],
+                last[bbox_roi[1] : bbox_roi[3], bbox_roi[0] : bbox_roi[2]],
                 (24, 24),
             )
             ncc_vals.append(bbox_ncc)
         bbox_ncc = float(np.mean(ncc_vals)) if len(ncc_vals) > 0 else 0.0
-        image_ncc = ncc(image, self._last_image, (112, 112))
-        self._last_image = image
+        image_ncc = self._similarity_score(context, self._last_image, (112, 112))
+        self._last_image = context
         self._last_bboxes = bboxes
         result = bbox_ncc * image_ncc
         if math.isnan(result):
@@ -477,10 +516,11 @@ class ShiftScheduler:
         except KeyError:
             return self._get_accuracy_estimates(node_name)
 
+    @profiled()
     def run(
         self: Self,
         modelname: str,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         bboxes: list[tuple[int, int, int, int]],
         scores: list[float],
     ) -> str:
@@ -491,7 +531,7 @@ class ShiftScheduler:
         ----------
         modelname : str
             The name of the model last run.
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The frame the model was run on.
         bboxes : list[tuple[int, int, int, int]]
             The bounding boxes generated by the model.
@@ -582,7 +622,7 @@ class ShiftScheduler:
     def __call__(
         self: Self,
         modelname: str,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         bboxes: list[tuple[int, int, int, int]],
         scores: list[float],
     ) -> str:
@@ -593,7 +633,7 @@ class ShiftScheduler:
         ----------
         modelname : str
             The name of the model last run.
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The frame the model was run on.
         bboxes : list[tuple[int, int, int, int]]
             The bounding boxes generated by the model.
@@ -4,8 +4,17 @@
 """
 Subpackage containing tools for working with templates in images.
 
+Classes
+-------
+:class:`ImagePyramid`
+    An image pyramid which can be reused for matching many templates.
+:class:`TemplateBank`
+    A set of templates which are matched against an image in one call.
+
 Functions
 ---------
+:func:`match_pyramid`
+    Find the best match of a template in an image over multiple scales.
 :func:`match_single`
     Find the best match of a template in an image.
 :func:`match_multiple`
@@ -15,6 +24,14 @@ Functions
 
 from __future__ import annotations
 
+from ._bank import TemplateBank
 from ._core import match_multiple, match_single
+from ._pyramid import ImagePyramid, match_pyramid
 
-__all__ = ["match_multiple", "match_single"]
+__all__ = [
+    "ImagePyramid",
+    "TemplateBank",
+    "match_multiple",
+    "match_pyramid",
+    "match_single",
+]
@@ -0,0 +1,320 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import cv2
+
+from ._core import _match_peaks
+from ._pyramid import (
+    ImagePyramid,
+    _coarse_level,
+    _is_minimizing,
+    _match_prepared,
+    _resize_template,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from types import TracebackType
+
+    import numpy as np
+    from typing_extensions import Self
+
+_log = logging.getLogger(__name__)
+
+
+class TemplateBank:
+    """
+    A set of templates which are matched against an image in one call.
+
+    All per template work (grayscale conversion and resizing for each
+    scale and pyramid level) is done once when the template is added.
+    Per frame, the image is converted and its pyramid is built once,
+    then the templates are matched across a persistent thread pool.
+    """
+
+    def __init__(
+        self: Self,
+        templates: Mapping[str, np.ndarray] | None = None,
+        scales: Sequence[float] = (1.0,),
+        method: int = cv2.TM_CCOEFF_NORMED,
+        threshold: float = 0.8,
+        levels: int = 3,
+        top_k: int = 3,
+        min_template_size: int = 12,
+        num_workers: int | None = None,
+        *,
+        grayscale: bool | None = None,
+    ) -> None:
+        """
+        Create a new TemplateBank.
+
+        Parameters
+        ----------
+        templates : Mapping[str, np.ndarray], optional
+            The templates to add to the bank, keyed by their label.
+        scales : Sequence[float], optional
+            The scales of each template to search for.
+            Default is (1.0,).
+        method : int, optional
+            The method to use for template matching. One of cv2.TM_*.
+            Default is cv2.TM_CCOEFF_NORMED.
+        threshold : float, optional
+            The threshold a match score must meet to be returned.
+            For cv2.TM_SQDIFF methods, scores must be at most the threshold.
+            Default is 0.8.
+        levels : int, optional
+            The number of image pyramid levels to build per frame.
+            Default is 3.
+        top_k : int, optional
+            The number of coarse candidates to refine per template scale.
+            Default is 3.
+        min_template_size : int, optional
+            The smallest side length a template may be downscaled to.
+            Default is 12.
+        num_workers : int, optional
+            The number of threads used to match templates.
+            By default None, which uses the ThreadPoolExecutor default.
+        grayscale : bool, optional
+            Whether to match in grayscale. Matching in grayscale is
+            roughly three times cheaper than matching in color.
+            By default None, which matches in grayscale.
+
+        """
+        self._scales = tuple(scales)
+        self._method = method
+        self._threshold = threshold
+        self._levels = levels
+        self._top_k = top_k
+        self._min_template_size = min_template_size
+        self._grayscale = grayscale if grayscale is not None else True
+
+        # label -> list of per scale templates, each resized for levels 0..coarse
+        self._templates: dict[str, list[list[np.ndarray]]] = {}
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_workers,
+            thread_name_prefix="TemplateBank",
+        )
+
+        if templates is not None:
+            for label, template in templates.items():
+                self.add(label, template)
+
+    def __enter__(self: Self) -> Self:
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self: Self) -> int:
+        return len(self._templates)
+
+    @property
+    def labels(self: Self) -> list[str]:
+        """
+        The labels of the templates in the bank.
+
+        Returns
+        -------
+        list[str]
+            The labels, in the order the templates were added.
+
+        """
+        return list(self._templates)
+
+    def _prepare(self: Self, image: np.ndarray) -> np.ndarray:
+        if self._grayscale and image.ndim == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+
+    def add(self: Self, label: str, template: np.ndarray) -> None:
+        """
+        Add a template to the bank.
+
+        Parameters
+        ----------
+        label : str
+            The label to report matches of the template with.
+        template : np.ndarray
+            The template image.
+
+        Raises
+        ------
+        ValueError
+            If a template with the same label is already in the bank.
+
+        """
+        if label in self._templates:
+            err_msg = f"A template with label {label} is already in the bank."
+            raise ValueError(err_msg)
+
+        template = self._prepare(template)
+        prepared: list[list[np.ndarray]] = []
+        for scale in self._scales:
+            scaled = _resize_template(template, scale)
+            t_h, t_w = scaled.shape[:2]
+            level = _coarse_level(
+                (t_h, t_w),
+                self._levels,
+                self._min_template_size,
+            )
+            prepared.append(
+                [_resize_template(scaled, 0.5**lvl) for lvl in range(level + 1)],
+            )
+        self._templates[label] = prepared
+        _log.debug(f"Added template {label} to TemplateBank")
+
+    def remove(self: Self, label: str) -> None:
+        """
+        Remove a template from the bank.
+
+        Parameters
+        ----------
+        label : str
+            The label of the template to remove.
+
+        """
+        del self._templates[label]
+
+    def _match_one(
+        self: Self,
+        pyramid: ImagePyramid,
+        label: str,
+    ) -> tuple[str, tuple[int, int, int, int], float] | None:
+        img_h, img_w = pyramid.image.shape[:2]
+        minimize = _is_minimizing(self._method)
+        best: tuple[str, tuple[int, int, int, int], float] | None = None
+        for level_templates in self._templates[label]:
+            t_h, t_w = level_templates[0].shape[:2]
+            if t_h > img_h or t_w > img_w:
+                continue
+            # pyramid may have fewer levels than planned for small images
+            bbox, score = _match_prepared(
+                pyramid,
+                level_templates[: pyramid.levels],
+                self._method,
+                self._top_k,
+            )
+            passed = score <= self._threshold if minimize else score >= self._threshold
+            if not passed:
+                continue
+            if best is None or (score < best[2] if minimize else score > best[2]):
+                best = (label, bbox, score)
+        return best
+
+    def _match_all_one(
+        self: Self,
+        image: np.ndarray,
+        label: str,
+        nms_threshold: float,
+        top_k: int | None,
+    ) -> list[tuple[str, tuple[int, int, int, int], float]]:
+        img_h, img_w = image.shape[:2]
+        matches: list[tuple[str, tuple[int, int, int, int], float]] = []
+        for level_templates in self._templates[label]:
+            template = level_templates[0]
+            t_h, t_w = template.shape[:2]
+            if t_h > img_h or t_w > img_w:
+                continue
+            result = cv2.matchTemplate(image, template, self._method)
+            bboxes, scores = _match_peaks(
+                result,
+                template.shape,  # type: ignore[arg-type]
+                self._method,
+                self._threshold,
+                nms_threshold,
+                top_k,
+            )
+            matches.extend(
+                (label, tuple(bbox), float(score))  # type: ignore[misc]
+                for bbox, score in zip(bboxes.tolist(), scores.tolist())
+            )
+        return matches
+
+    def match(
+        self: Self,
+        image: np.ndarray,
+    ) -> list[tuple[str, tuple[int, int, int, int], float]]:
+        """
+        Find the best match of every template in the image.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The image to search for the templates in.
+
+        Returns
+        -------
+        list[tuple[str, tuple[int, int, int, int], float]]
+            The label, bounding box (x1, y1, x2, y2), and score for each
+            template whose best match passes the threshold.
+
+        """
+        pyramid = ImagePyramid(self._prepare(image), self._levels)
+        futures = [
+            self._executor.submit(self._match_one, pyramid, label)
+            for label in self._templates
+        ]
+        results = [future.result() for future in futures]
+        return [result for result in results if result is not None]
+
+    def match_all(
+        self: Self,
+        image: np.ndarray,
+        nms_threshold: float = 0.5,
+        top_k: int | None = None,
+    ) -> list[tuple[str, tuple[int, int, int, int], float]]:
+        """
+        Find all matches of every template in the image.
+
+        Each template is matched at full resolution and its response map
+        is reduced to peaks with non-maximum suppression,
+        see :func:`cv2ext.template.match_multiple`.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The image to search for the templates in.
+        nms_threshold : float, optional
+            The IoU threshold for non-maximum suppression.
+            Default is 0.5.
+        top_k : int, optional
+            The maximum number of matches per template and scale.
+            By default None, which returns all matches.
+
+        Returns
+        -------
+        list[tuple[str, tuple[int, int, int, int], float]]
+            The label, bounding box (x1, y1, x2, y2), and score of each match.
+
+        """
+        prepared = self._prepare(image)
+        futures = [
+            self._executor.submit(
+                self._match_all_one,
+                prepared,
+                label,
+                nms_threshold,
+                top_k,
+            )
+            for label in self._templates
+        ]
+        matches: list[tuple[str, tuple[int, int, int, int], float]] = []
+        for future in futures:
+            matches.extend(future.result())
+        return matches
+
+    def close(self: Self) -> None:
+        """Shutdown the thread pool used for matching."""
+        self._executor.shutdown(wait=True)
@@ -3,10 +3,13 @@
 # MIT License
 from __future__ import annotations
 
+from typing import Literal, overload
+
 import cv2
 import numpy as np
 
 from cv2ext._jit import register_jit
+from cv2ext.bboxes._nms import _nms_array
 
 
 @register_jit()
@@ -27,6 +30,31 @@ def _match_multiple_kernel(
     return matches
 
 
+def _match_peaks(
+    result: np.ndarray,
+    template_shape: tuple[int, int] | tuple[int, int, int],
+    method: int,
+    threshold: float,
+    nms_threshold: float,
+    top_k: int | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    # local extrema of the response map, a pixel is a peak if it is
+    # equal to the max (or min) of its 3x3 neighborhood
+    kernel = np.ones((3, 3), dtype=np.uint8)
+    if method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
+        mask = (result == cv2.erode(result, kernel)) & (result <= threshold)
+        order_scores = -result[mask]
+    else:
+        mask = (result == cv2.dilate(result, kernel)) & (result >= threshold)
+        order_scores = result[mask]
+    ys, xs = np.nonzero(mask)
+    scores = result[ys, xs]
+    t_h, t_w = template_shape[:2]
+    bboxes = np.stack((xs, ys, xs + t_w, ys + t_h), axis=1).astype(np.int32)
+    keep = _nms_array(bboxes, order_scores, nms_threshold, top_k)
+    return bboxes[keep], scores[keep]
+
+
 def match_single(
     image: np.ndarray,
     template: np.ndarray,
@@ -59,12 +87,42 @@ def match_single(
     return x1, y1, x2, y2
 
 
+@overload
+def match_multiple(
+    image: np.ndarray,
+    template: np.ndarray,
+    method: int = ...,
+    threshold: float = ...,
+    *,
+    peaks: Literal[False] | None = ...,
+    nms_threshold: float = ...,
+    top_k: int | None = ...,
+) -> list[tuple[int, int, int, int]]: ...
+
+
+@overload
+def match_multiple(
+    image: np.ndarray,
+    template: np.ndarray,
+    method: int = ...,
+    threshold: float = ...,
+    *,
+    peaks: Literal[True],
+    nms_threshold: float = ...,
+    top_k: int | None = ...,
+) -> tuple[np.ndarray, np.ndarray]: ...
+
+
 def match_multiple(
     image: np.ndarray,
     template: np.ndarray,
     method: int = cv2.TM_CCOEFF_NORMED,
     threshold: float = 0.8,
-) -> list[tuple[int, int, int, int]]:
+    *,
+    peaks: bool | None = None,
+    nms_threshold: float = 0.5,
+    top_k: int | None = None,
+) -> list[tuple[int, int, int, int]] | tuple[np.ndarray, np.ndarray]:
     """
     Find all matches of the template in the image.
 
@@ -78,12 +136,34 @@ def match_multiple(
         The method to use for template matching. One of cv2.TM_*. Default is cv2.TM_CCOEFF_NORMED.
     threshold : float
         The threshold to use for matches. Default is 0.8.
+    peaks : bool, optional
+        If True, only local extrema of the response map are kept,
+        overlapping matches are removed with non-maximum suppression,
+        and arrays of bounding boxes and scores are returned.
+        By default None, which returns every pixel above the threshold.
+    nms_threshold : float
+        The IoU threshold for non-maximum suppression when peaks is True.
+        Default is 0.5.
+    top_k : int, optional
+        The maximum number of matches to return when peaks is True.
+        By default None, which returns all matches.
 
     Returns
     -------
-    list[tuple[int, int, int, int]]
+    list[tuple[int, int, int, int]] | tuple[np.ndarray, np.ndarray]
         A list of tuples containing the x1, y1, x2, and y2 coordinates of the matches.
+        If peaks is True, an (N, 4) array of the bounding boxes and an (N,)
+        array of their scores, ordered from best to worst match.
 
     """
     result = cv2.matchTemplate(image, template, method)
+    if peaks:
+        return _match_peaks(
+            result,
+            template.shape,  # type: ignore[arg-type]
+            method,
+            threshold,
+            nms_threshold,
+            top_k,
+        )
     return _match_multiple_kernel(result, template.shape, method, threshold)  # type: ignore[arg-type]
@@ -0,0 +1,295 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from typing_extensions import Self
+
+
+class ImagePyramid:
+    """An image pyramid which can be reused for matching many templates."""
+
+    def __init__(self: Self, image: np.ndarray, levels: int = 3) -> None:
+        """
+        Create a new ImagePyramid.
+
+        Each level is half the resolution of the previous level,
+        computed with cv2.pyrDown. Level 0 is the original image.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The image to build the pyramid from.
+        levels : int, optional
+            The number of levels in the pyramid, including the original image.
+            Default is 3.
+
+        Raises
+        ------
+        ValueError
+            If levels is less than 1.
+
+        """
+        if levels < 1:
+            err_msg = f"An ImagePyramid must have at least 1 level, got {levels}."
+            raise ValueError(err_msg)
+
+        self._levels: list[np.ndarray] = [image]
+        for _ in range(levels - 1):
+            prev = self._levels[-1]
+            if min(prev.shape[:2]) < 2:
+                break
+            self._levels.append(cv2.pyrDown(prev))
+
+    @property
+    def image(self: Self) -> np.ndarray:
+        """
+        The original image.
+
+        Returns
+        -------
+        np.ndarray
+            The original, full resolution image.
+
+        """
+        return self._levels[0]
+
+    @property
+    def levels(self: Self) -> int:
+        """
+        The number of levels in the pyramid.
+
+        Returns
+        -------
+        int
+            The number of levels in the pyramid.
+
+        """
+        return len(self._levels)
+
+    def __len__(self: Self) -> int:
+        return len(self._levels)
+
+    def __getitem__(self: Self, level: int) -> np.ndarray:
+        return self._levels[level]
+
+
+def _is_minimizing(method: int) -> bool:
+    return method in (cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED)
+
+
+def _resize_template(template: np.ndarray, factor: float) -> np.ndarray:
+    if factor == 1.0:
+        return template
+    height, width = template.shape[:2]
+    new_size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    interpolation = cv2.INTER_AREA if factor < 1.0 else cv2.INTER_LINEAR
+    return cv2.resize(template, new_size, interpolation=interpolation)
+
+
+def _top_peaks(
+    result: np.ndarray,
+    top_k: int,
+    suppress: tuple[int, int],
+    *,
+    minimize: bool,
+) -> list[tuple[tuple[int, int], float]]:
+    # result is owned by the caller and is modified in place
+    fill = np.inf if minimize else -np.inf
+    s_w, s_h = suppress
+    peaks: list[tuple[tuple[int, int], float]] = []
+    for _ in range(top_k):
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        value = min_val if minimize else max_val
+        if not np.isfinite(value):
+            break
+        x, y = min_loc if minimize else max_loc
+        peaks.append(((x, y), float(value)))
+        result[
+            max(0, y - s_h) : y + s_h + 1,
+            max(0, x - s_w) : x + s_w + 1,
+        ] = fill
+    return peaks
+
+
+def _refine(
+    image: np.ndarray,
+    template: np.ndarray,
+    location: tuple[int, int],
+    radius: int,
+    method: int,
+) -> tuple[tuple[int, int], float]:
+    # search a small window around the predicted location
+    img_h, img_w = image.shape[:2]
+    t_h, t_w = template.shape[:2]
+    x, y = location
+    x0 = min(max(0, x - radius), img_w - t_w)
+    y0 = min(max(0, y - radius), img_h - t_h)
+    x1 = min(img_w, x + radius + t_w)
+    y1 = min(img_h, y + radius + t_h)
+    result = cv2.matchTemplate(image[y0:y1, x0:x1], template, method)
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    if _is_minimizing(method):
+        return (x0 + min_loc[0], y0 + min_loc[1]), float(min_val)
+    return (x0 + max_loc[0], y0 + max_loc[1]), float(max_val)
+
+
+def _coarse_level(
+    template_shape: tuple[int, int],
+    levels: int,
+    min_template_size: int,
+) -> int:
+    # the coarsest level where the template is still usable
+    level = 0
+    while (
+        level + 1 < levels
+        and min(template_shape) / 2 ** (level + 1) >= min_template_size
+    ):
+        level += 1
+    return level
+
+
+def _match_prepared(
+    pyramid: ImagePyramid,
+    level_templates: list[np.ndarray],
+    method: int,
+    top_k: int,
+) -> tuple[tuple[int, int, int, int], float]:
+    # level_templates holds the template resized for levels 0 to the coarse level
+    minimize = _is_minimizing(method)
+    level = len(level_templates) - 1
+
+    # exhaustive search at the coarse level
+    level_template = level_templates[level]
+    result = cv2.matchTemplate(pyramid[level], level_template, method)
+    l_h, l_w = level_template.shape[:2]
+    candidates = _top_peaks(
+        result,
+        top_k if level > 0 else 1,
+        (max(1, l_w // 2), max(1, l_h // 2)),
+        minimize=minimize,
+    )
+
+    # refine each candidate up to full resolution
+    best_location = (0, 0)
+    best_score = np.inf if minimize else -np.inf
+    for candidate in candidates:
+        location, score = candidate
+        for finer in range(level - 1, -1, -1):
+            location, score = _refine(
+                pyramid[finer],
+                level_templates[finer],
+                (location[0] * 2, location[1] * 2),
+                3,
+                method,
+            )
+        better = score < best_score if minimize else score > best_score
+        if better:
+            best_score = score
+            best_location = location
+
+    t_h, t_w = level_templates[0].shape[:2]
+    x, y = best_location
+    return (x, y, x + t_w, y + t_h), float(best_score)
+
+
+def match_pyramid(
+    image: np.ndarray | ImagePyramid,
+    template: np.ndarray,
+    scales: Sequence[float] = (1.0,),
+    method: int = cv2.TM_CCOEFF_NORMED,
+    levels: int = 3,
+    top_k: int = 3,
+    min_template_size: int = 12,
+    *,
+    coarse_to_fine: bool | None = None,
+) -> tuple[tuple[int, int, int, int], float]:
+    """
+    Find the best match of the template in the image over multiple scales.
+
+    With coarse to fine search, each template scale is first matched against
+    a downscaled level of the image pyramid. Only the best candidates are then
+    refined in a small window at each higher resolution level, so the cost
+    of a full resolution search is only paid for a few pixels.
+
+    Parameters
+    ----------
+    image : np.ndarray | ImagePyramid
+        The image to search for the template in.
+        Pass an ImagePyramid to reuse the pyramid across multiple templates.
+    template : np.ndarray
+        The template to search for in the image.
+    scales : Sequence[float], optional
+        The scales of the template to search for, relative to the template size.
+        Default is (1.0,).
+    method : int, optional
+        The method to use for template matching. One of cv2.TM_*.
+        Default is cv2.TM_CCOEFF_NORMED.
+    levels : int, optional
+        The number of pyramid levels to build if an image is given.
+        Default is 3.
+    top_k : int, optional
+        The number of candidates per scale to refine from the coarse level.
+        Default is 3.
+    min_template_size : int, optional
+        The smallest side length a template may be downscaled to
+        when choosing the coarse level.
+        Default is 12.
+    coarse_to_fine : bool, optional
+        Whether to search coarse to fine over the pyramid.
+        If False, every scale is matched at full resolution.
+        By default None, which uses coarse to fine search.
+
+    Returns
+    -------
+    tuple[tuple[int, int, int, int], float]
+        The bounding box of the best match in form (x1, y1, x2, y2)
+        and the score of the match.
+
+    Raises
+    ------
+    ValueError
+        If the template does not fit in the image at any of the scales.
+
+    """
+    if coarse_to_fine is None:
+        coarse_to_fine = True
+    pyramid = image if isinstance(image, ImagePyramid) else ImagePyramid(image, levels)
+    minimize = _is_minimizing(method)
+    img_h, img_w = pyramid.image.shape[:2]
+
+    best_bbox: tuple[int, int, int, int] | None = None
+    best_score = np.inf if minimize else -np.inf
+    for scale in scales:
+        scaled = _resize_template(template, scale)
+        t_h, t_w = scaled.shape[:2]
+        if t_h > img_h or t_w > img_w:
+            continue
+
+        level = _coarse_level(
+            (t_h, t_w),
+            pyramid.levels if coarse_to_fine else 1,
+            min_template_size,
+        )
+        level_templates = [
+            _resize_template(scaled, 0.5**lvl) for lvl in range(level + 1)
+        ]
+        bbox, score = _match_prepared(pyramid, level_templates, method, top_k)
+        better = score < best_score if minimize else score > best_score
+        if better:
+            best_score = score
+            best_bbox = bbox
+
+    if best_bbox is None:
+        err_msg = "Template does not fit in the image at any of the given scales."
+        raise ValueError(err_msg)
+
+    return best_bbox, float(best_score)
@@ -4,15 +4,22 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
+
+import cv2
+import numpy as np
 
 from cv2ext.bboxes import xywh_to_xyxy, xyxy_to_xywh
+from cv2ext.profiling._profiler import profiled
 
 if TYPE_CHECKING:
-    import cv2
-    import numpy as np
     from typing_extensions import Self
 
+    from cv2ext.image import FrameContext
+
+# with scale="auto", the shorter side of the target is shrunk to this size
+_AUTO_TARGET_SIDE = 64
+
 
 class AbstractTracker(ABC):
     @abstractmethod
@@ -28,20 +35,87 @@ class CVTrackerInterface(AbstractTracker):
     def __init__(
         self: Self,
         tracker: cv2.Tracker,
+        *,
+        scale: float | Literal["auto"] | None = None,
+        max_side: int | None = None,
     ) -> None:
+        if isinstance(scale, str):
+            if scale != "auto":
+                err_msg = f"scale must be a float or 'auto', got {scale!r}."
+                raise ValueError(err_msg)
+        elif scale is not None and not 0.0 < scale <= 1.0:
+            err_msg = f"scale must be in (0, 1], got {scale}."
+            raise ValueError(err_msg)
+        if max_side is not None and max_side < 1:
+            err_msg = f"max_side must be at least 1, got {max_side}."
+            raise ValueError(err_msg)
         self._tracker: cv2.Tracker = tracker
+        self._scale = scale
+        self._max_side = max_side
+        self._size: tuple[int, int] | None = None
+        self._factors = (1.0, 1.0)
+
+    def _choose_scale(
+        self: Self,
+        width: int,
+        height: int,
+        bbox: tuple[int, int, int, int],
+    ) -> float:
+        # the smallest of the requested scales, never upscaling
+        scale = 1.0
+        if self._scale == "auto":
+            # keep the shorter side of the target at a trackable size
+            side = min(bbox[2] - bbox[0], bbox[3] - bbox[1])
+            if side > 0:
+                scale = min(scale, _AUTO_TARGET_SIDE / side)
+        elif self._scale is not None:
+            scale = min(scale, self._scale)
+        if self._max_side is not None:
+            scale = min(scale, self._max_side / max(width, height))
+        return scale
+
+    def _frame(self: Self, image: np.ndarray | FrameContext) -> np.ndarray:
+        # a FrameContext shares one resized frame between all trackers
+        if self._size is None:
+            return image if isinstance(image, np.ndarray) else image.image
+        if isinstance(image, np.ndarray):
+            return cv2.resize(image, self._size, interpolation=cv2.INTER_AREA)
+        return image.resized(self._size, cv2.INTER_AREA)
 
-    def _init(self: Self, image: np.ndarray, bbox: tuple[int, int, int, int]) -> None:
+    def _init(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        bbox: tuple[int, int, int, int],
+    ) -> None:
         img_shape = image.shape[:2]
         self._image_shape = (img_shape[1], img_shape[0])
-        self._tracker.init(image, xyxy_to_xywh(bbox))
+        width, height = self._image_shape
+        scale = self._choose_scale(width, height, bbox)
+        if scale < 1.0:
+            self._size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            self._factors = (self._size[0] / width, self._size[1] / height)
+            fx, fy = self._factors
+            x1, y1 = round(bbox[0] * fx), round(bbox[1] * fy)
+            bbox = (
+                x1,
+                y1,
+                max(x1 + 1, round(bbox[2] * fx)),
+                max(y1 + 1, round(bbox[3] * fy)),
+            )
+        else:
+            self._size = None
+            self._factors = (1.0, 1.0)
+        self._tracker.init(self._frame(image), xyxy_to_xywh(bbox))
 
+    @profiled("CVTrackerInterface.update")
     def _update(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
     ) -> tuple[bool, tuple[int, int, int, int]]:
-        retval, (x, y, w, h) = self._tracker.update(image)
-        bbox = (int(x), int(y), int(w), int(h))
+        retval, (x, y, w, h) = self._tracker.update(self._frame(image))
+        # map the box from the tracked frame back to full resolution
+        fx, fy = self._factors
+        bbox = (int(x / fx), int(y / fy), int(w / fx), int(h / fy))
         xyxy = xywh_to_xyxy(bbox)
         # xyxy = constrain(xyxy, self._image_shape)
         return retval, xyxy
@@ -62,3 +136,25 @@ class AbstractMultiTracker(ABC):
         image: np.ndarray,
     ) -> list[tuple[bool, tuple[int, int, int, int]]]:
         pass
+
+    @property
+    @abstractmethod
+    def ids(self: Self) -> list[int]:
+        pass
+
+    @abstractmethod
+    def add(self: Self, image: np.ndarray, bbox: tuple[int, int, int, int]) -> int:
+        pass
+
+    @abstractmethod
+    def remove(self: Self, track_id: int) -> None:
+        pass
+
+    @abstractmethod
+    def reinit(
+        self: Self,
+        image: np.ndarray,
+        track_id: int,
+        bbox: tuple[int, int, int, int],
+    ) -> None:
+        pass
@@ -3,19 +3,33 @@
 # MIT License
 from __future__ import annotations
 
-import atexit
-import contextlib
-from queue import Empty, Queue
-from threading import Event, Thread
-from typing import TYPE_CHECKING
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from ._interface import AbstractMultiTracker, AbstractTracker
+from cv2ext.image import FrameContext
+from cv2ext.profiling._profiler import profiled
+from cv2ext.profiling._queue import QueueStats, _QueueMonitor
+
+from ._interface import AbstractMultiTracker, AbstractTracker, CVTrackerInterface
 from ._tracker_type import TrackerType
+from .trackers import KLTTracker
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from types import TracebackType
+
     import numpy as np
     from typing_extensions import Self
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# trackers which accept a FrameContext, sharing its views between trackers
+_CONTEXT_TRACKERS = (CVTrackerInterface, KLTTracker)
+
 
 class MultiTracker(AbstractMultiTracker):
     """Handles multiple trackers for tracking multiple objects in a video."""
@@ -25,6 +39,8 @@ class MultiTracker(AbstractMultiTracker):
         tracker_type: TrackerType | type[AbstractTracker] = TrackerType.KCF,
         *,
         use_threads: bool | None = None,
+        num_workers: int | None = None,
+        tracker_kwargs: dict[str, Any] | None = None,
     ) -> None:
         """
         Create a new MultiTracker object.
@@ -36,20 +52,57 @@ class MultiTracker(AbstractMultiTracker):
         use_threads : bool, optional
             Whether to use threading for tracking, by default None.
             If None, the tracker will use threading.
+        num_workers : int, optional
+            The number of worker threads, each updating a chunk of the trackers.
+            By default None, which uses os.cpu_count().
+            Ignored if not using threads.
+        tracker_kwargs : dict[str, Any], optional
+            Keyword arguments given to each tracker when created,
+            such as scale or max_side for the OpenCV trackers.
+            By default None, which uses the defaults of the tracker.
 
         """
         if use_threads is None:
             use_threads = True
 
-        self._tracker: AbstractMultiTracker = (
-            _ThreadedMultiTracker(tracker_type)
+        self._tracker: _SerialMultiTracker = (
+            _PooledMultiTracker(tracker_type, num_workers, tracker_kwargs)
             if use_threads
-            else _SerialMultiTracker(tracker_type)
+            else _SerialMultiTracker(tracker_type, tracker_kwargs)
         )
 
+    def __enter__(self: Self) -> Self:
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self: Self) -> int:
+        return len(self._tracker)
+
+    @property
+    def ids(self: Self) -> list[int]:
+        """
+        The ids of the tracked targets.
+
+        Returns
+        -------
+        list[int]
+            The id of each target, in the same order as the results of update.
+            Trackers created by init are numbered in order from 0, and ids
+            are never reused while the MultiTracker exists.
+
+        """
+        return self._tracker.ids
+
     def init(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         bboxes: list[tuple[int, int, int, int]],
     ) -> None:
         """
@@ -57,7 +110,7 @@ class MultiTracker(AbstractMultiTracker):
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The first frame of the video.
         bboxes : list[tuple[int, int, int, int]]
             The initial bounding boxes of the targets.
@@ -66,152 +119,124 @@ class MultiTracker(AbstractMultiTracker):
         """
         self._tracker.init(image, bboxes)
 
+    @profiled()
     def update(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
     ) -> list[tuple[bool, tuple[int, int, int, int]]]:
         """
         Update the trackers with the next frame of the video.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The next frame of the video.
 
         Returns
         -------
         list[tuple[bool, tuple[int, int, int, int]]]
-            The updated success values and bounding boxes of the targets.
+            The updated success values and bounding boxes of the targets,
+            in the order of ids.
             Each bbox is represented as (x1, y1, x2, y2).
 
         """
         return self._tracker.update(image)
 
+    def add(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        bbox: tuple[int, int, int, int],
+    ) -> int:
+        """
+        Start tracking an additional target.
+
+        Only the new tracker is initialized, existing trackers are kept.
+
+        Parameters
+        ----------
+        image : np.ndarray | FrameContext
+            The current frame of the video.
+        bbox : tuple[int, int, int, int]
+            The bounding box of the new target.
+            Represented as (x1, y1, x2, y2).
 
-class _ThreadedMultiTracker(AbstractMultiTracker):
-    """Threaded version of MultiTracker."""
+        Returns
+        -------
+        int
+            The id of the new tracker.
 
-    def __init__(self: Self, tracker_type: TrackerType | type[AbstractTracker]) -> None:
         """
-        Create a new ThreadedMultiTracker object.
+        return self._tracker.add(image, bbox)
+
+    def remove(self: Self, track_id: int) -> None:
+        """
+        Stop tracking a target.
 
         Parameters
         ----------
-        tracker_type : TrackerType | type[AbstractTracker]
-            The type of tracker to use for tracking objects.
+        track_id : int
+            The id of the tracker to remove.
 
         """
-        self._tracker_type = (
-            tracker_type.value
-            if isinstance(tracker_type, TrackerType)
-            else tracker_type
-        )
-        self._trackers: list[AbstractTracker] = []
-        self._stop_event = Event()
-        self._threads: list[Thread] = []
-        self._in_queues: list[Queue[np.ndarray]] = []
-        self._out_queues: list[Queue[tuple[bool, tuple[int, int, int, int]]]] = []
-
-        atexit.register(self._reset)
-
-    def _reset(self: Self) -> None:
-        self._stop_event.set()
-        for thread in self._threads:
-            thread.join()
-        self._stop_event.clear()
-        self._trackers = []
-        self._in_queues = []
-        self._out_queues = []
-        self._threads = []
-
-    def _thread_target(
-        self: Self,
-        initial_image: np.ndarray,
-        initial_bbox: tuple[int, int, int, int],
-        thread_id: int,
-    ) -> None:
-        tracker = self._tracker_type()
-        tracker.init(initial_image, initial_bbox)
-        while not self._stop_event.is_set():
-            with contextlib.suppress(Empty):
-                image = self._in_queues[thread_id].get(timeout=0.1)
-                data = tracker.update(image)
-                self._out_queues[thread_id].put_nowait(data)
+        self._tracker.remove(track_id)
 
-    def init(
+    def reinit(
         self: Self,
-        image: np.ndarray,
-        bboxes: list[tuple[int, int, int, int]],
+        image: np.ndarray | FrameContext,
+        track_id: int,
+        bbox: tuple[int, int, int, int],
     ) -> None:
         """
-        Initialize the trackers with the initial bounding boxes.
+        Restart tracking a target from a new bounding box.
+
+        Only this target's tracker is initialized again, keeping its id.
 
         Parameters
         ----------
-        image : np.ndarray
-            The first frame of the video.
-        bboxes : list[tuple[int, int, int, int]]
-            The initial bounding boxes of the targets.
-            Each bbox is represented as (x1, y1, x2, y2).
+        image : np.ndarray | FrameContext
+            The current frame of the video.
+        track_id : int
+            The id of the tracker to restart.
+        bbox : tuple[int, int, int, int]
+            The new bounding box of the target.
+            Represented as (x1, y1, x2, y2).
 
         """
-        self._reset()
-        for idx, bbox in enumerate(bboxes):
-            in_queue: Queue[np.ndarray] = Queue()
-            out_queue: Queue[tuple[bool, tuple[int, int, int, int]]] = Queue()
-            self._in_queues.append(in_queue)
-            self._out_queues.append(out_queue)
-            thread = Thread(
-                target=self._thread_target,
-                args=(image, bbox, idx),
-                daemon=True,
-            )
-            thread.start()
-            self._threads.append(thread)
+        self._tracker.reinit(image, track_id, bbox)
 
-    def update(
-        self: Self,
-        image: np.ndarray,
-    ) -> list[tuple[bool, tuple[int, int, int, int]]]:
+    def stats(self: Self) -> QueueStats:
         """
-        Update the trackers with the next frame of the video.
+        Get the statistics of the frames given to the trackers.
 
-        Parameters
-        ----------
-        image : np.ndarray
-            The next frame of the video.
+        Each call of update is one frame, init is not counted.
+        With threads, each frame is split into chunks for the workers,
+        so the depth is the number of workers given a chunk, out of a
+        capacity of num_workers. The producer wait is the time spent
+        waiting on the workers, and the consumer wait is the mean time
+        each worker was idle, including between frames.
+        Without threads, only the number of frames and fps are counted.
 
         Returns
         -------
-        list[tuple[bool, tuple[int, int, int, int]]]
-            The updated success values and bounding boxes of the targets.
-            Each bbox is represented as (x1, y1, x2, y2).
-
-        Raises
-        ------
-        RuntimeError
-            If a thread has been closed before an update call.
-        RuntimeError
-            If a queue times out fetching an update.
+        QueueStats
+            The statistics of the frames given to the trackers.
 
         """
-        for in_queue, thread in zip(self._in_queues, self._threads):
-            if not thread.is_alive():
-                err_msg = "Thread closed, cannot update tracking."
-                raise RuntimeError(err_msg)
-            in_queue.put(image)
+        return self._tracker.stats()
 
-        try:
-            return [out_queue.get(timeout=1.0) for out_queue in self._out_queues]
-        except Empty as e:
-            err_msg = "Could not get results from a thread, most likely crashed."
-            raise RuntimeError(err_msg) from e
+    def close(self: Self) -> None:
+        """Shutdown the worker threads, if any."""
+        self._tracker.close()
 
 
 class _SerialMultiTracker(AbstractMultiTracker):
     """Serial version of MultiTracker."""
 
-    def __init__(self: Self, tracker_type: TrackerType | type[AbstractTracker]) -> None:
+    def __init__(
+        self: Self,
+        tracker_type: TrackerType | type[AbstractTracker],
+        tracker_kwargs: dict[str, Any] | None = None,
+    ) -> None:
         """
         Create a new SerialMultiTracker object.
 
@@ -219,6 +244,8 @@ class _SerialMultiTracker(AbstractMultiTracker):
         ----------
         tracker_type : TrackerType | type[AbstractTracker]
             The type of tracker to use for tracking objects.
+        tracker_kwargs : dict[str, Any], optional
+            Keyword arguments given to each tracker when created.
 
         """
         self._tracker_type = (
@@ -226,11 +253,60 @@ class _SerialMultiTracker(AbstractMultiTracker):
             if isinstance(tracker_type, TrackerType)
             else tracker_type
         )
-        self._trackers: list[AbstractTracker] = []
+        self._tracker_kwargs = tracker_kwargs or {}
+        self._use_context = isinstance(self._tracker_type, type) and issubclass(
+            self._tracker_type,
+            _CONTEXT_TRACKERS,
+        )
+        self._trackers: dict[int, AbstractTracker] = {}
+        self._next_id = 0
+        self._monitor = _QueueMonitor()
+
+    def __len__(self: Self) -> int:
+        return len(self._trackers)
+
+    @property
+    def ids(self: Self) -> list[int]:
+        return list(self._trackers)
+
+    def _map(
+        self: Self,
+        func: Callable[[_T], _R],
+        items: Sequence[_T],
+        *,
+        record: bool = False,
+    ) -> list[_R]:
+        # only update records a frame, init creates the trackers
+        results = [func(item) for item in items]
+        if record:
+            self._monitor.produced += 1
+            self._monitor.consume(0, 0)
+        return results
+
+    def _frame(
+        self: Self,
+        image: np.ndarray | FrameContext,
+    ) -> np.ndarray | FrameContext:
+        # wrap the frame once, so views such as a downscaled copy are
+        # shared by every tracker, workers needing a view being computed
+        # by another wait on the lock of the FrameContext
+        if self._use_context:
+            return image if isinstance(image, FrameContext) else FrameContext(image)
+        return image.image if isinstance(image, FrameContext) else image
+
+    def _create(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        bbox: tuple[int, int, int, int],
+    ) -> AbstractTracker:
+        tracker: AbstractTracker = self._tracker_type(**self._tracker_kwargs)
+        # only trackers in _CONTEXT_TRACKERS are given a FrameContext
+        tracker.init(image, bbox)  # type: ignore[arg-type]
+        return tracker
 
     def init(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         bboxes: list[tuple[int, int, int, int]],
     ) -> None:
         """
@@ -238,27 +314,28 @@ class _SerialMultiTracker(AbstractMultiTracker):
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The first frame of the video.
         bboxes : list[tuple[int, int, int, int]]
             The initial bounding boxes of the targets.
             Each bbox is represented as (x1, y1, x2, y2).
 
         """
-        self._trackers = [self._tracker_type() for _ in bboxes]
-        for tracker, bbox in zip(self._trackers, bboxes):
-            tracker.init(image, bbox)
+        frame = self._frame(image)
+        trackers = self._map(lambda bbox: self._create(frame, bbox), bboxes)
+        self._trackers = dict(enumerate(trackers))
+        self._next_id = len(trackers)
 
     def update(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
     ) -> list[tuple[bool, tuple[int, int, int, int]]]:
         """
         Update the trackers with the next frame of the video.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The next frame of the video.
 
         Returns
@@ -268,4 +345,136 @@ class _SerialMultiTracker(AbstractMultiTracker):
             Each bbox is represented as (x1, y1, x2, y2).
 
         """
-        return [tracker.update(image) for tracker in self._trackers]
+        frame = self._frame(image)
+        return self._map(
+            lambda tracker: tracker.update(frame),  # type: ignore[arg-type]
+            list(self._trackers.values()),
+            record=True,
+        )
+
+    def add(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        bbox: tuple[int, int, int, int],
+    ) -> int:
+        track_id = self._next_id
+        self._trackers[track_id] = self._create(self._frame(image), bbox)
+        self._next_id += 1
+        return track_id
+
+    def remove(self: Self, track_id: int) -> None:
+        del self._trackers[track_id]
+
+    def reinit(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        track_id: int,
+        bbox: tuple[int, int, int, int],
+    ) -> None:
+        if track_id not in self._trackers:
+            raise KeyError(track_id)
+        # some OpenCV trackers cannot be initialized twice, create a new one
+        self._trackers[track_id] = self._create(self._frame(image), bbox)
+
+    def stats(self: Self) -> QueueStats:
+        return self._monitor.stats(0)
+
+    def close(self: Self) -> None:
+        pass
+
+
+class _PooledMultiTracker(_SerialMultiTracker):
+    """Threaded version of MultiTracker, using a fixed pool of workers."""
+
+    def __init__(
+        self: Self,
+        tracker_type: TrackerType | type[AbstractTracker],
+        num_workers: int | None = None,
+        tracker_kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Create a new PooledMultiTracker object.
+
+        Parameters
+        ----------
+        tracker_type : TrackerType | type[AbstractTracker]
+            The type of tracker to use for tracking objects.
+        num_workers : int, optional
+            The number of worker threads.
+            By default None, which uses os.cpu_count().
+        tracker_kwargs : dict[str, Any], optional
+            Keyword arguments given to each tracker when created.
+
+        Raises
+        ------
+        ValueError
+            If num_workers is less than 1.
+
+        """
+        super().__init__(tracker_type, tracker_kwargs)
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        if num_workers < 1:
+            err_msg = f"num_workers must be at least 1, got {num_workers}."
+            raise ValueError(err_msg)
+        self._num_workers = num_workers
+        self._monitor = _QueueMonitor(num_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_workers,
+            thread_name_prefix="MultiTracker",
+        )
+
+    def _map(
+        self: Self,
+        func: Callable[[_T], _R],
+        items: Sequence[_T],
+        *,
+        record: bool = False,
+    ) -> list[_R]:
+        # one task per contiguous chunk of items, each worker gets the
+        # same frame reference and runs its chunk serially
+        t0 = time.perf_counter_ns()
+        if len(items) <= 1:
+            results, busy_ns = self._run_chunk(func, items)
+            num_chunks = 0
+        else:
+            size = math.ceil(len(items) / self._num_workers)
+            futures = [
+                self._executor.submit(
+                    self._run_chunk,
+                    func,
+                    items[start : start + size],
+                )
+                for start in range(0, len(items), size)
+            ]
+            results, busy_ns = [], 0
+            for future in futures:
+                chunk_results, chunk_ns = future.result()
+                results.extend(chunk_results)
+                busy_ns += chunk_ns
+            num_chunks = len(futures)
+        if not record:
+            return results
+        self._monitor.produced += 1
+        if num_chunks:
+            self._monitor.producer_wait_ns += time.perf_counter_ns() - t0
+        # workers are idle whenever they are not running a chunk, since
+        # the end of the previous frame, the counters are only written here
+        idle_ns = self._num_workers * (time.perf_counter_ns() - self._monitor.last_ns)
+        self._monitor.consume(
+            max(idle_ns - busy_ns, 0) // self._num_workers,
+            num_chunks,
+        )
+        return results
+
+    @staticmethod
+    def _run_chunk(
+        func: Callable[[_T], _R],
+        chunk: Sequence[_T],
+    ) -> tuple[list[_R], int]:
+        t0 = time.perf_counter_ns()
+        results = [func(item) for item in chunk]
+        return results, time.perf_counter_ns() - t0
+
+    def close(self: Self) -> None:
+        self._executor.shutdown(wait=True)
@@ -3,7 +3,7 @@
 # MIT License
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from ._interface import AbstractTracker
 from ._tracker_type import TrackerType
@@ -16,7 +16,11 @@ if TYPE_CHECKING:
 class Tracker(AbstractTracker):
     """Handles tracking an object in a video."""
 
-    def __init__(self: Self, tracker: TrackerType = TrackerType.MIL) -> None:
+    def __init__(
+        self: Self,
+        tracker: TrackerType = TrackerType.MIL,
+        tracker_kwargs: dict[str, Any] | None = None,
+    ) -> None:
         """
         Create a new Tracker object.
 
@@ -24,9 +28,13 @@ class Tracker(AbstractTracker):
         ----------
         tracker : TrackerType, optional
             The type of tracker to use for tracking objects, by default TrackerType.MIL.
+        tracker_kwargs : dict[str, Any], optional
+            Keyword arguments given to the tracker when created,
+            such as scale or max_side for the OpenCV trackers.
+            By default None, which uses the defaults of the tracker.
 
         """
-        self._tracker = tracker.value()
+        self._tracker = tracker.value(**(tracker_kwargs or {}))
 
     def init(self: Self, image: np.ndarray, bbox: tuple[int, int, int, int]) -> None:
         """
@@ -14,7 +14,7 @@ from .cv_trackers import (
     MOSSETracker,
     TLDTracker,
 )
-from .trackers import KLTMultiTracker, KLTTracker
+from .trackers import KLTMultiTracker, KLTTracker, TemplateTracker
 
 
 class TrackerType(Enum):
@@ -28,6 +28,7 @@ class TrackerType(Enum):
     MOSSE = MOSSETracker
     TLD = TLDTracker
     KLT = KLTTracker
+    TEMPLATE = TemplateTracker
 
 
 class MultiTrackerType(Enum):
@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 import cv2
 
@@ -14,36 +14,62 @@ if TYPE_CHECKING:
     import numpy as np
     from typing_extensions import Self
 
+    from cv2ext.image import FrameContext
+
 _log = logging.getLogger(__name__)
 
 
 class CSRTTracker(CVTrackerInterface):
     """A class for tracking objects in videos using the CSRT tracker."""
 
-    def __init__(self: Self) -> None:
+    def __init__(
+        self: Self,
+        *,
+        scale: float | Literal["auto"] | None = None,
+        max_side: int | None = None,
+    ) -> None:
         """
         Create a new CSRTTracker object.
 
+        Parameters
+        ----------
+        scale : float | Literal["auto"], optional
+            The factor to downscale frames by before tracking, in (0, 1].
+            If "auto", the scale is chosen from the size of the target
+            when initialized, so large targets are tracked at lower
+            resolution. Bounding boxes are always in full resolution.
+            By default None, which tracks at full resolution.
+        max_side : int, optional
+            The maximum length of the longer side of the tracked frame.
+            Combined with scale, the smaller resulting scale is used.
+            By default None, which does not limit the frame size.
+
         Raises
         ------
         ImportError
             If CSRT tracker creation function/class cannot be found.
+        ValueError
+            If scale or max_side is out of range.
 
         """
         try:
-            super().__init__(cv2.TrackerCSRT.create())  # type: ignore[attr-defined]
+            super().__init__(cv2.TrackerCSRT.create(), scale=scale, max_side=max_side)  # type: ignore[attr-defined]
         except AttributeError as e:
             err_msg = "Cannot get CSRT tracker from cv2. You may need to install opencv-contrib-python"
             _log.error(err_msg)
             raise ImportError from e
 
-    def init(self: Self, image: np.ndarray, bbox: tuple[int, int, int, int]) -> None:
+    def init(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        bbox: tuple[int, int, int, int],
+    ) -> None:
         """
         Initialize the tracker with an image and bounding box.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The image to use for tracking.
         bbox : tuple[int, int, int, int]
             The bounding box of the object to track.
@@ -53,13 +79,16 @@ class CSRTTracker(CVTrackerInterface):
         """
         super()._init(image, bbox)
 
-    def update(self: Self, image: np.ndarray) -> tuple[bool, tuple[int, int, int, int]]:
+    def update(
+        self: Self,
+        image: np.ndarray | FrameContext,
+    ) -> tuple[bool, tuple[int, int, int, int]]:
         """
         Update the tracker with a new image.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The new image to use for tracking.
 
         Returns
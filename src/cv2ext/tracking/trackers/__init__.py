@@ -10,14 +10,22 @@ Classes
     A class for tracking objects in videos using the KLT algorithm.
 :class:`KLTMultiTracker`
     A class for tracking multi objects in videos using the KLT algorithm.
+:class:`SortTracker`
+    A class for tracking many objects from detections, as in SORT.
+:class:`TemplateTracker`
+    A class for tracking objects in videos using template matching.
 
 """
 
 from __future__ import annotations
 
 from ._klt import KLTMultiTracker, KLTTracker
+from ._sort import SortTracker
+from ._template import TemplateTracker
 
 __all__ = [
     "KLTMultiTracker",
     "KLTTracker",
+    "SortTracker",
+    "TemplateTracker",
 ]
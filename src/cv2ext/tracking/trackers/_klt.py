@@ -10,14 +10,106 @@ import cv2
 import numpy as np
 
 from cv2ext.bboxes import constrain
+from cv2ext.profiling._profiler import profiled
 from cv2ext.tracking._interface import AbstractMultiTracker, AbstractTracker
 
 if TYPE_CHECKING:
     from typing_extensions import Self
 
+    from cv2ext.image import FrameContext
+
+# parameters of the Shi-Tomasi corner detection
+_QUALITY_LEVEL = 0.01
+_MIN_DISTANCE = 5
+
+
+def _detect_keypoints(
+    image: np.ndarray,
+    bbox: tuple[int, int, int, int],
+    max_keypoints: int,
+) -> np.ndarray:
+    # detect corners only inside the box, on a view of the region
+    x1, y1, x2, y2 = bbox
+    if x2 - x1 < 3 or y2 - y1 < 3:
+        return np.zeros((0, 2), dtype=np.float32)
+    corners = cv2.goodFeaturesToTrack(
+        image[y1:y2, x1:x2],
+        max_keypoints,
+        _QUALITY_LEVEL,
+        _MIN_DISTANCE,
+    )
+    if corners is None:
+        return np.zeros((0, 2), dtype=np.float32)
+    keypoints: np.ndarray = corners.reshape(-1, 2) + np.array(
+        [x1, y1],
+        dtype=np.float32,
+    )
+    return keypoints
+
+
+def _group_median(
+    values: np.ndarray,
+    owners: np.ndarray,
+    num_groups: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    # median of the values owned by each group, without a loop over groups
+    counts = np.bincount(owners, minlength=num_groups)
+    medians = np.zeros(num_groups, dtype=np.float64)
+    found = counts > 0
+    if not found.any():
+        return medians, counts
+    ordered = values[np.lexsort((values, owners))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[found]
+    lower = ordered[starts + (counts[found] - 1) // 2]
+    upper = ordered[starts + counts[found] // 2]
+    medians[found] = (lower + upper) / 2
+    return medians, counts
+
+
+def _median_flow(
+    boxes: np.ndarray,
+    prev_points: np.ndarray,
+    points: np.ndarray,
+    owners: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    # move each box by the median displacement of its keypoints and scale it
+    # by the median change in distance of its keypoints to their median
+    num_boxes = len(boxes)
+    dx, counts = _group_median(points[:, 0] - prev_points[:, 0], owners, num_boxes)
+    dy, _ = _group_median(points[:, 1] - prev_points[:, 1], owners, num_boxes)
+
+    prev_center = np.stack(
+        [
+            _group_median(prev_points[:, 0], owners, num_boxes)[0],
+            _group_median(prev_points[:, 1], owners, num_boxes)[0],
+        ],
+        axis=1,
+    )
+    center = prev_center + np.stack([dx, dy], axis=1)
+    prev_dist = np.linalg.norm(prev_points - prev_center[owners], axis=1)
+    dist = np.linalg.norm(points - center[owners], axis=1)
+    spread = prev_dist > 1.0
+    ratio, ratio_counts = _group_median(
+        dist[spread] / prev_dist[spread],
+        owners[spread],
+        num_boxes,
+    )
+    scale = np.where(ratio_counts > 0, ratio, 1.0)
+
+    cx = (boxes[:, 0] + boxes[:, 2]) / 2 + dx
+    cy = (boxes[:, 1] + boxes[:, 3]) / 2 + dy
+    half_w = (boxes[:, 2] - boxes[:, 0]) * scale / 2
+    half_h = (boxes[:, 3] - boxes[:, 1]) * scale / 2
+    new_boxes = np.stack([cx - half_w, cy - half_h, cx + half_w, cy + half_h], axis=1)
+    return np.where((counts > 0)[:, None], new_boxes, boxes), counts > 0
+
 
 class KLTTracker(AbstractTracker):
-    """Class for tracking objects with the KLT algorithm."""
+    """
+    Class for tracking objects with the KLT algorithm.
+
+    A single box version of :class:`KLTMultiTracker`.
+    """
 
     def __init__(
         self: Self,
@@ -29,6 +121,9 @@ class KLTTracker(AbstractTracker):
             10,
             0.03,
         ),
+        redetect_interval: int = 10,
+        min_keypoints: int = 10,
+        fb_threshold: float | None = 1.0,
     ) -> None:
         """
         Create a new KLTTracker object.
@@ -36,7 +131,7 @@ class KLTTracker(AbstractTracker):
         Parameters
         ----------
         num_features : int
-            The number of features to track.
+            The maximum number of keypoints to track.
             By default, this is set to 500.
         window_size : tuple[int, int]
             The size of the window used for tracking.
@@ -47,58 +142,59 @@ class KLTTracker(AbstractTracker):
         criteria : tuple[int, int, float]
             The criteria used for tracking.
             By default, this is set to (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03).
+        redetect_interval : int
+            The number of updates between re-detecting keypoints in the box.
+            By default, this is set to 10. If 0, keypoints are only
+            re-detected when fewer than min_keypoints remain.
+        min_keypoints : int
+            Keypoints are re-detected as soon as fewer than this remain.
+            By default, this is set to 10.
+        fb_threshold : float, optional
+            The maximum forward-backward error, in pixels, of a keypoint.
+            Keypoints which do not track back to their start are dropped.
+            By default, this is set to 1.0. If None, no filtering is done.
 
         """
-        self._window_size = window_size
-        self._max_level = max_level
-        self._criteria = criteria
-        self._lk_params = {
-            "winSize": self._window_size,
-            "maxLevel": self._max_level,
-            "criteria": self._criteria,
-        }
-        self._orb: cv2.ORB = cv2.ORB_create(nfeatures=num_features)  # type: ignore[attr-defined]
-
-        # state storage
-        self._prev_frame: np.ndarray = np.zeros((1, 1))
-        self._prev_bbox: tuple[int, int, int, int] = (0, 0, 0, 0)
-        self._prev_keypoints: np.ndarray = np.zeros((1, 1))
-
-    def _detect_keypoints(self: Self, image: np.ndarray) -> np.ndarray:
-        keypoints = self._orb.detect(image, None)
-        np_keypoints: np.ndarray = np.asarray(
-            [kp.pt for kp in keypoints],
-            dtype=np.float32,
+        self._tracker = KLTMultiTracker(
+            num_features=num_features,
+            window_size=window_size,
+            max_level=max_level,
+            criteria=criteria,
+            redetect_interval=redetect_interval,
+            min_keypoints=min_keypoints,
+            fb_threshold=fb_threshold,
         )
-        return np_keypoints
 
-    def init(self: Self, image: np.ndarray, bbox: tuple[int, int, int, int]) -> None:
+    def init(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        bbox: tuple[int, int, int, int],
+    ) -> None:
         """
         Initialize the tracker.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The image to track the object in.
         bbox : tuple[int, int, int, int]
             The bounding box of the object to track.
             In format: (x1, y1, x2, y2)
 
         """
-        if len(image.shape) == 3 and image.shape[2] == 3:
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        height, width = image.shape[:2]
-        self._prev_bbox = constrain(bbox, (width, height))
-        self._prev_frame = image
-        self._prev_keypoints = self._detect_keypoints(image)
+        self._tracker.init(image, [bbox])
 
-    def update(self: Self, image: np.ndarray) -> tuple[bool, tuple[int, int, int, int]]:
+    @profiled()
+    def update(
+        self: Self,
+        image: np.ndarray | FrameContext,
+    ) -> tuple[bool, tuple[int, int, int, int]]:
         """
         Update the tracker.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The image to track the object in.
 
         Returns
@@ -110,28 +206,18 @@ class KLTTracker(AbstractTracker):
             In format: (x1, y1, x2, y2)
 
         """
-        if len(image.shape) == 3 and image.shape[2] == 3:
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        data = cv2.calcOpticalFlowPyrLK(  # type: ignore[call-overload]
-            self._prev_frame,
-            image,
-            self._prev_keypoints,
-            None,
-            **self._lk_params,
-        )
-        current_keypoints = data[0]
-        status: np.ndarray = data[1]
-        mask = status.ravel() == 1
-        current_keypoints = current_keypoints[mask]
-        x, y, w, h = cv2.boundingRect(current_keypoints)
-        bbox = (x, y, x + w, y + h)
-        self._prev_frame = image
-        self._prev_keypoints = current_keypoints
-        return True, bbox
+        return self._tracker.update(image)[0]
 
 
 class KLTMultiTracker(AbstractMultiTracker):
-    """Class for tracking objects with the KLT algorithm."""
+    """
+    Class for tracking objects with the KLT algorithm.
+
+    Keypoints are detected inside each box, tracked with one optical
+    flow call per frame, and filtered by their forward-backward error.
+    Each box is moved and scaled by the median motion of its keypoints,
+    and keypoints are periodically re-detected to keep tracks alive.
+    """
 
     def __init__(
         self: Self,
@@ -143,6 +229,9 @@ class KLTMultiTracker(AbstractMultiTracker):
             10,
             0.03,
         ),
+        redetect_interval: int = 10,
+        min_keypoints: int = 10,
+        fb_threshold: float | None = 1.0,
     ) -> None:
         """
         Create a new KLTMultiTracker object.
@@ -150,7 +239,7 @@ class KLTMultiTracker(AbstractMultiTracker):
         Parameters
         ----------
         num_features : int
-            The number of features to track.
+            The maximum number of keypoints to track per box.
             By default, this is set to 750.
         window_size : tuple[int, int]
             The size of the window used for tracking.
@@ -161,8 +250,34 @@ class KLTMultiTracker(AbstractMultiTracker):
         criteria : tuple[int, int, float]
             The criteria used for tracking.
             By default, this is set to (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03).
+        redetect_interval : int
+            The number of updates between re-detecting keypoints in every box.
+            By default, this is set to 10. If 0, keypoints are only
+            re-detected when fewer than min_keypoints remain in a box.
+        min_keypoints : int
+            Keypoints of a box are re-detected as soon as fewer than this remain.
+            By default, this is set to 10.
+        fb_threshold : float, optional
+            The maximum forward-backward error, in pixels, of a keypoint.
+            Keypoints which do not track back to their start are dropped.
+            By default, this is set to 1.0. If None, no filtering is done.
+
+        Raises
+        ------
+        ValueError
+            If num_features is less than 1 or redetect_interval is negative.
 
         """
+        if num_features < 1:
+            err_msg = f"num_features must be at least 1, got {num_features}."
+            raise ValueError(err_msg)
+        if redetect_interval < 0:
+            err_msg = (
+                f"redetect_interval must be non-negative, got {redetect_interval}."
+            )
+            raise ValueError(err_msg)
+
+        self._num_features = num_features
         self._window_size = window_size
         self._max_level = max_level
         self._criteria = criteria
@@ -171,24 +286,99 @@ class KLTMultiTracker(AbstractMultiTracker):
             "maxLevel": self._max_level,
             "criteria": self._criteria,
         }
-        self._orb: cv2.ORB = cv2.ORB_create(nfeatures=num_features)  # type: ignore[attr-defined]
+        self._redetect_interval = redetect_interval
+        self._min_keypoints = min_keypoints
+        self._fb_threshold = fb_threshold
 
         # state storage
+        # keypoints of all boxes are stored in one array, with the index
+        # of the box owning each keypoint, so optical flow is run once
         self._prev_frame: np.ndarray = np.zeros((1, 1))
         self._prev_bboxes: list[tuple[int, int, int, int]] = []
-        self._prev_keypoints: list[np.ndarray] = []
+        self._boxes: np.ndarray = np.zeros((0, 4), dtype=np.float64)
+        self._prev_keypoints: np.ndarray = np.zeros((0, 2), dtype=np.float32)
+        self._owners: np.ndarray = np.zeros(0, dtype=np.intp)
+        self._num_updates = 0
+        self._ids: list[int] = []
+        self._next_id = 0
+
+    @property
+    def ids(self: Self) -> list[int]:
+        """
+        The ids of the tracked objects.
+
+        Returns
+        -------
+        list[int]
+            The id of each object, in the same order as the results of update.
+            Objects from init are numbered in order from 0, and ids
+            are never reused while the tracker exists.
 
-    def _detect_keypoints(self: Self, image: np.ndarray) -> np.ndarray:
-        keypoints = self._orb.detect(image, None)
-        np_keypoints: np.ndarray = np.asarray(
-            [kp.pt for kp in keypoints],
-            dtype=np.float32,
+        """
+        return list(self._ids)
+
+    @staticmethod
+    def _to_gray(image: np.ndarray | FrameContext) -> np.ndarray:
+        # a FrameContext shares its grayscale view with other consumers
+        if not isinstance(image, np.ndarray):
+            return image.gray
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+
+    def _index(self: Self, track_id: int) -> int:
+        try:
+            return self._ids.index(track_id)
+        except ValueError:
+            raise KeyError(track_id) from None
+
+    def _replenish(self: Self, image: np.ndarray, indices: np.ndarray) -> None:
+        # replace the keypoints of the given boxes with fresh detections
+        if len(indices) == 0:
+            return
+        keep = ~np.isin(self._owners, indices)
+        points = [self._prev_keypoints[keep]]
+        owners = [self._owners[keep]]
+        for i in indices.tolist():
+            detected = _detect_keypoints(
+                image,
+                self._prev_bboxes[i],
+                self._num_features,
+            )
+            points.append(detected)
+            owners.append(np.full(len(detected), i, dtype=np.intp))
+        self._prev_keypoints = np.concatenate(points).astype(np.float32)
+        self._owners = np.concatenate(owners)
+
+    def _track(self: Self, image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # track all keypoints forward, and back again to drop unreliable ones
+        new_kp, status, _ = cv2.calcOpticalFlowPyrLK(  # type: ignore[call-overload]
+            self._prev_frame,
+            image,
+            self._prev_keypoints,
+            None,
+            **self._lk_params,
         )
-        return np_keypoints
+        new_kp = new_kp.reshape(-1, 2)
+        valid = status.ravel() == 1
+        if self._fb_threshold is not None:
+            back_kp, back_status, _ = cv2.calcOpticalFlowPyrLK(  # type: ignore[call-overload]
+                image,
+                self._prev_frame,
+                new_kp,
+                None,
+                **self._lk_params,
+            )
+            fb_error = np.linalg.norm(
+                back_kp.reshape(-1, 2) - self._prev_keypoints,
+                axis=1,
+            )
+            valid &= (back_status.ravel() == 1) & (fb_error <= self._fb_threshold)
+        return new_kp, valid
 
     def init(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
         bboxes: list[tuple[int, int, int, int]],
     ) -> None:
         """
@@ -196,7 +386,7 @@ class KLTMultiTracker(AbstractMultiTracker):
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The image to track the object in.
         bboxes : list[tuple[int, int, int, int]]
             The bounding boxes of the objects to track.
@@ -204,37 +394,34 @@ class KLTMultiTracker(AbstractMultiTracker):
 
         """
         # store image and convert accordingly
-        if len(image.shape) == 3 and image.shape[2] == 3:
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        self._prev_frame = image
+        gray = self._to_gray(image)
+        self._prev_frame = gray
 
         # ensure constraint on bounding boxes
-        height, width = image.shape[:2]
+        height, width = gray.shape[:2]
         bboxes = [constrain(bbox, (width, height)) for bbox in bboxes]
         self._prev_bboxes = bboxes
+        self._boxes = np.array(bboxes, dtype=np.float64).reshape(-1, 4)
+        self._num_updates = 0
+        self._ids = list(range(len(bboxes)))
+        self._next_id = len(bboxes)
 
-        # match keypoints to boxes
-        global_keypoints = self._detect_keypoints(image)
-        self._prev_keypoints = [
-            global_keypoints[
-                (global_keypoints[:, 0] >= x1)
-                & (global_keypoints[:, 0] <= x2)
-                & (global_keypoints[:, 1] >= y1)
-                & (global_keypoints[:, 1] <= y2)
-            ]
-            for x1, y1, x2, y2 in bboxes
-        ]
+        # detect keypoints inside each box
+        self._prev_keypoints = np.zeros((0, 2), dtype=np.float32)
+        self._owners = np.zeros(0, dtype=np.intp)
+        self._replenish(gray, np.arange(len(bboxes)))
 
+    @profiled()
     def update(
         self: Self,
-        image: np.ndarray,
+        image: np.ndarray | FrameContext,
     ) -> list[tuple[bool, tuple[int, int, int, int]]]:
         """
         Update the tracker.
 
         Parameters
         ----------
-        image : np.ndarray
+        image : np.ndarray | FrameContext
             The image to track the object in.
 
         Returns
@@ -246,43 +433,130 @@ class KLTMultiTracker(AbstractMultiTracker):
 
         """
         # convert frame if needed
-        if len(image.shape) == 3 and image.shape[2] == 3:
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray = self._to_gray(image)
+        height, width = gray.shape[:2]
+        num_boxes = len(self._prev_bboxes)
+
+        # a single call for the keypoints of every box, so the image
+        # pyramids of both frames are only built once per frame
+        success = np.zeros(num_boxes, dtype=bool)
+        if len(self._prev_keypoints) > 0:
+            new_kp, valid = self._track(gray)
+            self._boxes, success = _median_flow(
+                self._boxes,
+                self._prev_keypoints[valid],
+                new_kp[valid],
+                self._owners[valid],
+            )
+            self._prev_keypoints = new_kp[valid]
+            self._owners = self._owners[valid]
 
         results: list[tuple[bool, tuple[int, int, int, int]]] = []
-        for i, (prev_kp, bbox) in enumerate(
-            zip(self._prev_keypoints, self._prev_bboxes),
+        for i, (moved, box) in enumerate(zip(success.tolist(), self._boxes)):
+            x1, y1, x2, y2 = constrain(
+                (round(box[0]), round(box[1]), round(box[2]), round(box[3])),
+                (width, height),
+            )
+            found = moved and x2 > x1 and y2 > y1
+            if found:
+                self._prev_bboxes[i] = (x1, y1, x2, y2)
+            results.append((found, self._prev_bboxes[i]))
+
+        # periodically refresh all boxes, and any box which is running out
+        self._num_updates += 1
+        if (
+            self._redetect_interval > 0
+            and self._num_updates % self._redetect_interval == 0
         ):
-            # if no keypoints simply skip
-            if prev_kp.size == 0:
-                results.append((False, bbox))
-                continue
+            refresh = np.arange(num_boxes)
+        else:
+            counts = np.bincount(self._owners, minlength=num_boxes)
+            refresh = np.flatnonzero(counts < self._min_keypoints)
+        self._prev_frame = gray
+        self._replenish(gray, refresh)
 
-            # compute new box using optical flow
-            new_kp, status, _ = cv2.calcOpticalFlowPyrLK(  # type: ignore[call-overload]
-                self._prev_frame,
-                image,
-                prev_kp,
-                None,
-                **self._lk_params,
-            )
+        return results
 
-            # mask based on valid keypoints
-            mask = status.ravel() == 1
-            new_kp = new_kp[mask] if new_kp is not None else np.array([])
-            if new_kp.size == 0:
-                results.append((False, bbox))
-                continue
+    def add(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        bbox: tuple[int, int, int, int],
+    ) -> int:
+        """
+        Start tracking an additional object.
 
-            # create the new bbox
-            x, y, w, h = cv2.boundingRect(new_kp)
-            new_bbox = (x, y, x + w, y + h)
+        Only keypoints of the new object are detected.
 
-            # update state
-            self._prev_keypoints[i] = new_kp
-            self._prev_bboxes[i] = new_bbox
-            results.append((True, new_bbox))
+        Parameters
+        ----------
+        image : np.ndarray | FrameContext
+            The most recent image given to init or update.
+        bbox : tuple[int, int, int, int]
+            The bounding box of the new object.
+            In format: (x1, y1, x2, y2)
 
-        # update frame state and return
-        self._prev_frame = image
-        return results
+        Returns
+        -------
+        int
+            The id of the new object.
+
+        """
+        gray = self._to_gray(image)
+        height, width = gray.shape[:2]
+        bbox = constrain(bbox, (width, height))
+        self._prev_bboxes.append(bbox)
+        self._boxes = np.vstack([self._boxes, np.array(bbox, dtype=np.float64)])
+        track_id = self._next_id
+        self._ids.append(track_id)
+        self._next_id += 1
+        self._replenish(gray, np.array([len(self._ids) - 1]))
+        return track_id
+
+    def remove(self: Self, track_id: int) -> None:
+        """
+        Stop tracking an object.
+
+        Parameters
+        ----------
+        track_id : int
+            The id of the object to remove.
+
+        """
+        index = self._index(track_id)
+        del self._ids[index]
+        del self._prev_bboxes[index]
+        self._boxes = np.delete(self._boxes, index, axis=0)
+        keep = self._owners != index
+        self._prev_keypoints = self._prev_keypoints[keep]
+        owners = self._owners[keep]
+        self._owners = owners - (owners > index)
+
+    def reinit(
+        self: Self,
+        image: np.ndarray | FrameContext,
+        track_id: int,
+        bbox: tuple[int, int, int, int],
+    ) -> None:
+        """
+        Restart tracking an object from a new bounding box.
+
+        Only keypoints of this object are detected again, keeping its id.
+
+        Parameters
+        ----------
+        image : np.ndarray | FrameContext
+            The most recent image given to init or update.
+        track_id : int
+            The id of the object to restart.
+        bbox : tuple[int, int, int, int]
+            The new bounding box of the object.
+            In format: (x1, y1, x2, y2)
+
+        """
+        index = self._index(track_id)
+        gray = self._to_gray(image)
+        height, width = gray.shape[:2]
+        bbox = constrain(bbox, (width, height))
+        self._prev_bboxes[index] = bbox
+        self._boxes[index] = bbox
+        self._replenish(gray, np.array([index]))
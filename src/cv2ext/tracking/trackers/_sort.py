@@ -0,0 +1,351 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from cv2ext.bboxes._iou import _iou_matrix
+from cv2ext.profiling._profiler import profiled
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from typing_extensions import Self
+
+    from cv2ext.tracking._interface import AbstractTracker
+    from cv2ext.tracking._tracker_type import TrackerType
+
+_log = logging.getLogger(__name__)
+
+# state is (cx, cy, w, h, vx, vy, vw, vh), measurements are (cx, cy, w, h)
+_DIM = 8
+_MEAS = 4
+_F = np.eye(_DIM)
+_F[:_MEAS, _MEAS:] = np.eye(_MEAS)
+
+
+def _to_measurement(bboxes: np.ndarray) -> np.ndarray:
+    # (N, 4) xyxy to (N, 4) center, width, height
+    return np.stack(
+        [
+            (bboxes[:, 0] + bboxes[:, 2]) / 2,
+            (bboxes[:, 1] + bboxes[:, 3]) / 2,
+            bboxes[:, 2] - bboxes[:, 0],
+            bboxes[:, 3] - bboxes[:, 1],
+        ],
+        axis=1,
+    )
+
+
+def _to_bboxes(state: np.ndarray) -> np.ndarray:
+    # (N, >=4) center, width, height to (N, 4) xyxy
+    half_w = state[:, 2] / 2
+    half_h = state[:, 3] / 2
+    return np.stack(
+        [
+            state[:, 0] - half_w,
+            state[:, 1] - half_h,
+            state[:, 0] + half_w,
+            state[:, 1] + half_h,
+        ],
+        axis=1,
+    )
+
+
+def _greedy_assign(
+    scores: np.ndarray,
+    threshold: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    # match rows to columns by descending score, each at most once
+    rows, cols = np.nonzero(scores >= threshold)
+    order = np.argsort(-scores[rows, cols], kind="stable")
+    used_rows = np.zeros(scores.shape[0], dtype=bool)
+    used_cols = np.zeros(scores.shape[1], dtype=bool)
+    matched_rows: list[int] = []
+    matched_cols: list[int] = []
+    for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+        if used_rows[row] or used_cols[col]:
+            continue
+        used_rows[row] = True
+        used_cols[col] = True
+        matched_rows.append(row)
+        matched_cols.append(col)
+    return np.array(matched_rows, dtype=np.intp), np.array(matched_cols, dtype=np.intp)
+
+
+class SortTracker:
+    """
+    Class for tracking many objects from per-frame detections, as in SORT.
+
+    All tracks share one constant velocity Kalman filter over arrays of
+    states, so predicting and correcting every track is a few batched
+    matrix operations. Detections are associated to the predicted boxes
+    greedily by IoU. Unmatched detections start new tracks, and tracks
+    missing detections for more than max_age frames are removed.
+    """
+
+    def __init__(
+        self: Self,
+        iou_threshold: float = 0.3,
+        max_age: int = 1,
+        min_hits: int = 3,
+        fallback: TrackerType | type[AbstractTracker] | None = None,
+        position_noise: float = 1.0 / 20,
+        velocity_noise: float = 1.0 / 160,
+    ) -> None:
+        """
+        Create a new SortTracker object.
+
+        Parameters
+        ----------
+        iou_threshold : float
+            The minimum IoU between a predicted box and a detection to match.
+            By default, this is set to 0.3.
+        max_age : int
+            The number of consecutive frames a track may go unmatched
+            before it is removed. By default, this is set to 1.
+        min_hits : int
+            The number of matched frames before a track is reported.
+            During the first min_hits frames every track is reported.
+            By default, this is set to 3.
+        fallback : TrackerType | type[AbstractTracker], optional
+            An appearance tracker used only for tracks without a matching
+            detection, initialized from the previous frame and box of the
+            track. A successful update is used in place of the detection.
+            Requires the image to be passed to update.
+            By default None, which uses only the detections.
+        position_noise : float
+            The standard deviation of position noise, relative to the
+            box size. By default, this is set to 1/20.
+        velocity_noise : float
+            The standard deviation of velocity noise, relative to the
+            box size. By default, this is set to 1/160.
+
+        Raises
+        ------
+        ValueError
+            If max_age is negative or min_hits is less than 1.
+
+        """
+        if max_age < 0:
+            err_msg = f"max_age must be non-negative, got {max_age}."
+            raise ValueError(err_msg)
+        if min_hits < 1:
+            err_msg = f"min_hits must be at least 1, got {min_hits}."
+            raise ValueError(err_msg)
+
+        # TrackerType imports this module, so it can only be imported here
+        from cv2ext.tracking._tracker_type import TrackerType  # noqa: PLC0415
+
+        self._iou_threshold = iou_threshold
+        self._max_age = max_age
+        self._min_hits = min_hits
+        self._fallback_type = (
+            fallback.value if isinstance(fallback, TrackerType) else fallback
+        )
+        self._position_noise = position_noise
+        self._velocity_noise = velocity_noise
+
+        # state storage, one row per track
+        self._state = np.zeros((0, _DIM), dtype=np.float64)
+        self._cov = np.zeros((0, _DIM, _DIM), dtype=np.float64)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._hits = np.zeros(0, dtype=np.int64)
+        self._misses = np.zeros(0, dtype=np.int64)
+        self._next_id = 0
+        self._frame_count = 0
+        self._prev_image: np.ndarray | None = None
+        self._fallbacks: dict[int, AbstractTracker] = {}
+
+    def __len__(self: Self) -> int:
+        return len(self._ids)
+
+    @property
+    def ids(self: Self) -> list[int]:
+        """
+        The ids of all current tracks, including unconfirmed tracks.
+
+        Returns
+        -------
+        list[int]
+            The track ids. Ids are never reused.
+
+        """
+        ids: list[int] = self._ids.tolist()
+        return ids
+
+    def _noise(self: Self, sizes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # diagonal process and measurement noise, scaled by box size
+        scale = np.concatenate([sizes, sizes], axis=1)
+        pos = self._position_noise * scale[:, :_MEAS]
+        vel = self._velocity_noise * scale[:, _MEAS:]
+        process = np.concatenate([pos, vel], axis=1) ** 2
+        measurement = pos**2
+        return process, measurement
+
+    def _predict(self: Self) -> None:
+        if len(self._state) == 0:
+            return
+        # widths and heights must stay positive
+        shrinking = self._state[:, 2:4] + self._state[:, 6:8] <= 0
+        self._state[:, 6:8][shrinking] = 0.0
+        self._state = self._state @ _F.T
+        sizes = np.tile(self._state[:, 2:4], 2)
+        process, _ = self._noise(sizes)
+        self._cov = _F @ self._cov @ _F.T
+        self._cov[:, np.arange(_DIM), np.arange(_DIM)] += process
+
+    def _correct(self: Self, indices: np.ndarray, measurements: np.ndarray) -> None:
+        if len(indices) == 0:
+            return
+        state = self._state[indices]
+        cov = self._cov[indices]
+        sizes = np.tile(state[:, 2:4], 2)
+        _, noise = self._noise(sizes)
+
+        # H selects the first _MEAS state entries, so H P H^T is a block of P
+        innovation_cov = cov[:, :_MEAS, :_MEAS].copy()
+        innovation_cov[:, np.arange(_MEAS), np.arange(_MEAS)] += noise
+        gain = cov[:, :, :_MEAS] @ np.linalg.inv(innovation_cov)
+        residual = measurements - state[:, :_MEAS]
+        self._state[indices] = state + (gain @ residual[:, :, None])[:, :, 0]
+        self._cov[indices] = cov - gain @ cov[:, :_MEAS, :]
+
+    def _birth(self: Self, bboxes: np.ndarray) -> None:
+        num = len(bboxes)
+        if num == 0:
+            return
+        measurements = _to_measurement(bboxes)
+        state = np.concatenate([measurements, np.zeros((num, _MEAS))], axis=1)
+        sizes = np.tile(measurements[:, 2:4], 2)
+        scale = np.concatenate([sizes, sizes], axis=1)
+        variance = np.concatenate(
+            [
+                2 * self._position_noise * scale[:, :_MEAS],
+                10 * self._velocity_noise * scale[:, _MEAS:],
+            ],
+            axis=1,
+        )
+        cov = np.zeros((num, _DIM, _DIM))
+        cov[:, np.arange(_DIM), np.arange(_DIM)] = variance**2
+
+        self._state = np.concatenate([self._state, state])
+        self._cov = np.concatenate([self._cov, cov])
+        self._ids = np.concatenate(
+            [self._ids, np.arange(self._next_id, self._next_id + num)],
+        )
+        self._hits = np.concatenate([self._hits, np.ones(num, dtype=np.int64)])
+        self._misses = np.concatenate([self._misses, np.zeros(num, dtype=np.int64)])
+        self._next_id += num
+
+    def _run_fallback(
+        self: Self,
+        image: np.ndarray,
+        indices: np.ndarray,
+        prev_bboxes: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # appearance tracking, only for the tracks without a detection
+        found: list[int] = []
+        measured: list[tuple[int, int, int, int]] = []
+        if self._fallback_type is None or self._prev_image is None:
+            return np.array(found, dtype=np.intp), np.zeros((0, _MEAS))
+        for index in indices.tolist():
+            track_id = int(self._ids[index])
+            tracker = self._fallbacks.get(track_id)
+            if tracker is None:
+                x1, y1, x2, y2 = np.round(prev_bboxes[index]).astype(int).tolist()
+                if x2 <= x1 or y2 <= y1:
+                    continue
+                tracker = self._fallback_type()
+                tracker.init(self._prev_image, (x1, y1, x2, y2))
+                self._fallbacks[track_id] = tracker
+            success, bbox = tracker.update(image)
+            if success:
+                found.append(index)
+                measured.append(bbox)
+        bboxes = np.array(measured, dtype=np.float64).reshape(-1, 4)
+        return np.array(found, dtype=np.intp), _to_measurement(bboxes)
+
+    @profiled()
+    def update(
+        self: Self,
+        detections: Sequence[tuple[int, int, int, int]] | np.ndarray,
+        image: np.ndarray | None = None,
+    ) -> list[tuple[int, tuple[int, int, int, int]]]:
+        """
+        Update the tracks with the detections of the next frame.
+
+        Parameters
+        ----------
+        detections : Sequence[tuple[int, int, int, int]] | np.ndarray
+            The detected bounding boxes in the frame, or an (N, 4) array.
+            In format: (x1, y1, x2, y2)
+        image : np.ndarray, optional
+            The frame itself. Only needed when using a fallback tracker.
+
+        Returns
+        -------
+        list[tuple[int, tuple[int, int, int, int]]]
+            The id and bounding box of each confirmed track which was
+            matched to a detection, or found by the fallback, this frame.
+            bbox is in format: (x1, y1, x2, y2)
+
+        """
+        self._frame_count += 1
+        detected = np.asarray(detections, dtype=np.float64).reshape(-1, 4)
+        prev_bboxes = _to_bboxes(self._state)
+
+        # predict all tracks, then associate with the detections
+        self._predict()
+        scores = _iou_matrix(_to_bboxes(self._state), detected)
+        track_idx, det_idx = _greedy_assign(scores, self._iou_threshold)
+        self._correct(track_idx, _to_measurement(detected[det_idx]))
+
+        matched = np.zeros(len(self._ids), dtype=bool)
+        matched[track_idx] = True
+        for track_id in self._ids[track_idx].tolist():
+            self._fallbacks.pop(track_id, None)
+
+        # fall back to appearance tracking for unmatched tracks
+        if self._fallback_type is not None and image is not None:
+            found, measurements = self._run_fallback(
+                image,
+                np.flatnonzero(~matched),
+                prev_bboxes,
+            )
+            self._correct(found, measurements)
+            matched[found] = True
+
+        self._hits[matched] += 1
+        self._misses[matched] = 0
+        self._misses[~matched] += 1
+
+        # remove stale tracks, then start tracks for unmatched detections
+        alive = self._misses <= self._max_age
+        for track_id in self._ids[~alive].tolist():
+            self._fallbacks.pop(track_id, None)
+        self._state = self._state[alive]
+        self._cov = self._cov[alive]
+        self._ids = self._ids[alive]
+        self._hits = self._hits[alive]
+        self._misses = self._misses[alive]
+        reported = matched[alive]
+
+        unmatched = np.ones(len(detected), dtype=bool)
+        unmatched[det_idx] = False
+        self._birth(detected[unmatched])
+        reported = np.concatenate([reported, np.ones(unmatched.sum(), dtype=bool)])
+
+        self._prev_image = image
+        if self._frame_count > self._min_hits:
+            reported &= self._hits >= self._min_hits
+
+        bboxes = np.round(_to_bboxes(self._state[reported])).astype(int)
+        return [
+            (track_id, (bbox[0], bbox[1], bbox[2], bbox[3]))
+            for track_id, bbox in zip(self._ids[reported].tolist(), bboxes.tolist())
+        ]
@@ -0,0 +1,220 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import cv2
+
+from cv2ext.bboxes import constrain
+from cv2ext.profiling._profiler import profiled
+from cv2ext.template import match_pyramid
+from cv2ext.template._pyramid import _is_minimizing
+from cv2ext.tracking._interface import AbstractTracker
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import numpy as np
+    from typing_extensions import Self
+
+_log = logging.getLogger(__name__)
+
+
+class TemplateTracker(AbstractTracker):
+    """
+    Class for tracking objects with template matching.
+
+    The template is only searched for in a window around the previous
+    match. A full frame search, over an image pyramid, is only performed
+    when the score in the window falls below the threshold.
+    """
+
+    def __init__(
+        self: Self,
+        search_scale: float = 2.0,
+        threshold: float = 0.7,
+        method: int = cv2.TM_CCOEFF_NORMED,
+        scales: Sequence[float] = (0.9, 1.0, 1.1),
+        levels: int = 3,
+        *,
+        use_pyramid: bool | None = None,
+        update_template: bool | None = None,
+    ) -> None:
+        """
+        Create a new TemplateTracker object.
+
+        Parameters
+        ----------
+        search_scale : float
+            The size of the search window relative to the previous bounding box.
+            By default, this is set to 2.0, which allows the object to move
+            half of its size between frames.
+        threshold : float
+            The score a match in the search window must meet, otherwise
+            a full frame search is performed.
+            For cv2.TM_SQDIFF methods, scores must be at most the threshold.
+            By default, this is set to 0.7.
+        method : int
+            The method to use for template matching. One of cv2.TM_*.
+            By default, this is set to cv2.TM_CCOEFF_NORMED.
+        scales : Sequence[float]
+            The scales of the template to search for in the full frame search.
+            By default, this is set to (0.9, 1.0, 1.1).
+        levels : int
+            The number of pyramid levels used in the full frame search.
+            By default, this is set to 3.
+        use_pyramid : bool, optional
+            Whether the full frame search is done coarse to fine over
+            an image pyramid. By default None, which uses the pyramid.
+        update_template : bool, optional
+            Whether to replace the template with the matched region after
+            every confident match. Allows following appearance changes,
+            at the cost of possible drift. By default None, which keeps
+            the initial template.
+
+        Raises
+        ------
+        ValueError
+            If search_scale is less than 1.0.
+
+        """
+        if search_scale < 1.0:
+            err_msg = f"search_scale must be at least 1.0, got {search_scale}."
+            raise ValueError(err_msg)
+
+        self._search_scale = search_scale
+        self._threshold = threshold
+        self._method = method
+        self._scales = tuple(scales)
+        self._levels = levels
+        self._use_pyramid = use_pyramid if use_pyramid is not None else True
+        self._update_template = bool(update_template)
+        self._minimize = _is_minimizing(method)
+
+        # state storage
+        self._base_template: np.ndarray | None = None
+        self._template: np.ndarray | None = None
+        self._prev_bbox: tuple[int, int, int, int] = (0, 0, 0, 0)
+
+    @staticmethod
+    def _to_gray(image: np.ndarray) -> np.ndarray:
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+
+    def _passes(self: Self, score: float) -> bool:
+        return score <= self._threshold if self._minimize else score >= self._threshold
+
+    def init(self: Self, image: np.ndarray, bbox: tuple[int, int, int, int]) -> None:
+        """
+        Initialize the tracker.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The image to track the object in.
+        bbox : tuple[int, int, int, int]
+            The bounding box of the object to track.
+            In format: (x1, y1, x2, y2)
+
+        Raises
+        ------
+        ValueError
+            If the bounding box is empty after constraining to the image.
+
+        """
+        image = self._to_gray(image)
+        height, width = image.shape[:2]
+        x1, y1, x2, y2 = constrain(bbox, (width, height))
+        if x2 <= x1 or y2 <= y1:
+            err_msg = f"Bounding box {bbox} is empty within the image."
+            raise ValueError(err_msg)
+        self._base_template = image[y1:y2, x1:x2].copy()
+        self._template = self._base_template
+        self._prev_bbox = (x1, y1, x2, y2)
+
+    def _search_window(
+        self: Self,
+        image: np.ndarray,
+        template: np.ndarray,
+    ) -> tuple[tuple[int, int, int, int], float] | None:
+        height, width = image.shape[:2]
+        t_h, t_w = template.shape[:2]
+        x1, y1, x2, y2 = self._prev_bbox
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        half_w = max(t_w, (x2 - x1) * self._search_scale) / 2
+        half_h = max(t_h, (y2 - y1) * self._search_scale) / 2
+        wx1, wy1, wx2, wy2 = constrain(
+            (int(cx - half_w), int(cy - half_h), int(cx + half_w), int(cy + half_h)),
+            (width, height),
+        )
+        if wx2 - wx1 < t_w or wy2 - wy1 < t_h:
+            return None
+
+        result = cv2.matchTemplate(image[wy1:wy2, wx1:wx2], template, self._method)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        x, y = min_loc if self._minimize else max_loc
+        score = min_val if self._minimize else max_val
+        return (wx1 + x, wy1 + y, wx1 + x + t_w, wy1 + y + t_h), float(score)
+
+    def _search_full(
+        self: Self,
+        image: np.ndarray,
+    ) -> tuple[tuple[int, int, int, int], float] | None:
+        if self._base_template is None:
+            return None
+        try:
+            return match_pyramid(
+                image,
+                self._base_template,
+                scales=self._scales,
+                method=self._method,
+                levels=self._levels,
+                coarse_to_fine=self._use_pyramid,
+            )
+        except ValueError:
+            return None
+
+    @profiled()
+    def update(self: Self, image: np.ndarray) -> tuple[bool, tuple[int, int, int, int]]:
+        """
+        Update the tracker.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The image to track the object in.
+
+        Returns
+        -------
+        bool
+            Whether the update was successful.
+        tuple[int, int, int, int]
+            The bounding box of the object.
+            In format: (x1, y1, x2, y2)
+
+        """
+        if self._template is None or self._base_template is None:
+            return False, self._prev_bbox
+
+        image = self._to_gray(image)
+        match = self._search_window(image, self._template)
+        if match is None or not self._passes(match[1]):
+            _log.debug("TemplateTracker falling back to full frame search")
+            match = self._search_full(image)
+            if match is None or not self._passes(match[1]):
+                return False, self._prev_bbox
+
+            # the full search may find the object at a different scale
+            x1, y1, x2, y2 = match[0]
+            if self._template.shape[:2] != (y2 - y1, x2 - x1):
+                self._template = cv2.resize(self._base_template, (x2 - x1, y2 - y1))
+
+        x1, y1, x2, y2 = match[0]
+        if self._update_template:
+            self._template = image[y1:y2, x1:x2].copy()
+        self._prev_bbox = (x1, y1, x2, y2)
+        return True, self._prev_bbox
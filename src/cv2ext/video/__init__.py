@@ -4,10 +4,19 @@
 """
 Utilities for working with videos.
 
+Classes
+-------
+:class:`HashIndex`
+    A bounded index of 64-bit hashes for near-duplicate lookup.
+:class:`UniqueFrames`
+    An iterator over the novel frames of a video.
+
 Functions
 ---------
 :func:`create_timeline`
     Create a timeline image of a video.
+:func:`iter_unique`
+    Iterate over only the novel frames of a video.
 :func:`video_from_images`
     Create a video from a directory of images.
 
@@ -15,7 +24,14 @@ Functions
 
 from __future__ import annotations
 
+from ._dedup import HashIndex, UniqueFrames, iter_unique
 from ._images import video_from_images
 from ._timeline import create_timeline
 
-__all__ = ["create_timeline", "video_from_images"]
+__all__ = [
+    "HashIndex",
+    "UniqueFrames",
+    "create_timeline",
+    "iter_unique",
+    "video_from_images",
+]
@@ -0,0 +1,291 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from cv2ext.metrics import dhash, hamming
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    import numpy as np
+    from typing_extensions import Self
+
+_log = logging.getLogger(__name__)
+
+_HASH_BITS = 64
+
+
+class HashIndex:
+    """
+    A bounded index of 64-bit hashes supporting near-duplicate lookup.
+
+    Implemented as a multi-index hash table. Each hash is split into
+    max_distance + 1 chunks, by the pigeonhole principle any hash within
+    max_distance bits of a stored hash shares at least one chunk exactly,
+    so only entries in matching buckets have to be compared.
+    """
+
+    def __init__(
+        self: Self,
+        max_distance: int = 4,
+        capacity: int | None = 1024,
+    ) -> None:
+        """
+        Create a new HashIndex.
+
+        Parameters
+        ----------
+        max_distance : int, optional
+            The largest Hamming distance considered a near-duplicate.
+            Default is 4.
+        capacity : int, optional
+            The maximum number of stored hashes, the oldest hash is
+            evicted first once full. By default 1024.
+            If None, the index is unbounded.
+
+        Raises
+        ------
+        ValueError
+            If max_distance is not in [0, 63] or capacity is less than 1.
+
+        """
+        if not 0 <= max_distance < _HASH_BITS:
+            err_msg = (
+                f"max_distance must be in [0, {_HASH_BITS - 1}], got {max_distance}."
+            )
+            raise ValueError(err_msg)
+        if capacity is not None and capacity < 1:
+            err_msg = f"capacity must be at least 1, got {capacity}."
+            raise ValueError(err_msg)
+
+        self._max_distance = max_distance
+        self._capacity = capacity
+
+        # split the 64 bits into max_distance + 1 nearly equal chunks
+        num_chunks = max_distance + 1
+        widths = [
+            _HASH_BITS // num_chunks + (1 if i < _HASH_BITS % num_chunks else 0)
+            for i in range(num_chunks)
+        ]
+        self._chunks: list[tuple[int, int]] = []
+        shift = 0
+        for width in widths:
+            self._chunks.append((shift, (1 << width) - 1))
+            shift += width
+
+        self._tables: list[dict[int, set[int]]] = [{} for _ in self._chunks]
+        self._entries: OrderedDict[int, tuple[int, int]] = OrderedDict()
+        self._next_id = 0
+
+    def __len__(self: Self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_distance(self: Self) -> int:
+        """
+        The largest Hamming distance considered a near-duplicate.
+
+        Returns
+        -------
+        int
+            The maximum distance.
+
+        """
+        return self._max_distance
+
+    def _keys(self: Self, value: int) -> list[int]:
+        return [(value >> shift) & mask for shift, mask in self._chunks]
+
+    def add(self: Self, value: int, key: int) -> None:
+        """
+        Add a hash to the index.
+
+        Parameters
+        ----------
+        value : int
+            The 64-bit hash.
+        key : int
+            The key to return when the hash is matched, such as a frame number.
+
+        """
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (value, key)
+        for table, chunk in zip(self._tables, self._keys(value)):
+            table.setdefault(chunk, set()).add(entry_id)
+
+        if self._capacity is not None and len(self._entries) > self._capacity:
+            old_id, (old_value, _) = self._entries.popitem(last=False)
+            for table, chunk in zip(self._tables, self._keys(old_value)):
+                bucket = table[chunk]
+                bucket.discard(old_id)
+                if not bucket:
+                    del table[chunk]
+
+    def query(self: Self, value: int) -> tuple[int, int] | None:
+        """
+        Find the nearest stored hash within max_distance.
+
+        Parameters
+        ----------
+        value : int
+            The 64-bit hash to search for.
+
+        Returns
+        -------
+        tuple[int, int] | None
+            The key and Hamming distance of the nearest stored hash,
+            or None if no stored hash is within max_distance.
+
+        """
+        best: tuple[int, int] | None = None
+        seen: set[int] = set()
+        for table, chunk in zip(self._tables, self._keys(value)):
+            for entry_id in table.get(chunk, ()):
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                stored, key = self._entries[entry_id]
+                distance = hamming(value, stored)
+                if distance <= self._max_distance and (
+                    best is None or distance < best[1]
+                ):
+                    best = (key, distance)
+                    if distance == 0:
+                        return best
+        return best
+
+
+class UniqueFrames:
+    """
+    An iterator over the novel frames of a video.
+
+    Created by :func:`iter_unique`. While iterating, every skipped
+    frame number is mapped to the frame number of the novel frame
+    it duplicated, see :attr:`duplicates`.
+    """
+
+    def __init__(
+        self: Self,
+        frames: Iterable[tuple[int, np.ndarray]],
+        max_distance: int = 4,
+        capacity: int | None = 1024,
+        hash_func: Callable[[np.ndarray], int] = dhash,
+    ) -> None:
+        """
+        Create a new UniqueFrames iterator.
+
+        Parameters
+        ----------
+        frames : Iterable[tuple[int, np.ndarray]]
+            The frame numbers and frames, such as an IterableVideo.
+        max_distance : int, optional
+            The largest Hamming distance between hashes considered
+            a duplicate frame. Default is 4.
+        capacity : int, optional
+            The number of recent novel frames kept for comparison.
+            By default 1024. If None, all novel frames are kept.
+        hash_func : Callable[[np.ndarray], int], optional
+            The 64-bit hash function, by default cv2ext.metrics.dhash.
+
+        """
+        self._frames: Iterator[tuple[int, np.ndarray]] = iter(frames)
+        self._index = HashIndex(max_distance, capacity)
+        self._hash_func = hash_func
+        self._duplicates: dict[int, int] = {}
+        self._num_unique = 0
+
+    def __iter__(self: Self) -> Self:
+        return self
+
+    def __next__(self: Self) -> tuple[int, np.ndarray]:
+        for frame_id, frame in self._frames:
+            value = self._hash_func(frame)
+            match = self._index.query(value)
+            if match is not None:
+                self._duplicates[frame_id] = match[0]
+                continue
+            self._index.add(value, frame_id)
+            self._num_unique += 1
+            return frame_id, frame
+        _log.debug(
+            f"Skipped {len(self._duplicates)} duplicate frames, "
+            f"yielded {self._num_unique} unique frames",
+        )
+        raise StopIteration
+
+    @property
+    def duplicates(self: Self) -> dict[int, int]:
+        """
+        The skipped frames so far.
+
+        Returns
+        -------
+        dict[int, int]
+            A mapping from each skipped frame number to the frame
+            number of the novel frame it was matched to.
+
+        """
+        return self._duplicates
+
+    @property
+    def num_unique(self: Self) -> int:
+        """
+        The number of novel frames yielded so far.
+
+        Returns
+        -------
+        int
+            The number of novel frames.
+
+        """
+        return self._num_unique
+
+
+def iter_unique(
+    video: Iterable[tuple[int, np.ndarray]],
+    max_distance: int = 4,
+    capacity: int | None = 1024,
+    hash_func: Callable[[np.ndarray], int] = dhash,
+) -> UniqueFrames:
+    """
+    Iterate over only the novel frames of a video.
+
+    Each frame is hashed from a downscaled grayscale copy, and frames
+    whose hash is within max_distance of a recent novel frame are skipped.
+
+    Parameters
+    ----------
+    video : Iterable[tuple[int, np.ndarray]]
+        The frame numbers and frames, such as an IterableVideo.
+    max_distance : int, optional
+        The largest Hamming distance between hashes considered
+        a duplicate frame. Default is 4.
+    capacity : int, optional
+        The number of recent novel frames kept for comparison.
+        By default 1024. If None, all novel frames are kept.
+    hash_func : Callable[[np.ndarray], int], optional
+        The 64-bit hash function, by default cv2ext.metrics.dhash.
+
+    Returns
+    -------
+    UniqueFrames
+        An iterator of (frame number, frame) for the novel frames.
+        Its duplicates property maps skipped frames to their match.
+
+    Examples
+    --------
+    >>> from cv2ext import IterableVideo
+    >>> from cv2ext.video import iter_unique
+    >>> frames = iter_unique(IterableVideo("video.mp4"), max_distance=4)
+    >>> for frame_id, frame in frames:
+    ...     pass
+    >>> skipped = frames.duplicates
+
+    """
+    return UniqueFrames(video, max_distance, capacity, hash_func)
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import cv2ext
+import numpy as np
 import pybboxes
 import hypothesis.strategies as st
 from hypothesis import given
@@ -135,3 +136,15 @@ def test_parity_jit(data1, data2):
     iou = cv2ext.bboxes.iou(bbox1, bbox2)
     pyb_iou = pybboxes.BoundingBox(*bbox1).iou(pybboxes.BoundingBox(*bbox2))
     assert iou == pyb_iou
+
+
+def test_iou_matrix():
+    from cv2ext.bboxes._iou import _iou_matrix
+
+    bboxes1 = [(0, 0, 10, 10), (5, 5, 15, 15), (20, 20, 30, 40)]
+    bboxes2 = [(0, 0, 10, 10), (8, 2, 12, 30)]
+    result = _iou_matrix(np.array(bboxes1), np.array(bboxes2))
+    assert result.shape == (3, 2)
+    for i, a in enumerate(bboxes1):
+        for j, b in enumerate(bboxes2):
+            assert abs(result[i, j] - cv2ext.bboxes.iou(a, b)) < 1e-9
@@ -4,6 +4,9 @@
 from __future__ import annotations
 
 import cv2ext
+from cv2ext.bboxes._algorithms import _match_kernel
+
+from ..helpers import wrapper_jit
 
 
 def test_zero_len_match():
@@ -35,5 +38,17 @@ def test_basic_2_match():
     assert matches[0] == (0, 1)
 
 
+@wrapper_jit
+def test_class_match_jit():
+    dets1 = [((0, 0, 10, 10), 0.9, 1), ((20, 20, 30, 30), 0.8, 2)]
+    dets2 = [((20, 20, 30, 30), 0.7, 1), ((0, 0, 10, 10), 0.6, 1)]
+
+    assert cv2ext.bboxes.match(dets1, dets2) == [(0, 1)]
+    assert cv2ext.bboxes.match(dets1, dets2, class_agnostic=True) == [(0, 1), (1, 0)]
+    assert cv2ext.bboxes.match([(0, 0, 10, 10)], dets2) == []
+    assert _match_kernel.compiled is not None
+    assert not _match_kernel._failed
+
+
 if __name__ == "__main__":
     test_basic_1_match()
@@ -5,8 +5,15 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import cv2ext
+import numpy as np
 from cv2ext import IterableVideo
-from cv2ext.detection import AnnealingFramePacker, RandomFramePacker
+from cv2ext.detection import AnnealingFramePacker, MotionFramePacker, RandomFramePacker
+from cv2ext.detection._packer import (
+    _shelf_grid_layout,
+    _shelf_grid_repack,
+    _simple_grid_repack,
+)
 
 from ..helpers import wrapper, wrapper_jit
 
@@ -108,3 +115,199 @@ def test_random_packer_shelf():
 @wrapper_jit
 def test_random_packer_shelf_jit():
     _test_random_packer_shelf()
+
+
+def _check_canvas_contents(
+    image: np.ndarray, canvas: np.ndarray, transform: np.ndarray, gridsize: int
+) -> int:
+    used = 0
+    rows, cols = transform.shape[:2]
+    for row in range(rows):
+        for col in range(cols):
+            patch = canvas[
+                row * gridsize : (row + 1) * gridsize,
+                col * gridsize : (col + 1) * gridsize,
+            ]
+            if not patch.any():
+                continue
+            used += 1
+            o_x, o_y = transform[row, col]
+            assert np.array_equal(
+                patch, image[o_y : o_y + gridsize, o_x : o_x + gridsize]
+            )
+    return used
+
+
+def _test_canvas_drop(method: str):
+    rng = np.random.default_rng(0)
+    packer = RandomFramePacker(
+        (320, 320),
+        gridsize=64,
+        threshold=1.1,
+        method=method,
+        canvas_size=(256, 192),
+    )
+    for _ in range(5):
+        frame = rng.integers(1, 255, size=(320, 320, 3), dtype=np.uint8)
+        packed, transform = packer.pack(frame)
+        assert packed.shape == (192, 256, 3)
+        assert transform.shape == (3, 4, 2)
+        assert _check_canvas_contents(frame, packed, transform, 64) == 12
+
+
+def _test_canvas_drop_priority(method: str):
+    rng = np.random.default_rng(1)
+    packer = RandomFramePacker(
+        (320, 320),
+        gridsize=64,
+        threshold=1.1,
+        method=method,
+        canvas_size=(128, 128),
+    )
+    # make the bottom right cell the most active
+    for _ in range(3):
+        packer.update([(260, 260, 310, 310), (270, 270, 300, 300)])
+    frame = rng.integers(1, 255, size=(320, 320, 3), dtype=np.uint8)
+    packed, transform = packer.pack(frame)
+    assert packed.shape == (128, 128, 3)
+    offsets = {tuple(offset) for offset in transform.reshape(-1, 2)}
+    assert (256, 256) in offsets
+
+
+def _test_canvas_spill(method: str):
+    rng = np.random.default_rng(2)
+    packer = RandomFramePacker(
+        (320, 320),
+        gridsize=64,
+        threshold=1.1,
+        method=method,
+        canvas_size=(256, 256),
+        overflow="spill",
+    )
+    frame = rng.integers(1, 255, size=(320, 320, 3), dtype=np.uint8)
+    packed, transform = packer.pack(frame)
+    assert packed.shape == (2, 256, 256, 3)
+    assert transform.shape == (2, 4, 4, 2)
+    used = sum(
+        _check_canvas_contents(frame, canvas, grid, 64)
+        for canvas, grid in zip(packed, transform)
+    )
+    assert used == 25
+
+    # a detection in the first slot of every canvas maps back to its cell
+    detections = [[(5, 5, 20, 20)] for _ in range(packed.shape[0])]
+    unpacked = packer.unpack_batch(detections, transform)
+    assert len(unpacked) == 2
+    for (x1, y1, x2, y2), grid in zip(unpacked, transform):
+        o_x, o_y = grid[0, 0]
+        assert (x1, y1, x2, y2) == (o_x + 5, o_y + 5, o_x + 20, o_y + 20)
+
+
+def test_canvas_drop_simple():
+    _test_canvas_drop("simple")
+
+
+def test_canvas_drop_shelf():
+    _test_canvas_drop("shelf")
+
+
+def test_canvas_drop_priority_simple():
+    _test_canvas_drop_priority("simple")
+
+
+def test_canvas_drop_priority_shelf():
+    _test_canvas_drop_priority("shelf")
+
+
+def test_canvas_spill_simple():
+    _test_canvas_spill("simple")
+
+
+def test_canvas_spill_shelf():
+    _test_canvas_spill("shelf")
+
+
+def test_canvas_too_small():
+    try:
+        RandomFramePacker((320, 320), gridsize=64, canvas_size=(32, 32))
+    except ValueError:
+        assert True
+    else:
+        assert False
+
+
+def _test_motion_packer(method: str):
+    rng = np.random.default_rng(3)
+    background = rng.integers(1, 255, size=(256, 384, 3), dtype=np.uint8)
+    packer = MotionFramePacker(
+        (384, 256), gridsize=128, min_prob=0.0, method=method
+    )
+
+    # first frame has no history, every cell is explored
+    packed, _ = packer.pack(background)
+    assert packed.shape[0] * packed.shape[1] == 6 * 128 * 128
+
+    # a static frame explores nothing
+    packed, _ = packer.pack(background.copy())
+    assert not packed.any()
+
+    # motion in a single cell explores only that cell
+    moved = background.copy()
+    moved[20:100, 150:230] = 0
+    packed, transform = packer.pack(moved)
+    assert packed.shape[:2] == (128, 128)
+    assert tuple(transform[0, 0]) == (128, 0)
+    assert np.array_equal(packed, moved[0:128, 128:256])
+
+
+def test_motion_packer_simple():
+    _test_motion_packer("simple")
+
+
+def test_motion_packer_shelf():
+    _test_motion_packer("shelf")
+
+
+def _assert_compiled(*kernels) -> None:
+    # ran compiled, rather than falling back to Python
+    for kernel in kernels:
+        assert kernel.compiled is not None
+        assert kernel.compiled.signatures
+        assert not kernel._failed
+
+
+@wrapper_jit
+def test_motion_packer_simple_jit():
+    _test_motion_packer("simple")
+    _assert_compiled(_simple_grid_repack)
+
+
+@wrapper_jit
+def test_motion_packer_shelf_jit():
+    _test_motion_packer("shelf")
+    _assert_compiled(_shelf_grid_repack, _shelf_grid_layout)
+
+
+def test_shelf_grid_layout_jit():
+    # a 2x2 group, a 1x2 group, and single cells, in a scrambled order
+    locs = [(3, 3), (0, 1), (1, 0), (5, 0), (0, 0), (1, 1), (3, 4), (2, 6)]
+    cells = [((c * 8, r * 8, c * 8 + 8, r * 8 + 8), (r, c)) for r, c in locs]
+    expected = _shelf_grid_layout(cells, (64, 64), 8, 3)
+    with cv2ext.JIT:
+        assert _shelf_grid_layout(cells, (64, 64), 8, 3) == expected
+    _assert_compiled(_shelf_grid_layout)
+    assert sorted(bbox for bbox, _ in expected) == sorted(bbox for bbox, _ in cells)
+
+
+def test_motion_packer_detections():
+    rng = np.random.default_rng(4)
+    background = rng.integers(1, 255, size=(256, 256, 3), dtype=np.uint8)
+    packer = MotionFramePacker((256, 256), gridsize=128, min_prob=0.0)
+    packer.pack(background)
+
+    # a static cell with recent detections is still explored
+    packer.update([(10, 10, 50, 50), (20, 20, 60, 60)])
+    packed, transform = packer.pack(background)
+    assert packed.shape[:2] == (128, 128)
+    assert tuple(transform[0, 0]) == (0, 0)
+    assert packed.any()
@@ -6,6 +6,7 @@ from __future__ import annotations
 from typing import Callable
 
 import cv2ext
+from hypothesis import settings
 
 
 def wrapper(func: Callable) -> Callable:
@@ -23,6 +24,11 @@ def wrapper(func: Callable) -> Callable:
 
 
 def wrapper_jit(func: Callable) -> Callable:
+    # the first examples compile the kernels, which takes longer than
+    # the hypothesis deadline even though later examples do not
+    if getattr(func, "is_hypothesis_test", False):
+        func = settings(deadline=None)(func)
+
     def inner(*args, **kwargs):
         # importlib.reload(cv2ext)
         # cv2ext.enable_jit()
@@ -0,0 +1,94 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+from cv2ext.image import FrameContext
+
+
+def _frame() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (64, 96, 3), dtype=np.uint8)
+
+
+def test_context_views_match_opencv():
+    frame = _frame()
+    context = FrameContext(frame, frame_id=3)
+
+    assert context.frame_id == 3
+    assert context.shape == frame.shape
+    np.testing.assert_array_equal(
+        context.gray,
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY),
+    )
+    np.testing.assert_array_equal(
+        context.hsv,
+        cv2.cvtColor(frame, cv2.COLOR_BGR2HSV),
+    )
+    np.testing.assert_array_equal(
+        context.resized((32, 16), cv2.INTER_AREA),
+        cv2.resize(frame, (32, 16), interpolation=cv2.INTER_AREA),
+    )
+    np.testing.assert_array_equal(
+        context.resized((32, 16), gray=True),
+        cv2.resize(context.gray, (32, 16)),
+    )
+
+
+def test_context_memoizes_views():
+    context = FrameContext(_frame())
+
+    assert context.gray is context.gray
+    assert context.resized((32, 16)) is context.resized((32, 16))
+    assert context.resized((32, 16)) is not context.resized((32, 16), gray=True)
+    assert context.hist(8) is context.hist(8)
+    assert context.hist(4) is not context.hist(8)
+
+    calls = []
+    for _ in range(3):
+        context.cached("mean", lambda image: calls.append(1) or image.mean())
+    assert len(calls) == 1
+
+
+def test_context_pyramid():
+    context = FrameContext(_frame())
+    pyramid = context.pyramid(3)
+
+    assert len(pyramid) == 3
+    assert pyramid[0] is context.gray
+    assert pyramid[1].shape == (32, 48)
+    assert pyramid[2].shape == (16, 24)
+
+
+def test_context_gray_frame():
+    gray = _frame()[:, :, 0]
+    context = FrameContext(gray)
+
+    assert context.gray is gray
+    with pytest.raises(ValueError):
+        _ = context.hsv
+
+
+def test_context_threads_compute_once():
+    context = FrameContext(_frame())
+    calls = []
+
+    def _slow_mean(image: np.ndarray) -> float:
+        calls.append(1)
+        # long enough for every thread to miss the empty cache
+        time.sleep(0.05)
+        return float(image.mean())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(
+            executor.map(lambda _: context.cached("mean", _slow_mean), range(8)),
+        )
+
+    assert len(calls) == 1
+    assert len(set(values)) == 1
@@ -0,0 +1,20 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from .test_async import (
+    test_cancel,
+    test_invalid,
+    test_open_error,
+    test_streams_interleave,
+    test_write_and_read,
+)
+
+__all__ = [
+    "test_cancel",
+    "test_invalid",
+    "test_open_error",
+    "test_streams_interleave",
+    "test_write_and_read",
+]
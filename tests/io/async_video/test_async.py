@@ -0,0 +1,116 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+from cv2ext.io import AsyncIterableVideo, AsyncVideoWriter, IterableVideo
+
+
+async def _write(path, num_frames: int) -> None:
+    rng = np.random.default_rng(0)
+    async with AsyncVideoWriter(path, fps=30.0, buffersize=2) as writer:
+        for _ in range(num_frames):
+            await writer.write(rng.integers(0, 255, (64, 48, 3), dtype=np.uint8))
+    stats = writer.stats()
+    assert stats.produced == num_frames
+    assert stats.consumed == num_frames
+    assert stats.max_depth <= 2
+
+
+def test_write_and_read(tmp_path):
+    path = tmp_path / "video.mp4"
+
+    async def main() -> list[int]:
+        await _write(path, 20)
+        async with AsyncIterableVideo(path, buffersize=4) as video:
+            assert video.video.size == (48, 64)
+            nums = [num async for num, frame in video if frame.shape == (64, 48, 3)]
+        assert video.stats().consumed == 20
+        return nums
+
+    nums = asyncio.run(main())
+    assert nums == list(range(20))
+    assert len(IterableVideo(path, use_thread=False)) == 20
+
+
+def test_streams_interleave(tmp_path):
+    paths = [tmp_path / f"video{i}.mp4" for i in range(3)]
+    ticks = []
+
+    async def ticker() -> None:
+        # runs while the videos are read, so the loop is never blocked
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def count(path) -> int:
+        return len([num async for num, _ in AsyncIterableVideo(path)])
+
+    async def main() -> list[int]:
+        await asyncio.gather(*(_write(path, 10) for path in paths))
+        task = asyncio.create_task(ticker())
+        counts = await asyncio.gather(*(count(path) for path in paths))
+        task.cancel()
+        return counts
+
+    assert asyncio.run(main()) == [10, 10, 10]
+    assert len(ticks) > 0
+
+
+def test_cancel(tmp_path):
+    path = tmp_path / "video.mp4"
+
+    async def main() -> AsyncIterableVideo:
+        await _write(path, 30)
+        video = AsyncIterableVideo(path, buffersize=2)
+
+        async def consume() -> None:
+            async with video:
+                async for _ in video:
+                    await asyncio.sleep(1.0)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return video
+
+    video = asyncio.run(main())
+    assert video.stats().consumed == 1
+    assert video.stats().produced <= 3
+
+
+def test_invalid(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        AsyncIterableVideo(tmp_path / "missing.mp4")
+    with pytest.raises(ValueError):
+        AsyncVideoWriter(tmp_path / "video.mp4", buffersize=0)
+
+    async def main() -> None:
+        writer = AsyncVideoWriter(tmp_path / "video.mp4")
+        await writer.release()
+        with pytest.raises(RuntimeError):
+            await writer.write(np.zeros((8, 8, 3), dtype=np.uint8))
+
+    asyncio.run(main())
+
+
+def test_open_error():
+    async def main() -> AsyncIterableVideo:
+        video = AsyncIterableVideo(99)
+        with pytest.raises(Exception):  # noqa: B017, PT011
+            await video.__anext__()
+        # stopped by the failed open, so later iterations end at once
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(video.__anext__(), timeout=5.0)
+        with pytest.raises(RuntimeError):
+            await video.start()
+        return video
+
+    video = asyncio.run(main())
+    assert video.stats().consumed == 0
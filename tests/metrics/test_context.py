@@ -0,0 +1,64 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import cv2ext
+import numpy as np
+from cv2ext.image import FrameContext
+
+from ..helpers import wrapper
+
+
+def _frames() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    frame1 = rng.integers(0, 255, (120, 160, 3), dtype=np.uint8)
+    frame2 = np.roll(frame1, 3, axis=1)
+    return frame1, frame2
+
+
+@wrapper
+def test_metrics_accept_context():
+    frame1, frame2 = _frames()
+    context1, context2 = FrameContext(frame1), FrameContext(frame2)
+    bboxes = [(10, 10, 60, 60), (80, 40, 150, 110)]
+
+    assert cv2ext.metrics.ncc(context1, context2) == cv2ext.metrics.ncc(
+        frame1,
+        frame2,
+    )
+    assert cv2ext.metrics.ssim(context1, context2, (64, 64)) == cv2ext.metrics.ssim(
+        frame1,
+        frame2,
+        (64, 64),
+    )
+    assert cv2ext.metrics.dhash(context1) == cv2ext.metrics.dhash(frame1)
+    assert cv2ext.metrics.phash(context1) == cv2ext.metrics.phash(frame1)
+    assert cv2ext.metrics.histogram_distance(
+        context1,
+        context2,
+    ) == cv2ext.metrics.histogram_distance(frame1, frame2)
+    np.testing.assert_array_equal(
+        cv2ext.metrics.ncc_many(context1, context2, bboxes, (80, 60)),
+        cv2ext.metrics.ncc_many(frame1, frame2, bboxes, (80, 60)),
+    )
+    np.testing.assert_array_equal(
+        cv2ext.metrics.dhash_many(context1, bboxes),
+        cv2ext.metrics.dhash_many(frame1, bboxes),
+    )
+    np.testing.assert_array_equal(
+        cv2ext.metrics.histogram_distance_many(context1, context2, bboxes),
+        cv2ext.metrics.histogram_distance_many(frame1, frame2, bboxes),
+    )
+
+
+@wrapper
+def test_metrics_reuse_context_views():
+    frame1, frame2 = _frames()
+    context = FrameContext(frame1)
+
+    cv2ext.metrics.ncc(context, frame2)
+    resized = context.resized((112, 112), gray=True)
+    cv2ext.metrics.ncc(context, frame2)
+
+    assert context.resized((112, 112), gray=True) is resized
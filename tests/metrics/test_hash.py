@@ -0,0 +1,63 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import cv2ext
+import numpy as np
+
+from ..helpers import wrapper
+
+
+@wrapper
+def test_hash_range():
+    img = cv2.imread(str(Path("data") / "testpicto1.png"))
+
+    for func in (cv2ext.metrics.dhash, cv2ext.metrics.phash):
+        value = func(img)
+        assert isinstance(value, int)
+        assert 0 <= value < 2**64
+
+
+@wrapper
+def test_hash_similar_images():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"))
+    img2 = cv2.imread(str(Path("data") / "testpicto2.png"))
+    resized = cv2.resize(img1, (400, 400))
+
+    for func in (cv2ext.metrics.dhash, cv2ext.metrics.phash):
+        same = cv2ext.metrics.hamming(func(img1), func(img1))
+        close = cv2ext.metrics.hamming(func(img1), func(resized))
+        far = cv2ext.metrics.hamming(func(img1), func(img2))
+        assert same == 0
+        assert close < far
+
+
+@wrapper
+def test_hamming():
+    assert cv2ext.metrics.hamming(0, 0) == 0
+    assert cv2ext.metrics.hamming(0, 2**64 - 1) == 64
+    assert cv2ext.metrics.hamming(0b1011, 0b0001) == 2
+
+    hashes1 = np.array([0, 2**64 - 1, 0b1011], dtype=np.uint64)
+    hashes2 = np.array([0, 0, 0b0001], dtype=np.uint64)
+    assert list(cv2ext.metrics.hamming(hashes1, hashes2)) == [0, 64, 2]
+
+
+@wrapper
+def test_hash_many():
+    img = cv2.imread(str(Path("data") / "testpicto1.png"))
+    bboxes = [(0, 0, 400, 400), (100, 200, 500, 700), (10, 10, 10, 10)]
+
+    for func, func_many in (
+        (cv2ext.metrics.dhash, cv2ext.metrics.dhash_many),
+        (cv2ext.metrics.phash, cv2ext.metrics.phash_many),
+    ):
+        hashes = func_many(img, bboxes)
+        assert hashes.dtype == np.uint64
+        assert int(hashes[0]) == func(img[0:400, 0:400])
+        assert int(hashes[1]) == func(img[200:700, 100:500])
+        assert int(hashes[2]) == 0
@@ -0,0 +1,56 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import cv2ext
+import numpy as np
+
+from ..helpers import wrapper
+
+
+@wrapper
+def test_histogram_same_image():
+    img = cv2.imread(str(Path("data") / "testpicto1.png"))
+
+    assert cv2ext.metrics.histogram_distance(img, img) < 1e-6
+
+
+@wrapper
+def test_histogram_different_sizes():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"))
+    img2 = cv2.imread(str(Path("data") / "testpicto2.png"))
+
+    value = cv2ext.metrics.histogram_distance(img1, img2)
+    assert 0.0 < value <= 1.0
+
+
+@wrapper
+def test_histogram_disjoint():
+    black = np.zeros((20, 20, 3), dtype=np.uint8)
+    white = np.full((20, 20, 3), 255, dtype=np.uint8)
+
+    assert abs(cv2ext.metrics.histogram_distance(black, white) - 1.0) < 1e-6
+
+
+@wrapper
+def test_histogram_many():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"))
+    img2 = img1.copy()
+    img2[0:100, 0:100] = (0, 255, 0)
+    bboxes = [(0, 0, 100, 100), (200, 200, 400, 400), (5, 5, 5, 5)]
+
+    values = cv2ext.metrics.histogram_distance_many(img1, img2, bboxes)
+
+    assert values.shape == (3,)
+    assert values[0] > 0.0
+    assert values[1] < 1e-6
+    assert values[2] == 0.0
+    expected = cv2ext.metrics.histogram_distance(
+        img1[0:100, 0:100],
+        img2[0:100, 0:100],
+    )
+    assert values[0] == expected
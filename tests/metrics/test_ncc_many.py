@@ -0,0 +1,135 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import cv2ext
+import numpy as np
+from hypothesis import given
+from hypothesis.extra.numpy import arrays
+
+from ..helpers import wrapper, wrapper_jit
+
+
+def _reference(image1: np.ndarray, image2: np.ndarray) -> float:
+    a = image1.ravel().astype(np.float64)
+    b = image2.ravel().astype(np.float64)
+    if a.size == 0 or a.std() == 0.0 or b.std() == 0.0:
+        return 0.0
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+def _random_bboxes(num: int, width: int, height: int) -> list[tuple[int, int, int, int]]:
+    rng = np.random.default_rng(0)
+    x1 = rng.integers(0, width - 2, num)
+    y1 = rng.integers(0, height - 2, num)
+    x2 = np.minimum(x1 + rng.integers(1, 120, num), width)
+    y2 = np.minimum(y1 + rng.integers(1, 120, num), height)
+    return [tuple(map(int, bbox)) for bbox in zip(x1, y1, x2, y2)]
+
+
+@wrapper
+def test_ncc_reference():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"), cv2.IMREAD_GRAYSCALE)
+    img2 = cv2.GaussianBlur(img1, (7, 7), 0)
+
+    value = cv2ext.metrics.ncc(img1, img2, resize=False)
+    assert abs(value - _reference(img1, img2)) < 1e-9
+
+
+@wrapper_jit
+def test_ncc_reference_jit():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"), cv2.IMREAD_GRAYSCALE)
+    img2 = cv2.GaussianBlur(img1, (7, 7), 0)
+
+    value = cv2ext.metrics.ncc(img1, img2, resize=False)
+    assert abs(value - _reference(img1, img2)) < 1e-9
+
+
+@wrapper
+def test_ncc_many_reference():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"))
+    img2 = cv2.GaussianBlur(img1, (7, 7), 0)
+    gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
+    gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
+    bboxes = _random_bboxes(100, img1.shape[1], img1.shape[0])
+
+    values = cv2ext.metrics.ncc_many(img1, img2, bboxes)
+
+    assert values.shape == (len(bboxes),)
+    for value, (x1, y1, x2, y2) in zip(values, bboxes):
+        expected = _reference(gray1[y1:y2, x1:x2], gray2[y1:y2, x1:x2])
+        assert abs(value - expected) < 1e-9
+
+
+@wrapper
+def test_ncc_many_matches_ncc():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"))
+    img2 = cv2.GaussianBlur(img1, (7, 7), 0)
+    height, width = img1.shape[:2]
+
+    values = cv2ext.metrics.ncc_many(img1, img2, [(0, 0, width, height)])
+    expected = cv2ext.metrics.ncc(img1, img2, resize=False)
+    assert abs(values[0] - expected) < 1e-9
+
+    same = cv2ext.metrics.ncc_many(img1, img1, [(0, 0, width, height)])
+    assert same[0] == 1.0
+
+
+@wrapper
+def test_ncc_many_degenerate():
+    img1 = np.zeros((50, 50), dtype=np.uint8)
+    img2 = np.random.default_rng(0).integers(0, 255, (50, 50), dtype=np.uint8)
+
+    assert len(cv2ext.metrics.ncc_many(img1, img2, [])) == 0
+
+    # constant regions, empty regions, and regions outside the image
+    values = cv2ext.metrics.ncc_many(
+        img1,
+        img2,
+        [(0, 0, 10, 10), (5, 5, 5, 20), (60, 60, 70, 70)],
+    )
+    assert list(values) == [0.0, 0.0, 0.0]
+
+
+@wrapper
+def test_ncc_many_size():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"))
+    img2 = cv2.GaussianBlur(img1, (7, 7), 0)
+    bboxes = _random_bboxes(20, img1.shape[1], img1.shape[0])
+
+    full = cv2ext.metrics.ncc_many(img1, img2, bboxes)
+    small = cv2ext.metrics.ncc_many(img1, img2, bboxes, size=(400, 400))
+
+    assert small.shape == full.shape
+    assert np.all(small <= 1.0)
+    assert np.all(small >= -1.0)
+
+
+@wrapper
+def test_ncc_many_shape_mismatch():
+    img1 = np.zeros((50, 50), dtype=np.uint8)
+    img2 = np.zeros((40, 50), dtype=np.uint8)
+
+    try:
+        cv2ext.metrics.ncc_many(img1, img2, [(0, 0, 10, 10)])
+    except ValueError:
+        assert True
+    else:
+        assert False
+
+
+@wrapper
+@given(
+    arrays(shape=(12, 12), dtype=np.uint8),
+    arrays(shape=(12, 12), dtype=np.uint8),
+)
+def test_ncc_many_random(i1, i2) -> None:
+    bboxes = [(0, 0, 12, 12), (2, 3, 9, 11), (6, 0, 12, 6)]
+    values = cv2ext.metrics.ncc_many(i1, i2, bboxes)
+    for value, (x1, y1, x2, y2) in zip(values, bboxes):
+        expected = _reference(i1[y1:y2, x1:x2], i2[y1:y2, x1:x2])
+        assert abs(value - expected) < 1e-9
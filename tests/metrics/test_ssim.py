@@ -0,0 +1,68 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import cv2ext
+import numpy as np
+
+from ..helpers import wrapper
+
+
+@wrapper
+def test_ssim_same_image():
+    img = cv2.imread(str(Path("data") / "testpicto1.png"))
+
+    assert abs(cv2ext.metrics.ssim(img, img) - 1.0) < 1e-6
+    assert abs(cv2ext.metrics.ssim(img, img, (112, 112)) - 1.0) < 1e-6
+
+
+@wrapper
+def test_ssim_ordering():
+    img = cv2.imread(str(Path("data") / "testpicto1.png"))
+    blurred = cv2.GaussianBlur(img, (7, 7), 0)
+    noise = np.random.default_rng(0).integers(0, 255, img.shape, dtype=np.uint8)
+
+    close = cv2ext.metrics.ssim(img, blurred)
+    far = cv2ext.metrics.ssim(img, noise)
+    assert close < 1.0
+    assert far < close
+
+
+@wrapper
+def test_ssim_size_mismatch():
+    img1 = cv2.imread(str(Path("data") / "testpicto1.png"))
+    img2 = cv2.imread(str(Path("data") / "testpicto2.png"))
+
+    try:
+        cv2ext.metrics.ssim(img1, img2)
+    except ValueError:
+        assert True
+    else:
+        assert False
+
+    value = cv2ext.metrics.ssim(img1, img2, (112, 112))
+    assert -1.0 <= value <= 1.0
+
+
+@wrapper
+def test_ssim_many():
+    img = cv2.imread(str(Path("data") / "testpicto1.png"))
+    blurred = cv2.GaussianBlur(img, (7, 7), 0)
+    height, width = img.shape[:2]
+
+    values = cv2ext.metrics.ssim_many(
+        img,
+        blurred,
+        [(0, 0, width, height), (100, 100, 300, 300), (10, 10, 10, 10)],
+    )
+
+    assert values.shape == (3,)
+    assert abs(values[0] - cv2ext.metrics.ssim(img, blurred)) < 1e-4
+    assert values[2] == 0.0
+
+    same = cv2ext.metrics.ssim_many(img, img, [(100, 100, 300, 300)])
+    assert abs(same[0] - 1.0) < 1e-4
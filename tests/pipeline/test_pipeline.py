@@ -0,0 +1,130 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+from cv2ext.bboxes import nms
+from cv2ext.pipeline import Pipeline, Stage
+
+
+def test_linear():
+    pipeline = Pipeline(
+        range(50),
+        [Stage(lambda x: x + 1, "add"), Stage(lambda x: x * 2, "double")],
+    )
+    assert list(pipeline) == [(x + 1) * 2 for x in range(50)]
+
+
+def test_no_stages():
+    assert list(Pipeline(range(5))) == list(range(5))
+
+
+def test_ordered_with_workers():
+    rng = np.random.default_rng(0)
+    delays = rng.uniform(0, 0.005, 40)
+
+    def slow(x: int) -> int:
+        time.sleep(delays[x])
+        return x
+
+    pipeline = Pipeline(range(40), [Stage(slow, "slow", workers=4)])
+    assert list(pipeline) == list(range(40))
+    assert pipeline.stats()["slow"].timing.count == 40
+
+
+def test_dag():
+    detections = [((0, 0, 10, 10), 0.9, 0), ((1, 1, 10, 10), 0.8, 0)]
+    pipeline = Pipeline(
+        range(10),
+        [
+            Stage(lambda x: x * 10, "scale"),
+            Stage(lambda _: detections, "detect", inputs=["source"]),
+            Stage(nms, "nms"),
+            Stage(lambda x, dets: (x, len(dets)), "join", inputs=["scale", "nms"]),
+        ],
+    )
+    assert list(pipeline) == [(x * 10, 1) for x in range(10)]
+
+
+def test_sink_leaf():
+    written = []
+    pipeline = Pipeline(
+        range(10),
+        [
+            Stage(written.append, "write"),
+            Stage(lambda x: -x, "negate", inputs=["source"]),
+        ],
+    )
+    assert list(pipeline) == [-x for x in range(10)]
+    assert written == list(range(10))
+
+
+def test_backpressure():
+    produced = []
+
+    def source():
+        for x in range(100):
+            produced.append(x)
+            yield x
+
+    release = threading.Event()
+    pipeline = Pipeline(
+        source(),
+        [Stage(lambda x: release.wait() and x, "block", buffersize=2)],
+        buffersize=2,
+    )
+    pipeline.start()
+    time.sleep(0.3)
+    # one item in the stage, two in its queue, one held by the source
+    assert len(produced) <= 5
+    release.set()
+    assert list(pipeline) == list(range(100))
+    stats = pipeline.stats()
+    assert stats["block"].queue.max_depth <= 2
+    assert stats["source"].queue.producer_wait_s > 0
+
+
+def test_error_is_raised():
+    def fail(x: int) -> int:
+        if x == 5:
+            err_msg = "bad item"
+            raise ValueError(err_msg)
+        return x
+
+    pipeline = Pipeline(range(20), [Stage(fail, "fail"), Stage(lambda x: x, "id")])
+    outputs = []
+    with pytest.raises(ValueError, match="bad item"):
+        outputs.extend(pipeline)
+    assert outputs == list(range(5))
+
+
+def test_close_early():
+    def forever():
+        x = 0
+        while True:
+            yield x
+            x += 1
+
+    with Pipeline(forever(), [Stage(lambda x: x, "id", workers=2)]) as pipeline:
+        for output in pipeline:
+            if output == 10:
+                break
+    assert not any(t.name.startswith("Stage-") for t in threading.enumerate())
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        Stage(lambda x: x, workers=0)
+    pipeline = Pipeline(range(3), [Stage(lambda x: x, "a")])
+    with pytest.raises(ValueError):
+        pipeline.add(Stage(lambda x: x, "a"))
+    with pytest.raises(ValueError):
+        pipeline.add(Stage(lambda x: x, "b", inputs=["missing"]))
+    pipeline.run()
+    with pytest.raises(RuntimeError):
+        pipeline.add(Stage(lambda x: x, "c"))
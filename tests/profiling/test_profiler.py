@@ -0,0 +1,87 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import json
+import time
+
+import numpy as np
+from cv2ext import FLAGS, profiling
+from cv2ext.bboxes import nms
+from cv2ext.tracking.trackers import SortTracker
+
+
+@profiling.profiled("sleep")
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def test_disabled_records_nothing():
+    profiling.reset()
+    assert _sleep(0.0) == 0.0
+    with profiling.region("block"):
+        pass
+    assert profiling.snapshot() == {}
+
+
+def test_profiler_context():
+    with profiling.Profiler() as profiler:
+        for _ in range(5):
+            _sleep(0.002)
+        with profiling.region("block"):
+            pass
+    assert not FLAGS.PROFILE
+    stats = profiler.snapshot()
+    assert set(stats) == {"sleep", "block"}
+    sleep = stats["sleep"]
+    assert sleep.count == 5
+    assert sleep.min_ms >= 2.0
+    assert sleep.min_ms <= sleep.p50_ms <= sleep.p99_ms <= sleep.max_ms
+    assert abs(sleep.mean_ms * sleep.count - sleep.total_ms) < 1e-6
+    assert sum(count for _, count in sleep.buckets) == 5
+
+
+def test_instrumented_entry_points():
+    tracker = SortTracker()
+    rng = np.random.default_rng(0)
+    with profiling.Profiler() as profiler:
+        nms([((0, 0, 10, 10), 0.9, 0), ((1, 1, 10, 10), 0.8, 0)])
+        for _ in range(3):
+            tracker.update(rng.uniform(0, 100, (4, 2)).repeat(2, axis=1))
+    stats = profiler.snapshot()
+    assert stats["bboxes.nms"].count == 1
+    assert stats["SortTracker.update"].count == 3
+
+
+def test_chrome_trace(tmp_path):
+    with profiling.Profiler() as profiler:
+        _sleep(0.001)
+        _sleep(0.001)
+    path = tmp_path / "trace.json"
+    profiler.export_chrome_trace(path)
+    with path.open() as f:
+        trace = json.load(f)
+    events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in events] == ["sleep", "sleep"]
+    assert events[0]["ts"] + events[0]["dur"] <= events[1]["ts"]
+    assert all(e["dur"] >= 1000.0 for e in events)
+    assert any(e["ph"] == "M" for e in trace["traceEvents"])
+
+
+def test_max_events(tmp_path):
+    profiling.enable(max_events=2)
+    try:
+        for _ in range(5):
+            _sleep(0.0)
+    finally:
+        profiling.disable()
+    assert profiling.snapshot()["sleep"].count == 5
+    path = tmp_path / "trace.json"
+    profiling.export_chrome_trace(path)
+    with path.open() as f:
+        trace = json.load(f)
+    assert len([e for e in trace["traceEvents"] if e["ph"] == "X"]) == 2
+    profiling.enable(max_events=100_000)
+    profiling.disable()
@@ -0,0 +1,100 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from cv2ext.io import Display, IterableVideo, VideoWriter
+from cv2ext.profiling import QueueStats
+from cv2ext.tracking import MultiTracker
+from cv2ext.tracking.trackers import TemplateTracker
+
+
+def _write_video(path: Path, num_frames: int) -> None:
+    rng = np.random.default_rng(0)
+    with VideoWriter(path, fps=30.0) as writer:
+        for _ in range(num_frames):
+            writer.write(rng.integers(0, 255, (64, 64, 3), dtype=np.uint8))
+        stats = writer.stats()
+    assert stats.produced == num_frames
+    assert stats.consumed == num_frames
+    assert stats.dropped == 0
+    assert stats.fps > 0
+
+
+def test_iterable_video(tmp_path):
+    path = tmp_path / "video.mp4"
+    _write_video(path, 20)
+    video = IterableVideo(path, buffersize=4)
+    for _ in video:
+        # a slow consumer, so the reading thread fills the buffer
+        time.sleep(0.005)
+    stats = video.stats()
+    assert isinstance(stats, QueueStats)
+    assert stats.capacity == 4
+    assert stats.produced == 20
+    assert stats.consumed == 20
+    assert stats.max_depth <= 4
+    assert sum(stats.occupancy) == 20
+    assert 0 <= stats.mean_depth <= stats.max_depth
+    assert not stats.producer_bound
+    assert stats.fps > 0
+
+
+def test_iterable_video_no_thread(tmp_path):
+    path = tmp_path / "video.mp4"
+    _write_video(path, 10)
+    video = IterableVideo(path, use_thread=False)
+    for _ in video:
+        pass
+    stats = video.stats()
+    assert stats.capacity == 0
+    assert stats.consumed == 10
+    assert stats.producer_wait_s == 0
+    assert stats.consumer_wait_s == 0
+
+
+def test_display_drops():
+    display = Display("stats", buffersize=1, show=False)
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+    # faster than the display thread can take them
+    for _ in range(100):
+        display.update(frame)
+    time.sleep(0.2)
+    display.stop()
+    stats = display.stats()
+    assert stats.produced + stats.dropped == 100
+    assert stats.dropped > 0
+    assert stats.consumed == stats.produced
+    assert stats.producer_wait_s == 0
+    assert stats.consumer_wait_s > 0
+    assert stats.producer_bound
+
+
+def test_multi_tracker():
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+    bboxes = [(308, 308, 458, 454), (100, 100, 160, 160), (10, 10, 60, 60)]
+    for use_threads in (False, True):
+        with MultiTracker(
+            TemplateTracker,
+            use_threads=use_threads,
+            num_workers=2,
+        ) as tracker:
+            tracker.init(image, bboxes)
+            for _ in range(5):
+                tracker.update(image)
+            stats = tracker.stats()
+        # only update counts a frame, init does not
+        assert stats.produced == 5
+        assert stats.consumed == 5
+        if use_threads:
+            assert stats.capacity == 2
+            assert stats.max_depth == 2
+            assert stats.producer_wait_s > 0
+        else:
+            assert stats.capacity == 0
+            assert stats.producer_wait_s == 0
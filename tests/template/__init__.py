@@ -4,11 +4,25 @@
 from __future__ import annotations
 
 from .test_single import test_match_single
+from .test_bank import (
+    test_template_bank_match,
+    test_template_bank_match_all,
+    test_template_bank_add_remove,
+)
+from .test_pyramid import (
+    test_match_pyramid,
+    test_match_pyramid_scales,
+    test_match_pyramid_reuse,
+    test_match_pyramid_full_resolution,
+)
 from .test_multiple import (
     test_match_multiple,
     test_match_multiple_threshold,
     test_match_multiple_max_thresh,
     test_match_multiple_above_max_thresh,
+    test_match_multiple_peaks,
+    test_match_multiple_peaks_top_k,
+    test_match_multiple_peaks_sqdiff,
 )
 from .test_multiple_jit import (
     test_match_multiple_jit,
@@ -19,10 +33,20 @@ from .test_multiple_jit import (
 
 __all__ = [
     "test_match_single",
+    "test_template_bank_match",
+    "test_template_bank_match_all",
+    "test_template_bank_add_remove",
+    "test_match_pyramid",
+    "test_match_pyramid_scales",
+    "test_match_pyramid_reuse",
+    "test_match_pyramid_full_resolution",
     "test_match_multiple",
     "test_match_multiple_threshold",
     "test_match_multiple_max_thresh",
     "test_match_multiple_above_max_thresh",
+    "test_match_multiple_peaks",
+    "test_match_multiple_peaks_top_k",
+    "test_match_multiple_peaks_sqdiff",
     "test_match_multiple_jit",
     "test_match_multiple_threshold_jit",
     "test_match_multiple_max_thresh_jit",
@@ -0,0 +1,69 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import cv2ext
+
+from ..helpers import wrapper
+
+
+@wrapper
+def test_template_bank_match():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    templates = {
+        "template": template,
+        "crop": image[9:155, 99:249].copy(),
+    }
+    with cv2ext.template.TemplateBank(templates, threshold=0.9) as bank:
+        assert len(bank) == 2
+        assert bank.labels == ["template", "crop"]
+        matches = bank.match(image)
+
+    assert len(matches) == 2
+    labels = {label: bbox for label, bbox, _ in matches}
+    assert labels["template"] == (308, 308, 458, 454)
+    assert labels["crop"] == (99, 9, 249, 155)
+
+
+@wrapper
+def test_template_bank_match_all():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    with cv2ext.template.TemplateBank({"template": template}, threshold=0.5) as bank:
+        matches = bank.match_all(image)
+
+    bboxes, scores = cv2ext.template.match_multiple(
+        cv2.cvtColor(image, cv2.COLOR_BGR2GRAY),
+        cv2.cvtColor(template, cv2.COLOR_BGR2GRAY),
+        threshold=0.5,
+        peaks=True,
+    )
+    assert len(matches) == len(bboxes)
+    assert matches[0][0] == "template"
+    assert matches[0][1] == (308, 308, 458, 454)
+
+
+@wrapper
+def test_template_bank_add_remove():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    with cv2ext.template.TemplateBank(threshold=0.9) as bank:
+        assert bank.match(image) == []
+        bank.add("template", template)
+        try:
+            bank.add("template", template)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+        assert len(bank.match(image)) == 1
+        bank.remove("template")
+        assert len(bank) == 0
@@ -63,3 +63,60 @@ def test_match_multiple_above_max_thresh():
 
     assert output is not None
     assert len(output) == 0
+
+
+@wrapper
+def test_match_multiple_peaks():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    bboxes, scores = cv2ext.template.match_multiple(
+        image,
+        template,
+        threshold=0.5,
+        peaks=True,
+    )
+
+    assert bboxes.shape == (len(scores), 4)
+    assert len(scores) > 1
+    assert tuple(bboxes[0]) == (308, 308, 458, 454)
+    assert all(scores[i] >= scores[i + 1] for i in range(len(scores) - 1))
+    # peaks are suppressed, no two matches overlap heavily
+    for i in range(len(bboxes)):
+        for j in range(i + 1, len(bboxes)):
+            assert cv2ext.bboxes.iou(tuple(bboxes[i]), tuple(bboxes[j])) <= 0.5
+
+
+@wrapper
+def test_match_multiple_peaks_top_k():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    bboxes, scores = cv2ext.template.match_multiple(
+        image,
+        template,
+        threshold=0.5,
+        peaks=True,
+        top_k=2,
+    )
+
+    assert len(bboxes) == len(scores) == 2
+    assert tuple(bboxes[0]) == (308, 308, 458, 454)
+
+
+@wrapper
+def test_match_multiple_peaks_sqdiff():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    bboxes, scores = cv2ext.template.match_multiple(
+        image,
+        template,
+        method=cv2.TM_SQDIFF_NORMED,
+        threshold=0.01,
+        peaks=True,
+    )
+
+    assert len(bboxes) == 1
+    assert tuple(bboxes[0]) == (308, 308, 458, 454)
+    assert scores[0] < 0.01
@@ -0,0 +1,63 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import cv2ext
+
+from ..helpers import wrapper
+
+
+@wrapper
+def test_match_pyramid():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    bbox, score = cv2ext.template.match_pyramid(image, template)
+
+    assert bbox == (308, 308, 458, 454)
+    assert score > 0.99
+
+
+@wrapper
+def test_match_pyramid_scales():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+    image = cv2.resize(image, None, fx=0.8, fy=0.8, interpolation=cv2.INTER_AREA)
+
+    bbox, _ = cv2ext.template.match_pyramid(
+        image,
+        template,
+        scales=(0.6, 0.7, 0.8, 0.9, 1.0),
+    )
+
+    expected = tuple(int(v * 0.8) for v in (308, 308, 458, 454))
+    assert cv2ext.bboxes.iou(bbox, expected) > 0.9
+
+
+@wrapper
+def test_match_pyramid_reuse():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    pyramid = cv2ext.template.ImagePyramid(image, levels=3)
+    assert len(pyramid) == 3
+    assert pyramid.image is image
+
+    bbox1, _ = cv2ext.template.match_pyramid(pyramid, template)
+    bbox2, _ = cv2ext.template.match_pyramid(pyramid, template)
+
+    assert bbox1 == bbox2 == (308, 308, 458, 454)
+
+
+@wrapper
+def test_match_pyramid_full_resolution():
+    template = cv2.imread(str(Path("data") / "template.png"))
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+
+    bbox, _ = cv2ext.template.match_pyramid(image, template, coarse_to_fine=False)
+
+    assert bbox == cv2ext.template.match_single(image, template)
@@ -0,0 +1,165 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+
+import cv2ext
+import numpy as np
+import pytest
+from cv2ext import _jit, register_jit, warmup_jit
+from cv2ext.bboxes import ious
+from cv2ext.bboxes._iou import _iou_kernel, _iou_kernel_list
+
+numba = pytest.importorskip("numba")
+
+
+def _record(name: str) -> _jit._JITDispatcher:
+    return next(r for r in _jit._JIT_FUNCS if r.func.__name__ == name)
+
+
+def test_warmup_compiles_signatures():
+    warmup_jit()
+    for name in ("_ncc_kernel", "_iou_kernel", "_constrain_kernel"):
+        record = _record(name)
+        assert record.signatures
+        assert len(record.compiled.signatures) >= len(record.signatures)
+
+
+def test_warmup_background():
+    thread = warmup_jit(background=True)
+    assert thread is not None
+    thread.join()
+    assert _record("_ncc_kernel").compiled is not None
+
+
+def test_jit_cache_dir(tmp_path):
+    env = dict(os.environ, CV2EXT_JIT_CACHE_DIR=str(tmp_path))
+    code = "import cv2ext; cv2ext.warmup_jit()"
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    cached = [p.name for p in tmp_path.rglob("*") if p.suffix in (".nbi", ".nbc")]
+    assert any(name.startswith("_ncc.") for name in cached)
+
+
+def test_toggle_rebinds_imported_kernels():
+    @register_jit()
+    def _square(x: float) -> float:
+        return x * x
+
+    assert _square(3.0) == 9.0
+    assert _square.compiled is None
+    with cv2ext.JIT:
+        assert _square(3.0) == 9.0
+    assert _square.compiled is not None
+    assert len(_square.compiled.signatures) == 1
+
+
+def test_nested_kernels():
+    bboxes1 = [(0, 0, 10, 10), (5, 5, 20, 20)]
+    bboxes2 = [(5, 5, 15, 15), (0, 0, 20, 20)]
+    expected = ious(bboxes1, bboxes2)
+    with cv2ext.JIT:
+        result = ious(bboxes1, bboxes2)
+    assert np.allclose(expected, result)
+    assert _iou_kernel_list.compiled is not None
+    assert _iou_kernel.compiled is not None
+
+
+def test_fallback_on_compile_error(caplog):
+    @register_jit()
+    def _untyped(x: int) -> str:
+        return str(object()) if x < 0 else "ok"
+
+    with cv2ext.JIT, caplog.at_level(logging.WARNING, logger="cv2ext._jit"):
+        assert _untyped(1) == "ok"
+        assert _untyped(2) == "ok"
+    warnings = [r for r in caplog.records if "_untyped" in r.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_invalid_arguments_keep_jit():
+    @register_jit()
+    def _unpack(bbox: tuple[int, int]) -> int:
+        x, y = bbox
+        return x + y
+
+    with cv2ext.JIT:
+        with pytest.raises(TypeError):
+            _unpack(1)
+        assert _unpack((1, 2)) == 3
+    assert _unpack.compiled is not None
+    assert len(_unpack.compiled.signatures) == 1
+
+
+def test_context_restores_state():
+    cv2ext.enable_jit()
+    with cv2ext.JIT:
+        pass
+    assert cv2ext.FLAGS.JIT
+    cv2ext.disable_jit()
+    with cv2ext.JIT:
+        assert cv2ext.FLAGS.JIT
+    assert not cv2ext.FLAGS.JIT
+
+
+def test_fallback_per_signature(caplog):
+    @register_jit()
+    def _to_float(x):  # noqa: ANN001, ANN202
+        return float(x)
+
+    with cv2ext.JIT, caplog.at_level(logging.DEBUG, logger="cv2ext._jit"):
+        assert _to_float(2) == 2.0
+        # strings cannot be parsed in nopython mode, only they use Python
+        assert _to_float("1.5") == 1.5
+        assert _to_float("2.5") == 2.5
+        assert _to_float(3) == 3.0
+    assert len(_to_float.compiled.signatures) == 1
+    assert len(_to_float._failed) == 1
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "\n" not in warnings[0].getMessage()
+    assert any(
+        r.levelno == logging.DEBUG and "\n" in r.getMessage() for r in caplog.records
+    )
+
+
+def test_kernel_errors_propagate():
+    calls = np.zeros(1)
+
+    @register_jit()
+    def _fail(counter: np.ndarray, index: int) -> float:
+        counter[0] += 1
+        if index >= counter.shape[0]:
+            err_msg = "index out of range"
+            raise IndexError(err_msg)
+        return counter[index]
+
+    with cv2ext.JIT:
+        _fail(calls, 0)
+        with pytest.raises(IndexError):
+            _fail(calls, 5)
+    # the failing call ran once, compiled, and was not repeated in Python
+    assert calls[0] == 2
+    assert not _fail._failed
+
+
+def test_jit_status():
+    @register_jit()
+    def _status_float(x):  # noqa: ANN001, ANN202
+        return float(x)
+
+    assert "_status_float" not in cv2ext.jit_status()["compiled"]
+    with cv2ext.JIT:
+        _status_float(2)
+        status = cv2ext.jit_status()
+        assert "_status_float" in status["compiled"]
+        assert "_status_float" not in status["python"]
+        _status_float("2.5")
+    status = cv2ext.jit_status()
+    # compiled for ints, in Python for strings
+    assert "_status_float" in status["compiled"]
+    assert "_status_float" in status["python"]
@@ -0,0 +1,42 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import cv2ext
+import pytest
+
+
+def _run(code: str) -> None:
+    # a fresh interpreter, so nothing is imported by other tests
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_import_is_lazy():
+    _run(
+        "import sys, cv2ext\n"
+        "assert 'numba' not in sys.modules\n"
+        "assert 'cv2ext.tracking' not in sys.modules\n"
+        "assert 'cv2ext.research' not in sys.modules\n",
+    )
+
+
+def test_submodules_import_alone():
+    for name in ("bboxes", "cli", "detection", "image", "metrics", "video"):
+        _run(f"import cv2ext.{name}")
+
+
+def test_attributes():
+    for name in cv2ext.__all__:
+        assert getattr(cv2ext, name) is not None
+    assert cv2ext.Display is cv2ext.io.Display
+    assert cv2ext.tracking is sys.modules["cv2ext.tracking"]
+    assert set(cv2ext.__all__) <= set(dir(cv2ext))
+
+
+def test_missing_attribute():
+    with pytest.raises(AttributeError):
+        _ = cv2ext.not_a_submodule
@@ -0,0 +1,114 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+from cv2ext.image import FrameContext
+from cv2ext.tracking import MultiTracker, TrackerType
+from cv2ext.tracking.cv_trackers import KCFTracker
+
+
+def _texture() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur(
+        rng.integers(0, 255, (360, 640, 3), dtype=np.uint8),
+        (9, 9),
+        0,
+    )
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "size"),
+    [
+        ({}, None),
+        ({"scale": 0.5}, (320, 180)),
+        ({"scale": "auto"}, (320, 180)),
+        ({"max_side": 160}, (160, 90)),
+        ({"scale": 0.5, "max_side": 160}, (160, 90)),
+    ],
+)
+def test_downscale_full_resolution_boxes(kwargs, size):
+    texture = _texture()
+    bbox = (200, 100, 328, 228)
+    tracker = KCFTracker(**kwargs)
+    tracker.init(texture, bbox)
+    assert tracker._size == size
+
+    for i in range(1, 4):
+        success, new_bbox = tracker.update(np.roll(texture, (i, 2 * i), axis=(0, 1)))
+        assert success
+        for c in new_bbox:
+            assert isinstance(c, int)
+    # boxes are mapped back to the full resolution frame
+    expected = (206, 103, 334, 231)
+    for c1, c2 in zip(expected, new_bbox):
+        assert abs(c1 - c2) <= 8
+
+
+def test_downscale_auto_keeps_small_targets():
+    tracker = KCFTracker(scale="auto")
+    tracker.init(_texture(), (200, 100, 240, 140))
+    assert tracker._size is None
+
+
+def test_downscale_invalid():
+    with pytest.raises(ValueError):
+        KCFTracker(scale=1.5)
+    with pytest.raises(ValueError):
+        KCFTracker(scale="half")
+    with pytest.raises(ValueError):
+        KCFTracker(max_side=0)
+
+
+def test_downscale_multi_tracker_shares_frame():
+    texture = _texture()
+    bboxes = [(200, 100, 328, 228), (400, 150, 528, 278)]
+    with MultiTracker(
+        TrackerType.KCF,
+        use_threads=False,
+        tracker_kwargs={"scale": 0.5},
+    ) as tracker:
+        tracker.init(texture, bboxes)
+        context = FrameContext(np.roll(texture, (1, 2), axis=(0, 1)))
+        results = tracker.update(context)
+
+    assert all(success for success, _ in results)
+    resized = [key for key in context._cache if key[0] == "resized"]
+    assert resized == [("resized", (320, 180), cv2.INTER_AREA, False)]
+
+
+@pytest.mark.parametrize("use_threads", [False, True])
+def test_downscale_multi_tracker_resizes_once(monkeypatch, use_threads):
+    texture = _texture()
+    bboxes = [
+        (40 + 70 * i, 40 + 30 * (i % 3), 120 + 70 * i, 120 + 30 * (i % 3))
+        for i in range(6)
+    ]
+    resize = cv2.resize
+    calls = []
+
+    def _resize(*args, **kwargs):
+        calls.append(1)
+        # long enough for every worker to miss the empty cache
+        time.sleep(0.02)
+        return resize(*args, **kwargs)
+
+    with MultiTracker(
+        TrackerType.KCF,
+        use_threads=use_threads,
+        num_workers=4,
+        tracker_kwargs={"scale": 0.5},
+    ) as tracker:
+        tracker.init(texture, bboxes)
+        monkeypatch.setattr(cv2, "resize", _resize)
+        for i in range(1, 3):
+            calls.clear()
+            results = tracker.update(np.roll(texture, (i, 2 * i), axis=(0, 1)))
+            assert all(success for success, _ in results)
+            # one resize per frame, shared by every tracker and worker
+            assert len(calls) == 1
@@ -7,6 +7,7 @@ import contextlib
 from pathlib import Path
 
 import cv2
+import pytest
 from cv2ext.tracking import MultiTracker, TrackerType
 
 
@@ -97,3 +98,73 @@ def test_many_data_cycle():
 
 def test_many_data_cycle_threads():
     _many_data_cycle(True)
+
+
+def _add_remove(use_threads: bool):
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+    init_bbox = (308, 308, 458, 454)
+
+    with MultiTracker(TrackerType.KCF, use_threads=use_threads, num_workers=2) as tracker:
+        tracker.init(image, [init_bbox] * 3)
+        new_id = tracker.add(image, init_bbox)
+        assert new_id == 3
+        assert len(tracker) == 4
+
+        tracker.remove(1)
+        assert len(tracker) == 3
+        results = tracker.update(image)
+        assert len(results) == 3
+        for success, bbox in results:
+            assert success
+            assert isinstance(bbox, tuple)
+
+        # ids are not reused after removal
+        assert tracker.add(image, init_bbox) == 4
+
+
+def test_add_remove():
+    _add_remove(False)
+
+
+def test_add_remove_threads():
+    _add_remove(True)
+
+
+def test_pool_matches_serial():
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+    init_bboxes = [(308, 308, 458, 454), (100, 100, 200, 220), (500, 400, 600, 520)] * 3
+
+    serial = MultiTracker(TrackerType.KCF, use_threads=False)
+    serial.init(image, init_bboxes)
+    with MultiTracker(TrackerType.KCF, num_workers=4) as pooled:
+        pooled.init(image, init_bboxes)
+        for _ in range(3):
+            assert pooled.update(image) == serial.update(image)
+
+
+def test_num_workers_invalid():
+    with pytest.raises(ValueError):
+        MultiTracker(TrackerType.KCF, num_workers=0)
+
+
+def test_ids_reinit():
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+    init_bbox = (308, 308, 458, 454)
+
+    with MultiTracker(TrackerType.MOSSE) as tracker:
+        tracker.init(image, [init_bbox] * 3)
+        assert tracker.ids == [0, 1, 2]
+        tracker.remove(0)
+        tracker.add(image, init_bbox)
+        assert tracker.ids == [1, 2, 3]
+
+        # legacy trackers cannot be initialized twice, reinit must still work
+        tracker.update(image)
+        tracker.reinit(image, 2, (100, 100, 200, 220))
+        assert tracker.ids == [1, 2, 3]
+        results = tracker.update(image)
+        assert all(success for success, _ in results)
+        assert abs(results[1][1][0] - 100) <= 3
+
+        with pytest.raises(KeyError):
+            tracker.reinit(image, 0, init_bbox)
@@ -3,7 +3,13 @@
 # MIT License
 from __future__ import annotations
 
+import cv2
+import numpy as np
+import pytest
+from cv2ext.image import FrameContext
 from cv2ext.tracking import TrackerType, MultiTrackerType
+from cv2ext.tracking.trackers import KLTMultiTracker, KLTTracker
+from cv2ext.tracking.trackers._klt import _group_median
 
 from ..generic import check_basic_tracking, check_full_tracking, check_basic_multi_tracking, check_full_multi_tracking
 
@@ -30,3 +36,131 @@ def test_multi_klt_full():
 
 def test_multi_klt_full_gray():
     check_full_multi_tracking(MultiTrackerType.KLT, use_gray=True)
+
+
+def test_group_median():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 100, 61)
+    owners = rng.integers(0, 5, 61)
+    medians, counts = _group_median(values, owners, 6)
+    assert counts[5] == 0
+    for i in range(5):
+        assert counts[i] == np.sum(owners == i)
+        assert np.isclose(medians[i], np.median(values[owners == i]))
+
+
+def _texture(shape: tuple[int, int] = (240, 320)) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur(rng.integers(0, 255, shape, dtype=np.uint8), (5, 5), 0)
+
+
+def test_klt_keypoints_in_roi():
+    texture = _texture()
+    bbox = (60, 50, 140, 120)
+    tracker = KLTTracker(num_features=40)
+    tracker.init(texture, bbox)
+    keypoints = tracker._tracker._prev_keypoints
+    assert 0 < len(keypoints) <= 40
+    assert np.all(keypoints >= (60, 50))
+    assert np.all(keypoints < (140, 120))
+
+
+def test_klt_scale():
+    texture = _texture()
+    zoomed = cv2.resize(texture, None, fx=1.05, fy=1.05)[:240, :320]
+    tracker = KLTTracker()
+    tracker.init(texture, (100, 80, 180, 160))
+    success, bbox = tracker.update(zoomed)
+    assert success
+    assert abs((bbox[2] - bbox[0]) - 84) <= 2
+    assert abs(bbox[0] - 105) <= 2
+
+
+def test_multi_klt_bounded_keypoints():
+    texture = _texture()
+    bboxes = [(40, 40, 100, 100), (150, 60, 230, 140)]
+    tracker = KLTMultiTracker(num_features=25, redetect_interval=3)
+    tracker.init(texture, bboxes)
+    for i in range(12):
+        frame = np.roll(texture, (i % 3, i % 2), axis=(0, 1))
+        results = tracker.update(frame)
+        assert all(success for success, _ in results)
+        counts = np.bincount(tracker._owners, minlength=2)
+        assert np.all(counts <= 25)
+
+
+def test_multi_klt_recovers():
+    texture = _texture()
+    bbox = (40, 40, 100, 100)
+    tracker = KLTMultiTracker()
+    tracker.init(texture, [bbox])
+
+    # a blank frame loses every keypoint, but the box is kept
+    blank = np.zeros_like(texture)
+    success, lost_bbox = tracker.update(blank)[0]
+    assert not success
+    assert lost_bbox == bbox
+
+    # keypoints are re-detected and tracking resumes
+    tracker.update(texture)
+    success, _ = tracker.update(texture)[0]
+    assert success
+
+
+def test_multi_klt_shift():
+    rng = np.random.default_rng(0)
+    texture = cv2.GaussianBlur(rng.integers(0, 255, (240, 320), dtype=np.uint8), (5, 5), 0)
+    shifted = np.roll(texture, (2, 3), axis=(0, 1))
+    bboxes = [(40, 40, 100, 100), (150, 60, 230, 140), (60, 150, 140, 220)]
+
+    tracker = KLTMultiTracker()
+    tracker.init(texture, bboxes)
+    results = tracker.update(shifted)
+    assert len(results) == len(bboxes)
+    for (success, bbox), (x1, y1, x2, y2) in zip(results, bboxes):
+        assert success
+        assert abs(bbox[0] - x1 - 3) <= 10
+        assert abs(bbox[1] - y1 - 2) <= 10
+        assert x1 - 5 <= bbox[0] < bbox[2] <= x2 + 8
+
+
+def test_multi_klt_add_remove_reinit():
+    texture = _texture()
+    tracker = KLTMultiTracker()
+    tracker.init(texture, [(40, 40, 100, 100), (150, 60, 230, 140)])
+    assert tracker.ids == [0, 1]
+
+    new_id = tracker.add(texture, (60, 150, 140, 220))
+    assert new_id == 2
+    tracker.remove(0)
+    assert tracker.ids == [1, 2]
+    assert set(tracker._owners.tolist()) == {0, 1}
+
+    tracker.reinit(texture, 2, (200, 150, 260, 210))
+    shifted = np.roll(texture, (2, 3), axis=(0, 1))
+    results = tracker.update(shifted)
+    assert len(results) == 2
+    (ok1, bbox1), (ok2, bbox2) = results
+    assert ok1 and ok2
+    assert abs(bbox1[0] - 153) <= 2
+    assert abs(bbox2[0] - 203) <= 2
+
+    with pytest.raises(KeyError):
+        tracker.remove(0)
+
+
+def test_multi_klt_frame_context():
+    texture = cv2.cvtColor(_texture(), cv2.COLOR_GRAY2BGR)
+    shifted = np.roll(texture, (2, 3), axis=(0, 1))
+    bboxes = [(40, 40, 100, 100), (150, 60, 230, 140)]
+
+    tracker = KLTMultiTracker()
+    tracker.init(texture, bboxes)
+    expected = tracker.update(shifted)
+
+    context = FrameContext(texture)
+    tracker = KLTMultiTracker()
+    tracker.init(context, bboxes)
+    shifted_context = FrameContext(shifted)
+    assert tracker.update(shifted_context) == expected
+    assert tracker._prev_frame is shifted_context.gray
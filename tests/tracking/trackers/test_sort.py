@@ -0,0 +1,114 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+from cv2ext.tracking import TrackerType
+from cv2ext.tracking.trackers import SortTracker
+
+
+def _moving(frame: int) -> list[tuple[int, int, int, int]]:
+    return [
+        (10 + 5 * frame, 10, 50 + 5 * frame, 50),
+        (200, 100 - 3 * frame, 240, 140 - 3 * frame),
+    ]
+
+
+def test_sort_stable_ids():
+    tracker = SortTracker()
+    for frame in range(10):
+        results = tracker.update(_moving(frame))
+        assert [track_id for track_id, _ in results] == [0, 1]
+        for (_, bbox), det in zip(results, _moving(frame)):
+            assert all(abs(a - b) <= 3 for a, b in zip(bbox, det))
+
+
+def test_sort_min_hits():
+    tracker = SortTracker(min_hits=3)
+    for frame in range(5):
+        tracker.update(_moving(frame)[:1])
+
+    # a new object is only reported once it has been matched min_hits times
+    reported = []
+    for frame in range(5, 9):
+        results = tracker.update(_moving(frame))
+        reported.append([track_id for track_id, _ in results])
+    assert reported == [[0], [0], [0, 1], [0, 1]]
+
+
+def test_sort_missed_detection():
+    tracker = SortTracker(max_age=2)
+    for frame in range(6):
+        tracker.update(_moving(frame))
+
+    # the second object is missing for two frames, but keeps its id
+    for frame in range(6, 8):
+        results = tracker.update(_moving(frame)[:1])
+        assert [track_id for track_id, _ in results] == [0]
+    assert tracker.ids == [0, 1]
+    results = tracker.update(_moving(8))
+    assert [track_id for track_id, _ in results] == [0, 1]
+
+
+def test_sort_death():
+    tracker = SortTracker(max_age=1, min_hits=1)
+    tracker.update(_moving(0))
+    tracker.update(_moving(1)[:1])
+    tracker.update(_moving(2)[:1])
+    assert tracker.ids == [0]
+
+    # a returning object gets a new id
+    results = tracker.update(_moving(3))
+    assert [track_id for track_id, _ in results] == [0, 2]
+
+
+def test_sort_many():
+    rng = np.random.default_rng(0)
+    corners = np.stack(np.meshgrid(np.arange(40) * 50, np.arange(25) * 50), -1)
+    corners = corners.reshape(-1, 2).astype(np.float64)
+    velocity = rng.uniform(-2, 2, corners.shape)
+
+    tracker = SortTracker()
+    for frame in range(8):
+        moved = corners + velocity * frame
+        detections = np.concatenate([moved, moved + 30], axis=1)
+        results = tracker.update(detections)
+    assert len(results) == 1000
+    assert [track_id for track_id, _ in results] == list(range(1000))
+
+
+def test_sort_fallback():
+    rng = np.random.default_rng(0)
+    texture = cv2.GaussianBlur(
+        rng.integers(0, 255, (240, 320, 3), dtype=np.uint8),
+        (5, 5),
+        0,
+    )
+
+    def frame(i: int) -> np.ndarray:
+        return np.roll(texture, 2 * i, axis=1)
+
+    def det(i: int) -> tuple[int, int, int, int]:
+        return (60 + 2 * i, 60, 120 + 2 * i, 120)
+
+    tracker = SortTracker(max_age=0, min_hits=1, fallback=TrackerType.KLT)
+    for i in range(4):
+        tracker.update([det(i)], frame(i))
+
+    # without detections the track is kept alive by the fallback tracker
+    for i in range(4, 8):
+        results = tracker.update([], frame(i))
+        assert len(results) == 1
+        track_id, bbox = results[0]
+        assert track_id == 0
+        assert all(abs(a - b) <= 4 for a, b in zip(bbox, det(i)))
+
+
+def test_sort_invalid():
+    with pytest.raises(ValueError):
+        SortTracker(max_age=-1)
+    with pytest.raises(ValueError):
+        SortTracker(min_hits=0)
@@ -0,0 +1,53 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+from cv2ext.tracking import TrackerType
+from cv2ext.tracking.trackers import TemplateTracker
+
+from ..generic import check_basic_tracking, check_full_tracking
+
+
+def _shifted(image: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    matrix = np.float32([[1, 0, dx], [0, 1, dy]])
+    return cv2.warpAffine(image, matrix, (image.shape[1], image.shape[0]))
+
+
+def test_template_basic():
+    check_basic_tracking(TrackerType.TEMPLATE)
+
+
+def test_template_full():
+    check_full_tracking(TrackerType.TEMPLATE, use_gray=False)
+
+
+def test_template_full_gray():
+    check_full_tracking(TrackerType.TEMPLATE, use_gray=True)
+
+
+def test_template_window():
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+    tracker = TemplateTracker()
+    tracker.init(image, (308, 308, 458, 454))
+
+    # small steps stay inside the search window
+    for step in range(1, 6):
+        success, bbox = tracker.update(_shifted(image, -4 * step, -2 * step))
+        assert success
+        assert bbox == (308 - 4 * step, 308 - 2 * step, 458 - 4 * step, 454 - 2 * step)
+
+
+def test_template_fallback():
+    image = cv2.imread(str(Path("data") / "pictograms.png"))
+    tracker = TemplateTracker()
+    tracker.init(image, (308, 308, 458, 454))
+
+    # a jump larger than the search window needs the full frame search
+    success, bbox = tracker.update(_shifted(image, -200, -150))
+    assert success
+    assert bbox == (108, 158, 258, 304)
@@ -0,0 +1,95 @@
+# Copyright (c) 2024 Justin Davis (davisjustin302@gmail.com)
+#
+# MIT License
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from cv2ext.metrics import dhash
+from cv2ext.video import HashIndex, iter_unique
+
+
+def _frames() -> list[tuple[int, np.ndarray]]:
+    rng = np.random.default_rng(0)
+    scenes = [rng.integers(0, 255, (120, 160, 3), dtype=np.uint8) for _ in range(3)]
+    frames = []
+    for frame_id in range(12):
+        frame = scenes[frame_id // 4].copy()
+        # small sensor noise should not change the hash much
+        frame[0, frame_id % 160] = 255
+        frames.append((frame_id, frame))
+    return frames
+
+
+def test_hash_index_query():
+    index = HashIndex(max_distance=4)
+    index.add(0b1011, 7)
+    assert index.query(0b1011) == (7, 0)
+    assert index.query(0b1010) == (7, 1)
+    assert index.query(0b1011 ^ (0b11111 << 40)) is None
+
+
+def test_hash_index_matches_brute_force():
+    rng = np.random.default_rng(1)
+    base = [int(v) for v in rng.integers(0, 2**63, 200, dtype=np.int64)]
+    index = HashIndex(max_distance=6, capacity=None)
+    for key, value in enumerate(base):
+        index.add(value, key)
+    for value in base[:50]:
+        flipped = value
+        for bit in rng.choice(64, 6, replace=False):
+            flipped ^= 1 << int(bit)
+        expected = min(bin(flipped ^ stored).count("1") for stored in base)
+        match = index.query(flipped)
+        assert match is not None
+        assert match[1] == expected
+
+
+def test_hash_index_capacity():
+    index = HashIndex(max_distance=2, capacity=2)
+    index.add(0, 0)
+    index.add(0xFFFF, 1)
+    index.add(0xFFFF << 32, 2)
+    assert len(index) == 2
+    assert index.query(0) is None
+    assert index.query(0xFFFF << 32) == (2, 0)
+
+
+def test_hash_index_invalid():
+    with pytest.raises(ValueError):
+        HashIndex(max_distance=64)
+    with pytest.raises(ValueError):
+        HashIndex(capacity=0)
+
+
+def test_iter_unique():
+    frames = _frames()
+    unique = iter_unique(frames, max_distance=4)
+    kept = [frame_id for frame_id, _ in unique]
+    assert kept == [0, 4, 8]
+    assert unique.num_unique == 3
+    assert unique.duplicates == {
+        1: 0,
+        2: 0,
+        3: 0,
+        5: 4,
+        6: 4,
+        7: 4,
+        9: 8,
+        10: 8,
+        11: 8,
+    }
+
+
+def test_iter_unique_capacity():
+    frames = _frames()
+    # returning to an evicted scene yields it again
+    frames = frames[:4] + [(12, frames[4][1]), (13, frames[0][1])]
+    kept = [frame_id for frame_id, _ in iter_unique(frames, capacity=1)]
+    assert kept == [0, 12, 13]
+
+
+def test_iter_unique_hash_func():
+    frames = _frames()
+    kept = [f for f, _ in iter_unique(frames, hash_func=lambda img: dhash(img[:60]))]
+    assert kept == [0, 4, 8]